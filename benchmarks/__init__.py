@@ -0,0 +1 @@
+"""Benchmarks and stress checks for Finance Manager Agent."""
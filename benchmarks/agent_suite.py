@@ -0,0 +1,454 @@
+"""End-to-end agent benchmark suite on the replay model.
+
+Runs the conversation corpus through the real agent graph (root_agent →
+sub-agents → tools → MongoDB) with ReplayLlm in place of Gemini. Every
+simulated user runs one conversation in its own session, against a seeded
+scratch database, and all users run concurrently. Each turn's latency is
+split into:
+
+    model       time inside model calls (the replay model's latency)
+    tool        time inside tools, excluding their database commands
+    db          MongoDB command time issued by tools
+    delegation  the rest: agent routing and transfers, the runner and sessions
+
+p50/p95 per component are compared against a stored baseline, and the run
+fails when one regresses by more than --max-regression, when the baseline
+is missing, or when a turn strays from its script.
+
+--mode picks the root agent's DELEGATION_MODE. Each mode has its own
+corpus, because in "direct" mode the root agent answers read-only turns
+itself instead of transferring. It also has its own baseline. ``compare``
+runs every mode with the same settings and prints model calls and latency
+per turn side by side.
+
+Usage:
+    python -m benchmarks.agent_suite run --users 40
+    python -m benchmarks.agent_suite run --mode direct --update-baseline
+    python -m benchmarks.agent_suite compare --model-latency-ms 800
+    python -m benchmarks.agent_suite record --user-id alice --session-id <id> --out my_corpus.json
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional
+from dotenv import load_dotenv
+from pymongo import monitoring
+
+# Load environment variables
+load_dotenv()
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+
+# Corpus and baseline per root agent DELEGATION_MODE
+DEFAULT_CORPORA = {
+    "delegate": os.path.join(BENCHMARK_DIR, "corpus", "conversations.json"),
+    "direct": os.path.join(BENCHMARK_DIR, "corpus", "conversations_direct.json")
+}
+DEFAULT_BASELINES = {
+    "delegate": os.path.join(BENCHMARK_DIR, "baselines", "agent_suite.json"),
+    "direct": os.path.join(BENCHMARK_DIR, "baselines", "agent_suite_direct.json")
+}
+
+COMPONENTS = ["turn", "model", "delegation", "tool", "db"]
+
+# Components checked against the baseline (model time is simulated)
+GATED_COMPONENTS = ["turn", "delegation", "tool", "db"]
+
+
+class TurnProfile:
+    """Time spent per component during one turn."""
+
+    __slots__ = ("model", "tool", "db", "model_calls", "tool_calls", "db_commands", "_tool_starts")
+
+    def __init__(self):
+        self.model = 0.0
+        self.tool = 0.0
+        self.db = 0.0
+        self.model_calls = 0
+        self.tool_calls = 0
+        self.db_commands = 0
+        self._tool_starts: Dict[str, float] = {}
+
+
+# The profile of the turn running in the current task
+_current_turn: ContextVar[Optional[TurnProfile]] = ContextVar("current_turn", default=None)
+
+
+class CommandTimer(monitoring.CommandListener):
+    """Adds each tool's MongoDB round trips to the current turn.
+
+    Motor runs commands on executor threads with a copy of the caller's
+    context, so the turn's profile is visible here for async tools too.
+    """
+
+    def started(self, event):
+        pass
+
+    def _finish(self, event):
+        profile = _current_turn.get()
+        # Session reads and writes between tool calls count as delegation
+        if profile is not None and profile._tool_starts:
+            profile.db += event.duration_micros / 1e6
+            profile.db_commands += 1
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+
+def _record_model_call(seconds: float):
+    profile = _current_turn.get()
+    if profile is not None:
+        profile.model += seconds
+        profile.model_calls += 1
+
+
+def _before_tool(tool, args, tool_context):
+    profile = _current_turn.get()
+    if profile is not None:
+        profile._tool_starts[tool_context.function_call_id or tool.name] = time.perf_counter()
+    return None
+
+
+def _after_tool(tool, args, tool_context, tool_response):
+    profile = _current_turn.get()
+    if profile is not None:
+        started = profile._tool_starts.pop(tool_context.function_call_id or tool.name, None)
+        if started is not None:
+            profile.tool += time.perf_counter() - started
+            profile.tool_calls += 1
+    return None
+
+
+def install_tool_timers(agent):
+    """Time every tool call of an agent and its sub-agents."""
+    agent.before_tool_callback = _before_tool
+    agent.after_tool_callback = _after_tool
+    for sub_agent in agent.sub_agents:
+        install_tool_timers(sub_agent)
+
+
+async def run_user(runner, user_id: str, conversation: Dict[str, Any], samples: List[Dict[str, Any]]):
+    """Play one conversation in a fresh session, one turn after another."""
+    from main import APP_NAME, call_agent_async
+    from benchmarks.replay_model import FALLBACK_REPLY
+
+    session = await runner.session_service.create_session(app_name=APP_NAME, user_id=user_id)
+
+    for turn in conversation["turns"]:
+        profile = TurnProfile()
+        _current_turn.set(profile)
+
+        started = time.perf_counter()
+        response = await call_agent_async(runner, user_id, session.id, turn["user"])
+        total = time.perf_counter() - started
+
+        tool_only = max(profile.tool - profile.db, 0.0)
+        samples.append({
+            "conversation": conversation["name"],
+            # The replay model falls back when the agent strays from the script
+            "ok": not response.startswith("Error processing request") and FALLBACK_REPLY not in response,
+            "turn": total,
+            "model": profile.model,
+            "tool": tool_only,
+            "db": profile.db,
+            "delegation": max(total - profile.model - profile.tool, 0.0),
+            "model_calls": profile.model_calls,
+            "tool_calls": profile.tool_calls,
+            "db_commands": profile.db_commands
+        })
+
+
+def summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """p50/p95/mean in milliseconds for every component."""
+    from benchmarks.load_test import percentile
+
+    metrics = {}
+    for component in COMPONENTS:
+        values = sorted(sample[component] for sample in samples)
+        metrics[component] = {
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0.0
+        }
+    return {
+        "turns": len(samples),
+        "failed_turns": sum(1 for sample in samples if not sample["ok"]),
+        "model_calls_per_turn": round(sum(s["model_calls"] for s in samples) / max(len(samples), 1), 2),
+        "tool_calls_per_turn": round(sum(s["tool_calls"] for s in samples) / max(len(samples), 1), 2),
+        "db_commands_per_turn": round(sum(s["db_commands"] for s in samples) / max(len(samples), 1), 2),
+        "metrics": metrics
+    }
+
+
+def compare_to_baseline(summary: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """
+    List the gated percentiles that regressed beyond the allowed ratio.
+
+    Sub-millisecond baselines are compared against 1ms so noise on tiny
+    values doesn't fail the run.
+    """
+    regressions = []
+    for component in GATED_COMPONENTS:
+        for stat in ("p50_ms", "p95_ms"):
+            was = baseline["metrics"][component][stat]
+            now = summary["metrics"][component][stat]
+            if now > max(was, 1.0) * (1 + max_regression):
+                regressions.append(f"{component} {stat}: {was:.2f} -> {now:.2f}")
+    return regressions
+
+
+def print_summary(summary: Dict[str, Any]):
+    """Print the per-component latency table."""
+    print(f"Turns: {summary['turns']} (failed: {summary['failed_turns']})  per turn: "
+          f"{summary['model_calls_per_turn']} model calls, {summary['tool_calls_per_turn']} tool calls, "
+          f"{summary['db_commands_per_turn']} DB commands")
+    print(f"{'component':<12}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for component in COMPONENTS:
+        stats = summary["metrics"][component]
+        print(f"{component:<12}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['mean_ms']:>10.2f}")
+
+
+async def run_suite(args) -> Dict[str, Any]:
+    """Seed the scratch database, replay the corpus concurrently and summarize."""
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from database.connection import get_database
+    from database.indexes import ensure_indexes
+    from database.rollups import rebuild_rollups
+    from database.session_service import MongoSessionService
+    from root_agent import root_agent
+    from main import APP_NAME
+    from benchmarks.fixtures import seed_user
+    from benchmarks.stub_model import install_stub_model
+    from benchmarks.replay_model import ReplayLlm, load_corpus, turn_scripts
+
+    conversations = load_corpus(args.corpus or DEFAULT_CORPORA[args.mode])
+    install_stub_model(root_agent, ReplayLlm(
+        scripts=turn_scripts(conversations),
+        latency_ms=args.model_latency_ms,
+        on_call=_record_model_call
+    ))
+    install_tool_timers(root_agent)
+
+    db = get_database()
+    ensure_indexes(db)
+    rng = random.Random(args.seed)
+    run_id = uuid.uuid4().hex[:8]
+    user_ids = [f"suite_{run_id}_{i}" for i in range(args.users)]
+    for user_id in user_ids:
+        seed_user(db, user_id, rng, expenses=args.expenses_per_user)
+    rebuild_rollups(db)
+
+    session_service = MongoSessionService() if args.session_backend == "mongo" else InMemorySessionService()
+    runner = Runner(agent=root_agent, app_name=APP_NAME, session_service=session_service)
+
+    samples: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_user(runner, user_id, conversations[i % len(conversations)], samples)
+        for i, user_id in enumerate(user_ids)
+    ))
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(samples)
+    summary["settings"] = {
+        "delegation_mode": args.mode,
+        "users": args.users,
+        "model_latency_ms": args.model_latency_ms,
+        "expenses_per_user": args.expenses_per_user,
+        "session_backend": args.session_backend
+    }
+    summary["turns_per_second"] = round(len(samples) / elapsed, 1)
+    return summary
+
+
+def run_command(args) -> bool:
+    """Run the suite in a scratch database and check the baseline."""
+    base_name = os.getenv('MONGODB_DATABASE', 'finance_manager')
+    scratch_name = f"{base_name}_agent_suite"
+    # Must be set before the first connection so the tools use the scratch database
+    os.environ['MONGODB_DATABASE'] = scratch_name
+    # Read when root_agent is first imported
+    os.environ['DELEGATION_MODE'] = args.mode
+    monitoring.register(CommandTimer())
+
+    from database.connection import db_connection, async_db_connection
+
+    try:
+        summary = asyncio.run(run_suite(args))
+    finally:
+        if not args.keep_db:
+            db_connection.database.client.drop_database(scratch_name)
+        async_db_connection.close()
+        db_connection.close()
+
+    print_summary(summary)
+    print(f"Throughput: {summary['turns_per_second']} turns/s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump(summary, output, indent=2)
+
+    baseline_path = args.baseline or DEFAULT_BASELINES[args.mode]
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as output:
+            json.dump(summary, output, indent=2)
+        print(f"✓ Baseline written to {baseline_path}")
+        return summary["failed_turns"] == 0
+
+    if args.no_baseline:
+        return summary["failed_turns"] == 0
+
+    if not os.path.exists(baseline_path):
+        print(f"✗ No baseline at {baseline_path}; run with --update-baseline to create one")
+        return False
+
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get("settings") != summary["settings"]:
+        print("⚠ Baseline was recorded with different settings; comparison may not be meaningful")
+
+    regressions = compare_to_baseline(summary, baseline, args.max_regression)
+    for regression in regressions:
+        print(f"✗ Regression {regression}")
+    if not regressions:
+        print(f"✓ No regressions beyond {args.max_regression:.0%} of baseline")
+    return not regressions and summary["failed_turns"] == 0
+
+
+# (label, summary path) rows of the mode comparison
+COMPARE_ROWS = [
+    ("model calls/turn", ("model_calls_per_turn",)),
+    ("tool calls/turn", ("tool_calls_per_turn",)),
+    ("turn p50 ms", ("metrics", "turn", "p50_ms")),
+    ("turn p95 ms", ("metrics", "turn", "p95_ms")),
+    ("model p50 ms", ("metrics", "model", "p50_ms")),
+    ("delegation p50 ms", ("metrics", "delegation", "p50_ms")),
+    ("failed turns", ("failed_turns",))
+]
+
+
+def print_comparison(summaries: Dict[str, Dict[str, Any]]):
+    """Print the modes side by side, with the change against the first mode."""
+    modes = list(summaries)
+    print(f"{'':<20}" + "".join(f"{mode:>12}" for mode in modes) + f"{'change':>10}")
+    for label, path in COMPARE_ROWS:
+        values = []
+        for mode in modes:
+            value = summaries[mode]
+            for key in path:
+                value = value[key]
+            values.append(value)
+        change = f"{(values[-1] - values[0]) / values[0]:+.0%}" if values[0] else ""
+        print(f"{label:<20}" + "".join(f"{value:>12}" for value in values) + f"{change:>10}")
+
+
+def compare_command(args) -> bool:
+    """Run the suite once per delegation mode and compare them."""
+    summaries = {}
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        for mode in DEFAULT_CORPORA:
+            # root_agent is built at import time (and a sub-agent can only
+            # have one parent), so every mode runs in its own process
+            summary_path = os.path.join(scratch_dir, f"{mode}.json")
+            print(f"── {mode} ──")
+            completed = subprocess.run([
+                sys.executable, "-m", "benchmarks.agent_suite", "run",
+                "--mode", mode,
+                "--users", str(args.users),
+                "--model-latency-ms", str(args.model_latency_ms),
+                "--expenses-per-user", str(args.expenses_per_user),
+                "--session-backend", args.session_backend,
+                "--seed", str(args.seed),
+                "--no-baseline",
+                "--json", summary_path
+            ], cwd=REPO_ROOT)
+            if not os.path.exists(summary_path):
+                print(f"✗ The {mode} run did not finish (exit code {completed.returncode})")
+                return False
+            with open(summary_path, encoding="utf-8") as summary_file:
+                summaries[mode] = json.load(summary_file)
+
+    print()
+    print_comparison(summaries)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump(summaries, output, indent=2)
+    return all(summary["failed_turns"] == 0 for summary in summaries.values())
+
+
+def record_command(args) -> bool:
+    """Export a stored session as a replayable corpus."""
+    from main import APP_NAME
+    from database.session_service import MongoSessionService
+    from benchmarks.replay_model import corpus_from_events
+
+    async def fetch():
+        return await MongoSessionService().get_session(
+            app_name=APP_NAME, user_id=args.user_id, session_id=args.session_id
+        )
+
+    session = asyncio.run(fetch())
+    if session is None:
+        print(f"✗ Session '{args.session_id}' not found for user '{args.user_id}'")
+        return False
+
+    conversation = corpus_from_events(session.events, name=args.name or args.session_id)
+    with open(args.out, "w", encoding="utf-8") as output:
+        json.dump({"conversations": [conversation]}, output, indent=2)
+    print(f"✓ Recorded {len(conversation['turns'])} turns to {args.out}")
+    return True
+
+
+def main():
+    """Entry point for the agent benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Replay the corpus and compare against the baseline")
+    run.add_argument("--mode", choices=list(DEFAULT_CORPORA), default="delegate", help="Root agent DELEGATION_MODE")
+    run.add_argument("--corpus", help="Corpus file (defaults to the mode's corpus)")
+    run.add_argument("--baseline", help="Baseline file (defaults to the mode's baseline)")
+    run.add_argument("--max-regression", type=float, default=0.25, help="Allowed slowdown ratio, e.g. 0.25")
+    run.add_argument("--update-baseline", action="store_true")
+    run.add_argument("--no-baseline", action="store_true", help="Report only, without a baseline check")
+    run.add_argument("--json", help="Also write the summary to this file")
+    run.add_argument("--keep-db", action="store_true", help="Keep the scratch database for inspection")
+
+    compare = commands.add_parser("compare", help="Run every delegation mode and compare them")
+    compare.add_argument("--json", help="Also write both summaries to this file")
+
+    for command in (run, compare):
+        command.add_argument("--users", type=int, default=40, help="Concurrent simulated users")
+        command.add_argument("--model-latency-ms", type=float, default=0.0, help="Simulated latency per model call")
+        command.add_argument("--expenses-per-user", type=int, default=500)
+        command.add_argument("--session-backend", choices=["memory", "mongo"], default="memory")
+        command.add_argument("--seed", type=int, default=42)
+
+    record = commands.add_parser("record", help="Export a stored session as a corpus")
+    record.add_argument("--user-id", required=True)
+    record.add_argument("--session-id", required=True)
+    record.add_argument("--name")
+    record.add_argument("--out", required=True)
+
+    args = parser.parse_args()
+    commands_by_name = {"run": run_command, "compare": compare_command, "record": record_command}
+    ok = commands_by_name[args.command](args)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Sync vs async tool throughput under concurrent sessions.
+
+Simulates many concurrent agent sessions on one event loop. The sync tools
+run on the loop thread the way ADK calls plain function tools, so each
+database round trip stalls every other session; the async (Motor) tools
+yield while waiting on MongoDB.
+
+Usage:
+    python -m benchmarks.async_throughput --sessions 50 --calls 20
+"""
+import time
+import uuid
+import asyncio
+import argparse
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+async def run_sync_sessions(sessions: int, calls: int) -> float:
+    """Run sessions that call the blocking pymongo tools on the loop thread."""
+    from tools import expense_tools
+
+    async def session():
+        for _ in range(calls):
+            expense_tools.get_current_account_balance()
+            expense_tools.get_expenses(None, None, None, 20)
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    return time.perf_counter() - started
+
+
+async def run_async_sessions(sessions: int, calls: int) -> float:
+    """Run sessions that await the Motor-backed tools."""
+    from tools import async_expense_tools
+
+    async def session():
+        for _ in range(calls):
+            await async_expense_tools.get_current_account_balance()
+            await async_expense_tools.get_expenses(None, None, None, 20)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    return time.perf_counter() - started
+
+
+async def compare_modes(sessions: int, calls: int, seed_expenses: int):
+    """Seed the bound user, then run and compare both modes."""
+    from tools.expense_tools import set_account_balance, set_expenses_bulk
+
+    set_account_balance(10_000.0, 5_000.0, 3_000.0)
+    set_expenses_bulk([
+        {"amount": (i % 50) + 1, "category": "groceries", "description": f"seed {i}"}
+        for i in range(seed_expenses)
+    ])
+
+    # Warm up both connection pools
+    await run_sync_sessions(1, 1)
+    await run_async_sessions(1, 1)
+
+    total_calls = sessions * calls * 2
+    sync_elapsed = await run_sync_sessions(sessions, calls)
+    async_elapsed = await run_async_sessions(sessions, calls)
+
+    print(f"Sessions: {sessions}, tool calls per mode: {total_calls}")
+    print(f"Sync  (pymongo): {sync_elapsed:.2f}s  {total_calls / sync_elapsed:,.0f} calls/s")
+    print(f"Async (motor):   {async_elapsed:.2f}s  {total_calls / async_elapsed:,.0f} calls/s")
+    print(f"Speedup:         {sync_elapsed / async_elapsed:.2f}x")
+
+
+async def main_async(sessions: int, calls: int, seed_expenses: int):
+    """Run the comparison for a throwaway user and clean up afterwards."""
+    from database.connection import get_database
+    from database.rollups import ROLLUP_COLLECTION
+    from tools.context import user_context
+
+    user_id = f"bench_{uuid.uuid4().hex[:12]}"
+    db = get_database()
+
+    try:
+        with user_context(user_id):
+            await compare_modes(sessions, calls, seed_expenses)
+    finally:
+        db.expenses.delete_many({"user_id": user_id})
+        db.account_balance.delete_many({"user_id": user_id})
+        db[ROLLUP_COLLECTION].delete_many({"user_id": user_id})
+
+
+def main():
+    """Entry point for the throughput benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--seed-expenses", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args.sessions, args.calls, args.seed_expenses))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Concurrency stress check for atomic account balance updates.
+
+Fires many parallel ``set_expense`` calls for a throwaway user and verifies
+that the final balance equals the starting balance minus every expense.
+
+Usage:
+    python -m benchmarks.balance_stress --expenses 5000 --workers 64
+"""
+import sys
+import time
+import uuid
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def run_stress(expenses: int, workers: int, starting_balance: float) -> bool:
+    """
+    Run the stress check against the configured database.
+    
+    Args:
+        expenses: Number of expenses to record
+        workers: Number of concurrent threads
+        starting_balance: Balance set before the run
+    
+    Returns:
+        bool: True if the final balance is exact
+    """
+    user_id = f"stress_{uuid.uuid4().hex[:12]}"
+    
+    from database.connection import get_database
+    from database.rollups import ROLLUP_COLLECTION, verify_rollups
+    from tools.context import user_context
+    from tools.expense_tools import set_expense, set_account_balance
+    
+    db = get_database()
+    with user_context(user_id):
+        set_account_balance(starting_balance, None, None)
+    
+    # Whole cents keep the expected total exact in floating point
+    amounts = [((i % 97) + 1) / 4 for i in range(expenses)]
+    
+    def add(amount: float) -> bool:
+        # Worker threads don't inherit the caller's context, so bind per call
+        with user_context(user_id):
+            return set_expense(amount, "other", "stress test", None)["success"]
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(add, amounts))
+    elapsed = time.perf_counter() - started
+    
+    try:
+        failures = results.count(False)
+        expected = starting_balance - sum(
+            amount for amount, ok in zip(amounts, results) if ok
+        )
+        actual = db.account_balance.find_one({"user_id": user_id})["current_balance"]
+        stored = db.expenses.count_documents({"user_id": user_id})
+        rollup_mismatches = verify_rollups(db, user_id)
+        
+        print(f"Expenses:        {expenses} ({failures} failed)")
+        print(f"Workers:         {workers}")
+        print(f"Elapsed:         {elapsed:.2f}s ({expenses / elapsed:.0f} writes/s)")
+        print(f"Stored expenses: {stored}")
+        print(f"Expected:        {expected:.2f}")
+        print(f"Actual:          {actual:.2f}")
+        print(f"Rollup mismatches: {len(rollup_mismatches)}")
+        
+        return (
+            failures == 0
+            and stored == expenses
+            and abs(actual - expected) < 1e-6
+            and not rollup_mismatches
+        )
+    finally:
+        db.expenses.delete_many({"user_id": user_id})
+        db.account_balance.delete_many({"user_id": user_id})
+        db[ROLLUP_COLLECTION].delete_many({"user_id": user_id})
+
+
+def main():
+    """Entry point for the stress check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--expenses", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--starting-balance", type=float, default=1_000_000.0)
+    args = parser.parse_args()
+    
+    ok = run_stress(args.expenses, args.workers, args.starting_balance)
+    print("✓ Balance consistent" if ok else "✗ Balance mismatch")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
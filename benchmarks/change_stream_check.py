@@ -0,0 +1,132 @@
+"""End-to-end check of change-stream cache invalidation.
+
+Needs MongoDB running as a replica set (a local single-node one is
+enough, see database/change_streams.py). The check uses a scratch
+database and does the following:
+
+1. Caches get_current_account_balance and get_goal(None) for a user.
+2. Writes to account_balance with a separate client, standing in for
+   another worker, and checks that the cached balance is evicted and
+   re-read. The cached goal list must stay cached.
+3. Stops the feed, caches the balance again and writes while the feed is
+   down. It then restarts the feed under the same name and checks that it
+   resumes from the stored token and evicts the entry.
+
+Usage:
+    python -m benchmarks.change_stream_check
+    python -m benchmarks.change_stream_check --timeout 10 --keep-db
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+FEED_NAME = "change_stream_check"
+USER_ID = "change_stream_user"
+
+
+async def wait_for(predicate, timeout: float) -> float:
+    """Poll until predicate() is true; return the seconds waited (or -1 on timeout)."""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if predicate():
+            return time.perf_counter() - started
+        await asyncio.sleep(0.01)
+    return -1.0
+
+
+async def run_check(timeout: float) -> bool:
+    """Run the three steps; True when every invalidation arrived."""
+    from pymongo import MongoClient
+    from database.connection import get_async_database
+    from database.models import AccountBalance
+    from database.change_streams import ChangeFeed, TOKEN_COLLECTION
+    from tools.cache import tool_cache, invalidate_for_change
+    from tools.context import user_context
+    from tools.async_expense_tools import get_current_account_balance
+    from tools.async_goal_tools import get_goal
+
+    db = get_async_database()
+    await db[TOKEN_COLLECTION].delete_one({"_id": FEED_NAME})
+    await db.account_balance.insert_one(AccountBalance(user_id=USER_ID, current_balance=1000.0).to_dict())
+
+    # A separate client plays the other worker
+    other_worker = MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'))[db.name]
+
+    def new_feed() -> ChangeFeed:
+        feed = ChangeFeed(db, name=FEED_NAME)
+        feed.subscribe(invalidate_for_change, on_reset=tool_cache.clear)
+        return feed
+
+    def cached_entries() -> int:
+        return tool_cache.snapshot()["entries"]
+
+    ok = True
+    with user_context(USER_ID):
+        feed = new_feed()
+        await feed.start()
+
+        await get_current_account_balance()
+        await get_goal(None)
+        print(f"Cached entries: {cached_entries()}")
+
+        other_worker.account_balance.update_one({"user_id": USER_ID}, {"$inc": {"current_balance": -50.0}})
+        waited = await wait_for(lambda: cached_entries() == 1, timeout)
+        balance = (await get_current_account_balance())["current_balance"]
+        if waited < 0 or balance != 950.0:
+            print(f"✗ Live write was not picked up (balance {balance})")
+            ok = False
+        else:
+            print(f"✓ Live write evicted the balance in {waited * 1000:.0f}ms; goal list still cached")
+
+        await feed.stop()
+        await get_current_account_balance()
+        other_worker.account_balance.update_one({"user_id": USER_ID}, {"$inc": {"current_balance": -25.0}})
+
+        feed = new_feed()
+        await feed.start()
+        waited = await wait_for(lambda: feed.events > 0, timeout)
+        balance = (await get_current_account_balance())["current_balance"]
+        await feed.stop()
+        if waited < 0 or balance != 925.0:
+            print(f"✗ Write made while the feed was down was missed (balance {balance})")
+            ok = False
+        else:
+            print(f"✓ Feed resumed from its stored token and evicted the balance in {waited * 1000:.0f}ms")
+
+    other_worker.client.close()
+    return ok
+
+
+def main():
+    """Entry point for the change-stream check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timeout", type=float, default=5.0, help="Seconds to wait for each invalidation")
+    parser.add_argument("--keep-db", action="store_true", help="Keep the scratch database for inspection")
+    args = parser.parse_args()
+
+    # Must be set before the tools are imported
+    scratch_name = f"{os.getenv('MONGODB_DATABASE', 'finance_manager')}_change_stream_check"
+    os.environ['MONGODB_DATABASE'] = scratch_name
+    os.environ['TOOL_CACHE'] = 'on'
+
+    from database.connection import db_connection, async_db_connection
+
+    try:
+        ok = asyncio.run(run_check(args.timeout))
+    finally:
+        if not args.keep_db:
+            db_connection.database.client.drop_database(scratch_name)
+        async_db_connection.close()
+        db_connection.close()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Cold-start timing for the tool modules.
+
+Imports every tool module in a fresh interpreter (pointed at an
+unreachable MongoDB so any connection attempt would show up as a stall),
+then times the first real round trip against the configured database.
+
+Usage:
+    python -m benchmarks.cold_start
+"""
+import os
+import sys
+import time
+import subprocess
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+IMPORT_SNIPPET = (
+    "import tools.expense_tools, tools.goal_tools, tools.investment_tools, "
+    "tools.async_expense_tools, tools.async_goal_tools, tools.async_investment_tools, "
+    "tools.snapshot_tools"
+)
+
+
+def time_import() -> float:
+    """Time importing the tool modules in a fresh process without a database."""
+    env = dict(os.environ)
+    env['MONGODB_URI'] = 'mongodb://127.0.0.1:1/'
+    env['MONGODB_SERVER_SELECTION_TIMEOUT_MS'] = '1000'
+
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], check=True, env=env)
+    return time.perf_counter() - started
+
+
+def time_first_round_trip() -> float:
+    """Time creating the client and completing the first command."""
+    from database.connection import db_connection
+
+    started = time.perf_counter()
+    db_connection.database.command("ping")
+    return time.perf_counter() - started
+
+
+def main():
+    """Entry point for the cold-start benchmark."""
+    print(f"Import tool modules (no database): {time_import() * 1000:.0f} ms")
+    print(f"First round trip (lazy connect):   {time_first_round_trip() * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
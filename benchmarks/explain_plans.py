@@ -0,0 +1,242 @@
+"""Explain-plan regression check for every tool query.
+
+Seeds a scratch database, applies the index registry, runs ``explain()`` on
+each query the tools issue and fails if any winning plan contains a
+COLLSCAN or an in-memory SORT. The scratch database is dropped afterwards.
+
+Usage:
+    python -m benchmarks.explain_plans
+"""
+import sys
+import random
+import argparse
+from typing import Optional, Dict, Any, List
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Plan stages that mean a query is not served by an index
+FORBIDDEN_STAGES = {"COLLSCAN", "SORT"}
+
+SEED_USERS = [f"explain_user_{i}" for i in range(5)]
+
+
+def seed(db, expenses_per_user: int):
+    """Populate the scratch database with a few users' worth of data."""
+    from database.rollups import rebuild_rollups
+    from benchmarks.fixtures import seed_user
+
+    rng = random.Random(42)
+    for user_id in SEED_USERS:
+        seed_user(db, user_id, rng, expenses=expenses_per_user)
+
+    rebuild_rollups(db)
+
+
+def page_cursor(db, collection: str, query: Dict[str, Any], field: str) -> Optional[str]:
+    """Cursor halfway through the matching rows, like a deep next_cursor."""
+    from tools.pagination import encode_cursor, page_sort
+
+    middle = db[collection].count_documents(query) // 2
+    rows = list(db[collection].find(query, {field: 1}).sort(page_sort(field)).skip(middle).limit(1))
+    return encode_cursor(rows[0][field], rows[0]["_id"]) if rows else None
+
+
+def tool_queries(db, user_id: str) -> List[Dict[str, Any]]:
+    """
+    Every read the tools issue, built with the tools' own query helpers.
+
+    Each entry has a name, collection and either a find spec (filter,
+    projection, sort, limit) or an aggregation pipeline. Paged tools are
+    checked on the first page and on a deep continuation page.
+    """
+    from database.rollups import MONTH_SPEND_PROJECTION
+    from database.models import GoalRow
+    from tools.expense_tools import _expenses_query, _expenses_pipeline
+    from tools.investment_tools import (
+        _portfolio_query,
+        _portfolio_find,
+        _portfolio_value_pipeline,
+        _investment_summary_pipeline
+    )
+
+    goal_id = f"{user_id}_goal_3"
+    all_expenses = _expenses_query(user_id, None, None, None)
+    dining = _expenses_query(user_id, "2024-03-01", None, "dining")
+    expense_cursor = page_cursor(db, "expenses", all_expenses, "date")
+    dining_cursor = page_cursor(db, "expenses", dining, "date")
+    portfolio_cursor = page_cursor(db, "investments", _portfolio_query(user_id, None), "purchase_date")
+
+    return [
+        {
+            "name": "get_expenses",
+            "collection": "expenses",
+            "pipeline": _expenses_pipeline(all_expenses, 50)
+        },
+        {
+            "name": "get_expenses (deep page)",
+            "collection": "expenses",
+            "pipeline": _expenses_pipeline(all_expenses, 50, expense_cursor)
+        },
+        {
+            "name": "get_expenses (date range)",
+            "collection": "expenses",
+            "pipeline": _expenses_pipeline(_expenses_query(user_id, "2024-03-01", "2024-06-30", None), 50)
+        },
+        {
+            "name": "get_expenses (by category)",
+            "collection": "expenses",
+            "pipeline": _expenses_pipeline(dining, 50)
+        },
+        {
+            "name": "get_expenses (by category, next page)",
+            "collection": "expenses",
+            "pipeline": _expenses_pipeline(dining, 50, dining_cursor)
+        },
+        {
+            "name": "get_current_account_balance (balance)",
+            "collection": "account_balance",
+            "filter": {"user_id": user_id},
+            "limit": 1
+        },
+        {
+            "name": "get_current_account_balance (month spend)",
+            "collection": "monthly_spend",
+            "filter": {"user_id": user_id, "month": "2024-03"},
+            "projection": MONTH_SPEND_PROJECTION
+        },
+        {
+            "name": "get_goal (all goals)",
+            "collection": "goals",
+            "filter": {"user_id": user_id},
+            "projection": GoalRow.PROJECTION,
+            "sort": [("created_at", -1)]
+        },
+        {
+            "name": "get_goal (by id) / update_goal_progress",
+            "collection": "goals",
+            "filter": {"user_id": user_id, "goal_id": goal_id},
+            "projection": GoalRow.PROJECTION,
+            "limit": 1
+        },
+        {
+            "name": "get_portfolio",
+            "collection": "investments",
+            **_portfolio_find(user_id, None, 50, None)
+        },
+        {
+            "name": "get_portfolio (next page)",
+            "collection": "investments",
+            **_portfolio_find(user_id, None, 10, portfolio_cursor)
+        },
+        {
+            "name": "get_portfolio (by type)",
+            "collection": "investments",
+            **_portfolio_find(user_id, "stock", 50, None)
+        },
+        {
+            "name": "get_portfolio_value",
+            "collection": "investments",
+            "pipeline": _portfolio_value_pipeline(user_id)
+        },
+        {
+            "name": "get_investment_summary",
+            "collection": "investments",
+            "pipeline": _investment_summary_pipeline(user_id, 5)
+        },
+    ]
+
+
+def explain_query(db, query: Dict[str, Any]) -> Dict[str, Any]:
+    """Run explain for one registered tool query."""
+    if "pipeline" in query:
+        return db.command("aggregate", query["collection"], pipeline=query["pipeline"], explain=True)
+
+    cursor = db[query["collection"]].find(query["filter"], query.get("projection"))
+    if query.get("sort"):
+        cursor = cursor.sort(query["sort"])
+    if query.get("limit"):
+        cursor = cursor.limit(query["limit"])
+    return cursor.explain()
+
+
+def winning_plan_stages(explain: Dict[str, Any]) -> List[str]:
+    """
+    Collect the stage names of every winning plan in an explain document.
+
+    Rejected plans are ignored. Blocking $sort stages left in an
+    aggregation pipeline (not absorbed into the index scan) are reported
+    as SORT as well.
+    """
+    stages: List[str] = []
+
+    def walk(node: Any, in_winning_plan: bool):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "rejectedPlans":
+                    continue
+                if key == "winningPlan":
+                    walk(value, True)
+                    continue
+                if in_winning_plan and key == "stage" and isinstance(value, str):
+                    stages.append(value)
+                walk(value, in_winning_plan)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, in_winning_plan)
+
+    walk(explain, False)
+
+    for stage in explain.get("stages", []):
+        if "$sort" in stage:
+            stages.append("SORT")
+
+    return stages
+
+
+def run_check(expenses_per_user: int) -> bool:
+    """
+    Seed a scratch database and check every tool query plan.
+
+    Returns:
+        bool: True if no query uses a COLLSCAN or in-memory SORT
+    """
+    from database.connection import db_connection
+    from database.indexes import ensure_indexes
+
+    client = db_connection.database.client
+    scratch_name = f"{db_connection.database.name}_explain_check"
+    db = client[scratch_name]
+    client.drop_database(scratch_name)
+
+    try:
+        ensure_indexes(db)
+        seed(db, expenses_per_user)
+
+        ok = True
+        for query in tool_queries(db, SEED_USERS[0]):
+            stages = winning_plan_stages(explain_query(db, query))
+            bad = sorted(FORBIDDEN_STAGES.intersection(stages))
+            status = "✗" if bad else "✓"
+            print(f"{status} {query['name']:<45} {' > '.join(stages)}")
+            if bad:
+                ok = False
+        return ok
+    finally:
+        client.drop_database(scratch_name)
+
+
+def main():
+    """Entry point for the explain-plan check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--expenses-per-user", type=int, default=500)
+    args = parser.parse_args()
+
+    ok = run_check(args.expenses_per_user)
+    print("✓ All tool queries are index-backed" if ok else "✗ Some tool queries need an index")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Seeded MongoDB fixtures shared by the benchmarks.
+
+``seed_user`` writes one user's worth of realistic data (expenses spread
+over a year, goals, holdings and an account balance) with a seeded RNG,
+so every run of a benchmark sees the same database.
+"""
+import uuid
+import random
+from datetime import datetime, timedelta
+
+FIXTURE_START = datetime(2024, 1, 1)
+
+
+def seed_user(
+    db,
+    user_id: str,
+    rng: random.Random,
+    expenses: int = 500,
+    goals: int = 20,
+    investments: int = 50,
+    start: datetime = FIXTURE_START
+):
+    """
+    Insert a user's expenses, goals, investments and account balance.
+
+    Rollups are not touched; call database.rollups.rebuild_rollups after
+    seeding.
+
+    Args:
+        db: Database instance (pymongo)
+        user_id: User to seed
+        rng: Random generator (seed it for reproducible data)
+        expenses: Number of expenses over the year from start
+        goals: Number of goals
+        investments: Number of holdings
+        start: Date the seeded year begins
+    """
+    from database.models import ExpenseCategory, InvestmentType, GoalType
+
+    categories = [category.value for category in ExpenseCategory]
+    investment_types = [investment_type.value for investment_type in InvestmentType]
+
+    if expenses:
+        db.expenses.insert_many([
+            {
+                "expense_id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "amount": round(rng.uniform(1, 300), 2),
+                "category": rng.choice(categories),
+                "description": f"seed expense {i}",
+                "date": start + timedelta(hours=rng.randint(0, 24 * 365)),
+                "created_at": start
+            }
+            for i in range(expenses)
+        ])
+    if goals:
+        db.goals.insert_many([
+            {
+                "goal_id": f"{user_id}_goal_{i}",
+                "user_id": user_id,
+                "goal_type": GoalType.SAVINGS.value,
+                "name": f"Goal {i}",
+                "target_amount": 1000.0,
+                "current_amount": 100.0,
+                "deadline": start + timedelta(days=365),
+                "priority": "medium",
+                "created_at": start + timedelta(days=i),
+                "updated_at": start + timedelta(days=i)
+            }
+            for i in range(goals)
+        ])
+    if investments:
+        db.investments.insert_many([
+            {
+                "investment_id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "symbol": f"SYM{i}",
+                "name": f"Holding {i}",
+                "quantity": rng.uniform(1, 50),
+                "purchase_price": rng.uniform(10, 500),
+                "current_price": None,
+                "investment_type": rng.choice(investment_types),
+                "purchase_date": start + timedelta(days=rng.randint(0, 365)),
+                "notes": None,
+                "created_at": start,
+                "updated_at": start
+            }
+            for i in range(investments)
+        ])
+    db.account_balance.insert_one({
+        "user_id": user_id,
+        "current_balance": 5000.0,
+        "monthly_income": 4000.0,
+        "monthly_expense_threshold": 3000.0,
+        "last_updated": start
+    })
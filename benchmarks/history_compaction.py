@@ -0,0 +1,98 @@
+"""Prompt size per turn with and without history compaction.
+
+Replays a synthetic budgeting conversation in which every turn lists
+expenses and the portfolio, and prints the estimated prompt size each
+turn would send before and after ``compact_contents``. Needs no model or
+database.
+
+Usage:
+    python -m benchmarks.history_compaction --turns 30 --budget 8000
+"""
+import random
+import argparse
+from datetime import datetime, timedelta
+from typing import List
+from google.genai import types
+
+QUESTIONS = [
+    "How much did I spend on dining this month?",
+    "Show me my last 50 expenses",
+    "What does my portfolio look like?",
+    "Am I on track with my budget?",
+]
+
+
+def expense_listing(rng: random.Random, count: int) -> dict:
+    """A get_expenses result the size the tools return."""
+    start = datetime(2025, 1, 1)
+    expenses = [
+        {
+            "expense_id": f"exp-{rng.randrange(10**8):08d}",
+            "amount": round(rng.uniform(3, 250), 2),
+            "category": rng.choice(["groceries", "dining", "transportation", "utilities"]),
+            "description": f"Card payment {rng.randrange(10**5)}",
+            "date": (start + timedelta(hours=rng.randrange(24 * 90))).isoformat()
+        }
+        for _ in range(count)
+    ]
+    return {
+        "success": True,
+        "count": count,
+        "total_count": count * 4,
+        "total_amount": round(sum(expense["amount"] for expense in expenses) * 4, 2),
+        "category_breakdown": {"groceries": 812.5, "dining": 402.1, "transportation": 120.0},
+        "expenses": expenses
+    }
+
+
+def conversation_turn(rng: random.Random, turn: int, listing_size: int) -> List[types.Content]:
+    """One turn: question, tool call, bulky tool result, answer."""
+    return [
+        types.Content(role="user", parts=[types.Part(text=QUESTIONS[turn % len(QUESTIONS)])]),
+        types.Content(role="model", parts=[types.Part(function_call=types.FunctionCall(
+            name="get_expenses", args={"limit": listing_size}
+        ))]),
+        types.Content(role="user", parts=[types.Part(function_response=types.FunctionResponse(
+            name="get_expenses", response=expense_listing(rng, listing_size)
+        ))]),
+        types.Content(role="model", parts=[types.Part(
+            text="Here is a breakdown of your recent spending. " * 8
+        )]),
+    ]
+
+
+def main():
+    """Entry point for the compaction benchmark."""
+    from runtime.history import compact_contents, estimate_tokens
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--budget", type=int, default=8000)
+    parser.add_argument("--keep-turns", type=int, default=3)
+    parser.add_argument("--listing-size", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    history: List[types.Content] = []
+    total_before = total_after = 0
+
+    print(f"{'turn':>4}  {'before':>8}  {'after':>8}")
+    for turn in range(args.turns):
+        # The request for this turn carries the history plus the new question
+        current = conversation_turn(rng, turn, args.listing_size)
+        request = history + current[:1]
+
+        before = estimate_tokens(request)
+        after = estimate_tokens(compact_contents(request, args.budget, args.keep_turns))
+        total_before += before
+        total_after += after
+        print(f"{turn + 1:>4}  {before:>8,}  {after:>8,}")
+
+        history.extend(current)
+
+    print(f"Total prompt tokens: {total_before:,} -> {total_after:,} "
+          f"({(1 - total_after / total_before) * 100:.0f}% saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Throughput and idempotency check for the statement importer.
+
+Writes a synthetic CSV statement, imports it for a throwaway user, then
+imports it again and verifies that the second run inserts nothing and
+leaves the balance unchanged. Reports rows per second and the peak
+resident memory of the process.
+
+Usage:
+    python -m benchmarks.import_throughput --rows 1000000
+"""
+import os
+import sys
+import time
+import uuid
+import random
+import argparse
+import resource
+import tempfile
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+MERCHANTS = (
+    "WHOLE FOODS MARKET", "STARBUCKS #1042", "SHELL OIL 5521", "NETFLIX.COM",
+    "AMAZON MKTPLACE", "UBER TRIP", "CVS PHARMACY", "TARGET 0093", "CHIPOTLE 2211"
+)
+
+
+def write_statement(path: str, rows: int, seed: int):
+    """Write a CSV statement of debits over the last few years, newest first."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("date,amount,description\n")
+        for index in range(rows):
+            day = start + timedelta(days=(rows - index) * 1000 // rows)
+            amount = rng.randint(100, 20000) / 100
+            handle.write(f"{day:%Y-%m-%d},-{amount:.2f},{rng.choice(MERCHANTS)}\n")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MB (ru_maxrss is KB on Linux)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_import(rows: int, batch_size: int, seed: int) -> bool:
+    """
+    Import a synthetic statement twice and check the second run is a no-op.
+
+    Args:
+        rows: Rows in the statement
+        batch_size: Documents per insert batch
+        seed: Random seed for the statement contents
+
+    Returns:
+        bool: True if the re-import inserted nothing and the balance held
+    """
+    user_id = f"import_{uuid.uuid4().hex[:12]}"
+
+    from database.connection import get_database
+    from database.rollups import ROLLUP_COLLECTION
+    from import_statement import import_statement
+
+    db = get_database()
+    handle, path = tempfile.mkstemp(suffix=".csv")
+    os.close(handle)
+
+    try:
+        write_statement(path, rows, seed)
+
+        started = time.perf_counter()
+        first = import_statement(path, user_id, "csv", batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+        balance = db.account_balance.find_one({"user_id": user_id})["current_balance"]
+
+        started = time.perf_counter()
+        second = import_statement(path, user_id, "csv", batch_size=batch_size)
+        reimport_elapsed = time.perf_counter() - started
+        rebalance = db.account_balance.find_one({"user_id": user_id})["current_balance"]
+
+        print(f"Rows:            {rows}")
+        print(f"Import:          {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+        print(f"Inserted:        {first['inserted']} ({first['duplicates']} duplicates, {first['failed']} failed)")
+        print(f"Re-import:       {reimport_elapsed:.2f}s ({second['inserted']} inserted)")
+        print(f"Peak memory:     {peak_rss_mb():.0f} MB")
+
+        return (
+            first["failed"] == 0
+            and second["inserted"] == 0
+            and abs(balance - rebalance) < 1e-6
+        )
+    finally:
+        os.remove(path)
+        db.expenses.delete_many({"user_id": user_id})
+        db.account_balance.delete_many({"user_id": user_id})
+        db[ROLLUP_COLLECTION].delete_many({"user_id": user_id})
+
+
+def main():
+    """Entry point for the import benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    ok = run_import(args.rows, args.batch_size, args.seed)
+    print("✓ Re-import was idempotent" if ok else "✗ Re-import changed the data")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Load test for the HTTP/WebSocket server.
+
+Drives N simulated users, each in its own session, through a number of
+turns and reports p50/p95/p99 turn latency and turns per second. By
+default the server runs in-process with every agent pointed at StubLlm,
+so the numbers cover the server, runner, sessions and (with --tool-call)
+the tools, not the model. --url targets a server that is already running
+instead.
+
+Usage:
+    python -m benchmarks.load_test --users 200 --turns 5
+    python -m benchmarks.load_test --transport ws --model-latency-ms 200 --tool-call get_goal
+    python -m benchmarks.load_test --transport ws --stream
+    python -m benchmarks.load_test --url http://localhost:8000 --users 20
+"""
+import sys
+import json
+import time
+import uuid
+import socket
+import asyncio
+import argparse
+from typing import Dict, Any, List, Optional
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+PROMPTS = [
+    "How am I doing with my budget this month?",
+    "Show me my goals",
+    "What's my current balance?",
+    "I spent $12 on lunch today",
+    "Should I increase my savings?",
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_http_user(client, base_url: str, user_id: str, turns: int, results: Dict[str, Any]):
+    """Create a session over HTTP and run the user's turns one after another."""
+    response = await client.post(f"{base_url}/users/{user_id}/sessions")
+    response.raise_for_status()
+    session_id = response.json()["session_id"]
+
+    for turn in range(turns):
+        started = time.perf_counter()
+        response = await client.post(
+            f"{base_url}/users/{user_id}/sessions/{session_id}/messages",
+            json={"message": PROMPTS[turn % len(PROMPTS)]}
+        )
+        elapsed = time.perf_counter() - started
+
+        if response.status_code == 503:
+            results["rejected"] += 1
+        elif response.status_code != 200:
+            results["errors"] += 1
+        else:
+            results["latencies"].append(elapsed)
+
+
+async def run_ws_user(base_url: str, user_id: str, turns: int, results: Dict[str, Any], stream: bool):
+    """Open a session socket and run the user's turns one after another."""
+    import websockets
+
+    session_id = f"session_{user_id}"
+    ws_url = base_url.replace("http", "ws", 1) + f"/users/{user_id}/sessions/{session_id}/ws"
+
+    async with websockets.connect(ws_url, max_size=None) as websocket:
+        for turn in range(turns):
+            started = time.perf_counter()
+            first_token = None
+            await websocket.send(json.dumps({"message": PROMPTS[turn % len(PROMPTS)], "stream": stream}))
+            reply = json.loads(await websocket.recv())
+            while reply.get("type") not in ("response", "error"):
+                if reply.get("type") == "text" and first_token is None:
+                    first_token = time.perf_counter() - started
+                reply = json.loads(await websocket.recv())
+            elapsed = time.perf_counter() - started
+            if first_token is not None:
+                results["first_tokens"].append(first_token)
+
+            if reply.get("type") == "response":
+                results["latencies"].append(elapsed)
+            else:
+                results["rejected"] += 1
+
+
+async def drive(base_url: str, transport: str, users: int, turns: int, stream: bool) -> Dict[str, Any]:
+    """Run every simulated user concurrently against the server."""
+    import httpx
+
+    results: Dict[str, Any] = {"latencies": [], "first_tokens": [], "errors": 0, "rejected": 0}
+    run_id = uuid.uuid4().hex[:8]
+    user_ids = [f"load_{run_id}_{i}" for i in range(users)]
+
+    async def guarded(coroutine):
+        try:
+            await coroutine
+        except Exception as e:
+            results["errors"] += 1
+            results.setdefault("first_error", repr(e))
+
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(limits=limits, timeout=300) as client:
+        started = time.perf_counter()
+        if transport == "ws":
+            await asyncio.gather(*(
+                guarded(run_ws_user(base_url, user_id, turns, results, stream)) for user_id in user_ids
+            ))
+        else:
+            await asyncio.gather(*(
+                guarded(run_http_user(client, base_url, user_id, turns, results)) for user_id in user_ids
+            ))
+        results["elapsed"] = time.perf_counter() - started
+
+    return results
+
+
+def report(results: Dict[str, Any], users: int, turns: int):
+    """Print latency percentiles and throughput."""
+    latencies = sorted(results["latencies"])
+    completed = len(latencies)
+    elapsed = results["elapsed"]
+
+    print(f"Users: {users}, turns per user: {turns}, wall time: {elapsed:.2f}s")
+    print(f"Completed: {completed}/{users * turns}  rejected (503): {results['rejected']}  errors: {results['errors']}")
+    if results.get("first_error"):
+        print(f"First error: {results['first_error']}")
+    if completed:
+        print(
+            f"Turn latency  p50 {percentile(latencies, 50) * 1000:.1f}ms  "
+            f"p95 {percentile(latencies, 95) * 1000:.1f}ms  "
+            f"p99 {percentile(latencies, 99) * 1000:.1f}ms  "
+            f"max {latencies[-1] * 1000:.1f}ms"
+        )
+        print(f"Throughput    {completed / elapsed:,.1f} turns/s")
+
+    first_tokens = sorted(results["first_tokens"])
+    if first_tokens:
+        print(
+            f"First token   p50 {percentile(first_tokens, 50) * 1000:.1f}ms  "
+            f"p95 {percentile(first_tokens, 95) * 1000:.1f}ms  "
+            f"p99 {percentile(first_tokens, 99) * 1000:.1f}ms"
+        )
+
+
+def _free_port() -> int:
+    """Ask the OS for an unused local port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def main_async(args) -> bool:
+    """Start the stubbed server unless --url is given, then run the load."""
+    server = None
+    serve_task: Optional[asyncio.Task] = None
+    base_url = args.url
+
+    if base_url is None:
+        import uvicorn
+        from root_agent import root_agent
+        from server import create_app
+        from benchmarks.stub_model import StubLlm, install_stub_model
+
+        install_stub_model(root_agent, StubLlm(latency_ms=args.model_latency_ms, tool_call=args.tool_call))
+        port = _free_port()
+        config = uvicorn.Config(
+            create_app(root_agent, max_in_flight=args.max_in_flight),
+            host="127.0.0.1",
+            port=port,
+            log_level="warning"
+        )
+        server = uvicorn.Server(config)
+        serve_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        results = await drive(base_url.rstrip("/"), args.transport, args.users, args.turns, args.stream)
+    finally:
+        if server is not None:
+            server.should_exit = True
+            await serve_task
+
+    report(results, args.users, args.turns)
+    return results["errors"] == 0
+
+
+def main():
+    """Entry point for the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--transport", choices=["http", "ws"], default="http")
+    parser.add_argument("--stream", action="store_true", help="Stream WebSocket turns and report time to first token")
+    parser.add_argument("--url", help="Target a running server instead of an in-process stubbed one")
+    parser.add_argument("--max-in-flight", type=int, default=32, help="In-flight limit of the in-process server")
+    parser.add_argument("--model-latency-ms", type=float, default=50.0, help="Latency of each stub model call")
+    parser.add_argument("--tool-call", help="Tool the stub model calls once per turn, e.g. get_goal")
+    args = parser.parse_args()
+
+    ok = asyncio.run(main_async(args))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Microbenchmark: Pydantic hydration vs the trusted __slots__ read rows.
+
+Builds synthetic stored documents in memory (no database needed) and times
+converting them into tool responses the old way (``Model(**doc)`` then a
+hand-built dict) and through the trusted row classes.
+
+Usage:
+    python -m benchmarks.read_path --documents 100000
+"""
+import uuid
+import time
+import argparse
+from datetime import datetime, timedelta
+from typing import Callable, List, Dict, Any
+from database.models import (
+    Expense,
+    ExpenseRow,
+    Goal,
+    GoalRow,
+    Investment,
+    InvestmentRow
+)
+
+
+def make_documents(count: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Build stored-shape expense, goal and investment documents."""
+    start = datetime(2024, 1, 1)
+    expenses = [
+        {
+            "_id": i,
+            "expense_id": str(uuid.uuid4()),
+            "user_id": "bench_user",
+            "amount": float(i % 300 + 1),
+            "category": "groceries",
+            "description": f"expense {i}",
+            "date": start + timedelta(minutes=i),
+            "created_at": start
+        }
+        for i in range(count)
+    ]
+    goals = [
+        {
+            "_id": i,
+            "goal_id": str(uuid.uuid4()),
+            "user_id": "bench_user",
+            "goal_type": "savings",
+            "name": f"goal {i}",
+            "target_amount": 1000.0,
+            "current_amount": float(i % 1000),
+            "deadline": start + timedelta(days=365),
+            "priority": "medium",
+            "created_at": start,
+            "updated_at": start
+        }
+        for i in range(count)
+    ]
+    investments = [
+        {
+            "_id": i,
+            "investment_id": str(uuid.uuid4()),
+            "user_id": "bench_user",
+            "symbol": f"SYM{i % 500}",
+            "name": f"holding {i}",
+            "quantity": float(i % 50 + 1),
+            "purchase_price": 100.0,
+            "current_price": None,
+            "investment_type": "stock",
+            "purchase_date": start,
+            "notes": None,
+            "created_at": start,
+            "updated_at": start
+        }
+        for i in range(count)
+    ]
+    return {"expenses": expenses, "goals": goals, "investments": investments}
+
+
+def validated_expense(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Previous get_expenses row path."""
+    expense = Expense(**doc)
+    return {
+        "expense_id": expense.expense_id,
+        "amount": expense.amount,
+        "category": expense.category,
+        "description": expense.description,
+        "date": expense.date.isoformat(),
+        "created_at": expense.created_at.isoformat()
+    }
+
+
+def validated_goal(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Previous get_goal row path."""
+    goal = Goal(**doc)
+    return {
+        "goal_id": goal.goal_id,
+        "name": goal.name,
+        "type": goal.goal_type,
+        "target_amount": goal.target_amount,
+        "current_amount": goal.current_amount,
+        "deadline": goal.deadline.isoformat(),
+        "priority": goal.priority,
+        "progress_percentage": goal.progress_percentage(),
+        "created_at": goal.created_at.isoformat()
+    }
+
+
+def time_path(convert: Callable[[Dict[str, Any]], Dict[str, Any]], documents: List[Dict[str, Any]]) -> float:
+    """Time converting every document, returning seconds."""
+    started = time.perf_counter()
+    for doc in documents:
+        convert(doc)
+    return time.perf_counter() - started
+
+
+def main():
+    """Entry point for the read-path microbenchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100_000)
+    args = parser.parse_args()
+
+    documents = make_documents(args.documents)
+    cases = [
+        ("expenses", validated_expense, lambda doc: ExpenseRow(doc).to_dict()),
+        ("goals", validated_goal, lambda doc: GoalRow(doc).to_dict()),
+        ("investments", lambda doc: Investment(**doc).to_dict(), lambda doc: InvestmentRow(doc).to_dict()),
+    ]
+
+    print(f"{args.documents:,} documents per collection")
+    for name, validated, trusted in cases:
+        validated_elapsed = time_path(validated, documents[name])
+        trusted_elapsed = time_path(trusted, documents[name])
+        print(
+            f"{name:<12} pydantic {validated_elapsed * 1000:8.0f} ms   "
+            f"trusted rows {trusted_elapsed * 1000:8.0f} ms   "
+            f"speedup {validated_elapsed / trusted_elapsed:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
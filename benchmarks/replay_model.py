@@ -0,0 +1,176 @@
+"""Offline replay model for the agent graph.
+
+ReplayLlm stands in for Gemini on every agent and replays scripted (or
+recorded) turns, so root_agent → expenses_agent/investment_agent → tools
+runs end to end without network calls. A corpus is a JSON document:
+
+    {"conversations": [
+        {"name": "budget check", "turns": [
+            {"user": "How am I doing with my budget this month?", "steps": [
+                {"agent": "finance_advisor_agent", "transfer": "expenses_agent"},
+                {"agent": "expenses_agent", "call": "get_current_account_balance", "args": {}},
+                {"agent": "expenses_agent", "reply": "You're at 64% of your limit."}
+            ]}
+        ]}
+    ]}
+
+Each model call finds its turn by the latest user message. It then
+replays the calling agent's next step. An agent's position is the number
+of function calls it has made since that message. An agent with no steps
+in the turn transfers to the agent that owns the first step, which covers
+ADK routing a follow-up message straight to the last active sub-agent.
+
+``corpus_from_events`` turns a stored session into the same format, so
+real conversations can be recorded and replayed.
+"""
+import json
+import time
+import asyncio
+from typing import Optional, AsyncGenerator, Dict, Any, List, Callable
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+TRANSFER_TOOL = "transfer_to_agent"
+FALLBACK_REPLY = "(replay) Done."
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    """Read the conversations from a corpus file."""
+    with open(path, encoding="utf-8") as corpus_file:
+        return json.load(corpus_file)["conversations"]
+
+
+def turn_scripts(conversations: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Index every turn's steps by its user message.
+
+    Raises:
+        ValueError: If the same message is scripted with different steps
+    """
+    scripts: Dict[str, List[Dict[str, Any]]] = {}
+    for conversation in conversations:
+        for turn in conversation["turns"]:
+            message = turn["user"].strip()
+            if message in scripts and scripts[message] != turn["steps"]:
+                raise ValueError(f"Message scripted twice with different steps: {message!r}")
+            scripts[message] = turn["steps"]
+    return scripts
+
+
+class ReplayLlm(BaseLlm):
+    """Model that replays scripted turns for every agent in the graph."""
+
+    model: str = "replay"
+    scripts: Dict[str, List[Dict[str, Any]]] = {}
+    latency_ms: float = 0.0
+    # Called with the seconds spent in each model call
+    on_call: Optional[Callable[[float], None]] = None
+
+    @classmethod
+    def supported_models(cls) -> list:
+        return [r"replay.*"]
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        started = time.perf_counter()
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+        part = self._next_part(llm_request)
+        if self.on_call:
+            self.on_call(time.perf_counter() - started)
+
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+    def _next_part(self, llm_request: LlmRequest) -> types.Part:
+        """Pick the calling agent's next scripted step for the current turn."""
+        contents = llm_request.contents or []
+        agent_name = _agent_name(llm_request)
+
+        turn_index, steps = None, None
+        for index in range(len(contents) - 1, -1, -1):
+            content = contents[index]
+            if content.role != "user":
+                continue
+            text = "".join(part.text for part in content.parts or [] if part.text).strip()
+            if text in self.scripts:
+                turn_index, steps = index, self.scripts[text]
+                break
+
+        if steps is None:
+            return types.Part(text=FALLBACK_REPLY)
+
+        own_steps = [step for step in steps if step["agent"] == agent_name]
+        if not own_steps:
+            owner = steps[0]["agent"] if steps else None
+            if owner and owner != agent_name and TRANSFER_TOOL in llm_request.tools_dict:
+                return _transfer_part(owner)
+            return types.Part(text=FALLBACK_REPLY)
+
+        position = sum(
+            1 for content in contents[turn_index + 1:]
+            if content.role == "model" and any(part.function_call for part in content.parts or [])
+        )
+        if position >= len(own_steps):
+            return types.Part(text=FALLBACK_REPLY)
+
+        step = own_steps[position]
+        if "transfer" in step:
+            return _transfer_part(step["transfer"])
+        if "call" in step:
+            return types.Part(function_call=types.FunctionCall(name=step["call"], args=step.get("args", {})))
+        return types.Part(text=step["reply"])
+
+
+def _agent_name(llm_request: LlmRequest) -> Optional[str]:
+    """Name of the agent making the request, from ADK's identity instruction."""
+    instruction = llm_request.config.system_instruction if llm_request.config else None
+    text = instruction if isinstance(instruction, str) else ""
+    marker = 'You are an agent. Your internal name is "'
+    if marker in text:
+        return text.split(marker, 1)[1].split('"', 1)[0]
+    return None
+
+
+def _transfer_part(agent_name: str) -> types.Part:
+    return types.Part(function_call=types.FunctionCall(name=TRANSFER_TOOL, args={"agent_name": agent_name}))
+
+
+def corpus_from_events(events: List[Any], name: str = "recorded") -> Dict[str, Any]:
+    """
+    Convert a stored session's events into a replayable conversation.
+
+    Args:
+        events: Session events, oldest first
+        name: Conversation name
+
+    Returns:
+        A conversation in corpus format
+    """
+    turns: List[Dict[str, Any]] = []
+    for event in events:
+        if event.partial or not event.content or not event.content.parts:
+            continue
+
+        if event.author == "user":
+            text = "".join(part.text for part in event.content.parts if part.text).strip()
+            if text and not text.startswith("[Summary of"):
+                turns.append({"user": text, "steps": []})
+            continue
+        if not turns:
+            continue
+
+        steps = turns[-1]["steps"]
+        for part in event.content.parts:
+            call = part.function_call
+            if call and call.name == TRANSFER_TOOL:
+                steps.append({"agent": event.author, "transfer": (call.args or {}).get("agent_name")})
+            elif call:
+                steps.append({"agent": event.author, "call": call.name, "args": call.args or {}})
+            elif part.text and not part.thought:
+                steps.append({"agent": event.author, "reply": part.text})
+
+    return {"name": name, "turns": turns}
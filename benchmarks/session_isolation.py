@@ -0,0 +1,98 @@
+"""Isolation check for interleaved sessions of different users.
+
+Runs many users' tool calls concurrently on one event loop, each carrying
+its own tool context the way the ADK runner injects it, with awaits
+interleaving every step. Fails if any user ever sees another user's
+expenses, balance or goals.
+
+Usage:
+    python -m benchmarks.session_isolation --users 50
+"""
+import sys
+import uuid
+import asyncio
+import argparse
+from types import SimpleNamespace
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+async def run_user(user_id: str, rounds: int) -> list:
+    """Write and read one user's data, returning any isolation violations."""
+    from tools import async_expense_tools, async_goal_tools
+
+    # Stand-in for the ToolContext the runner injects for this session
+    tool_context = SimpleNamespace(user_id=user_id)
+    violations = []
+    balance = float(len(user_id) * 100)
+
+    await async_expense_tools.set_account_balance(balance, None, None, tool_context=tool_context)
+    goal = await async_goal_tools.set_goal(
+        "savings", f"goal of {user_id}", 1000.0, "2030-01-01", None, 0.0, tool_context=tool_context
+    )
+
+    for round_number in range(rounds):
+        await async_expense_tools.set_expense(
+            1.0, "other", f"{user_id}:{round_number}", None, tool_context=tool_context
+        )
+        await asyncio.sleep(0)
+
+        expenses = await async_expense_tools.get_expenses(None, None, None, rounds, tool_context=tool_context)
+        foreign = [
+            expense["description"] for expense in expenses["expenses"]
+            if not expense["description"].startswith(f"{user_id}:")
+        ]
+        if foreign:
+            violations.append(f"{user_id} saw expenses {foreign[:3]}")
+
+    current = await async_expense_tools.get_current_account_balance(tool_context=tool_context)
+    if abs(current["current_balance"] - (balance - rounds)) > 1e-6:
+        violations.append(f"{user_id} balance {current['current_balance']} != {balance - rounds}")
+
+    goals = await async_goal_tools.get_goal(None, tool_context=tool_context)
+    if [g["goal_id"] for g in goals["goals"]] != [goal["goal_id"]]:
+        violations.append(f"{user_id} saw goals {[g['name'] for g in goals['goals']]}")
+
+    return violations
+
+
+async def main_async(users: int, rounds: int) -> bool:
+    """Run every user concurrently and report violations."""
+    from database.connection import get_database
+    from database.rollups import ROLLUP_COLLECTION
+
+    prefix = f"iso_{uuid.uuid4().hex[:8]}"
+    user_ids = [f"{prefix}_{i}" for i in range(users)]
+    db = get_database()
+
+    try:
+        results = await asyncio.gather(*(run_user(user_id, rounds) for user_id in user_ids))
+    finally:
+        user_filter = {"user_id": {"$in": user_ids}}
+        for collection in ("expenses", "account_balance", "goals", ROLLUP_COLLECTION):
+            db[collection].delete_many(user_filter)
+
+    violations = [violation for user_violations in results for violation in user_violations]
+    for violation in violations[:20]:
+        print(f"✗ {violation}")
+
+    print(f"{users} users x {rounds} interleaved rounds: {len(violations)} violations")
+    return not violations
+
+
+def main():
+    """Entry point for the isolation check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    ok = asyncio.run(main_async(args.users, args.rounds))
+    print("✓ Sessions are isolated" if ok else "✗ Sessions leaked data")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
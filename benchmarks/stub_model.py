@@ -0,0 +1,87 @@
+"""Stub LLM for load tests.
+
+Stands in for Gemini so serving benchmarks measure the server, runner,
+sessions and tools rather than model latency or quota. The stub waits a
+fixed latency and then replies with text, or, when ``tool_call`` names a
+tool the agent offers, first calls that tool once per turn. Streaming
+requests get the reply as partial chunks ``latency_ms`` apart.
+"""
+import asyncio
+import inspect
+from typing import Optional, AsyncGenerator, Dict, Any
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+# Words per partial chunk when streaming
+STREAM_CHUNK_WORDS = 3
+
+
+class StubLlm(BaseLlm):
+    """Deterministic model with a configurable latency and optional tool call."""
+
+    model: str = "stub"
+    latency_ms: float = 0.0
+    tool_call: Optional[str] = None
+
+    @classmethod
+    def supported_models(cls) -> list:
+        return [r"stub.*"]
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+        last = llm_request.contents[-1] if llm_request.contents else None
+        last_parts = (last.parts or []) if last else []
+        answered_tool = any(part.function_response for part in last_parts)
+
+        tool = llm_request.tools_dict.get(self.tool_call) if self.tool_call else None
+        if tool is not None and not answered_tool:
+            yield LlmResponse(content=types.Content(
+                role="model",
+                parts=[types.Part(function_call=types.FunctionCall(
+                    name=self.tool_call,
+                    args=_default_args(tool)
+                ))]
+            ))
+            return
+
+        user_text = " ".join(part.text for part in last_parts if part.text) if not answered_tool else ""
+        reply = f"(stub) {user_text[:80]}".rstrip()
+
+        if stream:
+            words = reply.split(" ")
+            for index in range(0, len(words), STREAM_CHUNK_WORDS):
+                chunk = " ".join(words[index:index + STREAM_CHUNK_WORDS])
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=chunk + " ")]),
+                    partial=True
+                )
+                if self.latency_ms:
+                    await asyncio.sleep(self.latency_ms / 1000)
+
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=reply)]))
+
+
+def _default_args(tool) -> Dict[str, Any]:
+    """Pass None for every required parameter of a function tool."""
+    func = getattr(tool, "func", None)
+    if func is None:
+        return {}
+
+    return {
+        name: None
+        for name, parameter in inspect.signature(func).parameters.items()
+        if name != "tool_context" and parameter.default is inspect.Parameter.empty
+    }
+
+
+def install_stub_model(agent, model: BaseLlm):
+    """Point an agent and all of its sub-agents at the given model."""
+    agent.model = model
+    for sub_agent in agent.sub_agents:
+        install_stub_model(sub_agent, model)
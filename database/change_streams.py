@@ -0,0 +1,194 @@
+"""Cross-process cache invalidation from MongoDB change streams.
+
+Each worker process runs one ``ChangeFeed``. It watches the collections
+behind the cached read tools (expenses, goals, investments,
+account_balance and the monthly_spend rollups). Every change goes to the
+in-process subscribers, so a write made by another worker (or by a script
+such as a statement import) evicts the local cache entries it affects.
+
+The feed's resume token is saved in the ``change_stream_tokens``
+collection under the feed's name (CHANGE_STREAM_NAME, by default
+``tool_cache:<hostname>``). After a restart or a dropped connection the
+feed resumes where it stopped. When resuming is impossible (the token
+fell off the oplog) or the stream fails, subscribers are reset, which
+clears the caches because changes may have been missed, and the feed
+starts again from now.
+
+Change streams need a replica set. A local single-node one is enough:
+
+    mongod --replSet rs0 --dbpath /tmp/rs0 --port 27017
+    mongosh --eval 'rs.initiate()'
+
+Usage:
+    CHANGE_STREAMS=on python server.py
+    python -m benchmarks.change_stream_check    # end-to-end check against a replica set
+"""
+import os
+import time
+import socket
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Callable
+from pymongo.errors import PyMongoError, OperationFailure
+from database.rollups import ROLLUP_COLLECTION
+
+logger = logging.getLogger(__name__)
+
+CHANGE_STREAMS_ENABLED = os.getenv('CHANGE_STREAMS', 'off').lower() in ('1', 'true', 'on', 'yes')
+CHANGE_STREAM_NAME = os.getenv('CHANGE_STREAM_NAME', f"tool_cache:{socket.gethostname()}")
+
+TOKEN_COLLECTION = "change_stream_tokens"
+WATCHED_COLLECTIONS = ["expenses", "goals", "investments", "account_balance", ROLLUP_COLLECTION]
+
+# Fields subscribers need from the changed document
+CHANGE_FIELDS = ["user_id", "date", "goal_id", "investment_type", "month"]
+
+# Seconds between resume token saves, and before reconnecting after an error
+TOKEN_SAVE_INTERVAL_S = 1.0
+RETRY_DELAY_S = 2.0
+
+# Server error codes for a resume token that can no longer be used
+RESUME_FAILED_CODES = {136, 260, 280, 286}
+NOT_A_REPLICA_SET = 40573
+
+# (collection, operation type, changed fields or None for deletes)
+ChangeHandler = Callable[[str, str, Optional[Dict[str, Any]]], None]
+
+
+def change_pipeline() -> List[Dict[str, Any]]:
+    """Filter the watched collections and trim events to the fields subscribers use."""
+    return [
+        {"$match": {
+            "ns.coll": {"$in": WATCHED_COLLECTIONS},
+            "operationType": {"$in": ["insert", "update", "replace", "delete"]}
+        }},
+        {"$project": {
+            "ns": 1,
+            "operationType": 1,
+            **{f"fullDocument.{field}": 1 for field in CHANGE_FIELDS}
+        }}
+    ]
+
+
+class ChangeFeed:
+    """Streams changes to in-process subscribers and keeps a resume token."""
+
+    def __init__(self, db=None, name: str = CHANGE_STREAM_NAME):
+        """
+        Args:
+            db: Motor database (defaults to the shared async database)
+            name: Key of this feed's resume token
+        """
+        if db is None:
+            from database.connection import get_async_database
+            db = get_async_database()
+        self.db = db
+        self.name = name
+        self._handlers: List[ChangeHandler] = []
+        self._reset_handlers: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._started = asyncio.Event()
+        self.events = 0
+        self.resets = 0
+
+    def subscribe(self, handler: ChangeHandler, on_reset: Optional[Callable[[], None]] = None):
+        """
+        Register a subscriber.
+
+        Args:
+            handler: Called with (collection, operation, fields) for every change
+            on_reset: Called when changes may have been missed
+        """
+        self._handlers.append(handler)
+        if on_reset is not None:
+            self._reset_handlers.append(on_reset)
+
+    async def start(self):
+        """Start watching in the background; returns once the stream is open."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        await self._started.wait()
+
+    async def stop(self):
+        """Stop watching (the last resume token is saved)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._started.clear()
+
+    async def _load_token(self) -> Optional[Dict[str, Any]]:
+        stored = await self.db[TOKEN_COLLECTION].find_one({"_id": self.name})
+        return stored["token"] if stored else None
+
+    async def _save_token(self, token: Optional[Dict[str, Any]]):
+        if token is None:
+            return
+        await self.db[TOKEN_COLLECTION].update_one(
+            {"_id": self.name},
+            {"$set": {"token": token, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    def _reset(self, reason: str):
+        """Tell subscribers that changes may have been missed."""
+        logger.warning("Change feed %s reset: %s", self.name, reason)
+        self.resets += 1
+        for on_reset in self._reset_handlers:
+            on_reset()
+
+    def _dispatch(self, change: Dict[str, Any]):
+        collection = change["ns"]["coll"]
+        operation = change["operationType"]
+        fields = change.get("fullDocument")
+        self.events += 1
+        for handler in self._handlers:
+            try:
+                handler(collection, operation, fields)
+            except Exception:
+                logger.exception("Change handler failed for %s %s", operation, collection)
+
+    async def _run(self):
+        token, token_loaded = None, False
+        while True:
+            try:
+                if not token_loaded:
+                    token, token_loaded = await self._load_token(), True
+                async with self.db.watch(
+                    change_pipeline(),
+                    full_document="updateLookup",
+                    start_after=token
+                ) as stream:
+                    self._started.set()
+                    unsaved, last_saved = 0, time.monotonic()
+                    while True:
+                        # Waits up to the server's await time for the next change
+                        change = await stream.try_next()
+                        if change is not None:
+                            self._dispatch(change)
+                            unsaved += 1
+                        token = stream.resume_token
+                        if unsaved and (change is None or time.monotonic() - last_saved >= TOKEN_SAVE_INTERVAL_S):
+                            await self._save_token(token)
+                            unsaved, last_saved = 0, time.monotonic()
+            except asyncio.CancelledError:
+                await asyncio.shield(self._save_token(token))
+                raise
+            except OperationFailure as e:
+                if e.code == NOT_A_REPLICA_SET:
+                    logger.error("Change streams need a replica set; cross-process invalidation is off")
+                    self._started.set()
+                    return
+                if token is not None and e.code in RESUME_FAILED_CODES:
+                    token = None
+                    await self.db[TOKEN_COLLECTION].delete_one({"_id": self.name})
+                self._reset(f"stream failed ({e})")
+            except PyMongoError as e:
+                self._reset(f"stream failed ({e})")
+            # Let start() return even if the stream never opened
+            self._started.set()
+            await asyncio.sleep(RETRY_DELAY_S)
@@ -1,16 +1,70 @@
 """MongoDB connection management."""
 import os
-from typing import Optional
+import threading
+from typing import Optional, Dict, Any
 from pymongo import MongoClient
 from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Guards lazy client creation when tools first run on several threads
+_connect_lock = threading.Lock()
+
+
+def _int_env(name: str) -> Optional[int]:
+    """Read an optional integer setting from the environment."""
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+def get_client_options() -> Dict[str, Any]:
+    """
+    Build MongoClient pool/timeout options from the environment.
+    
+    Only settings that are present in the environment are passed through,
+    so the driver defaults apply otherwise. Shared by the sync and async
+    clients. The tool metrics and tracing command listeners are attached
+    here when TOOL_METRICS and TRACING are enabled.
+    
+    Returns:
+        Dictionary of MongoClient keyword arguments
+    """
+    from observability import tool_metrics, tracing
+    
+    settings = {
+        "maxPoolSize": _int_env('MONGODB_MAX_POOL_SIZE'),
+        "minPoolSize": _int_env('MONGODB_MIN_POOL_SIZE'),
+        "maxIdleTimeMS": _int_env('MONGODB_MAX_IDLE_TIME_MS'),
+        "waitQueueTimeoutMS": _int_env('MONGODB_WAIT_QUEUE_TIMEOUT_MS'),
+        "connectTimeoutMS": _int_env('MONGODB_CONNECT_TIMEOUT_MS'),
+        "socketTimeoutMS": _int_env('MONGODB_SOCKET_TIMEOUT_MS'),
+        "serverSelectionTimeoutMS": _int_env('MONGODB_SERVER_SELECTION_TIMEOUT_MS'),
+        "compressors": os.getenv('MONGODB_COMPRESSORS') or None,
+        "appname": os.getenv('MONGODB_APP_NAME', 'finance_manager_agent'),
+    }
+    options = {key: value for key, value in settings.items() if value is not None}
+    
+    listeners = []
+    if tool_metrics.TOOL_METRICS_ENABLED:
+        listeners.append(tool_metrics.command_listener)
+    if tracing.TRACING_ENABLED:
+        listeners.append(tracing.command_listener)
+    if listeners:
+        options["event_listeners"] = listeners
+    return options
+
 
 class DatabaseConnection:
-    """Singleton class for managing MongoDB connection."""
+    """Singleton class for managing MongoDB connection.
+    
+    The client is created on first use rather than at import time, and the
+    driver connects in the background, so importing tools never needs a
+    live database. Indexes are applied by the explicit migration in
+    database/indexes.py.
+    """
     
     _instance: Optional['DatabaseConnection'] = None
     _client: Optional[MongoClient] = None
@@ -22,52 +76,26 @@ class DatabaseConnection:
             cls._instance = super(DatabaseConnection, cls).__new__(cls)
         return cls._instance
     
-    def __init__(self):
-        """Initialize database connection."""
-        if self._client is None:
-            self._connect()
-    
     def _connect(self):
-        """Establish connection to MongoDB."""
-        try:
+        """Create the MongoDB client with the configured pool settings."""
+        with _connect_lock:
+            if self._database is not None:
+                return
+            
             mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
             database_name = os.getenv('MONGODB_DATABASE', 'finance_manager')
             
-            self._client = MongoClient(mongodb_uri)
+            self._client = MongoClient(mongodb_uri, **get_client_options())
             self._database = self._client[database_name]
-            
-            # Test connection
-            self._client.server_info()
-            print(f"✓ Connected to MongoDB: {database_name}")
-            
-            # Create indexes
-            self._create_indexes()
-            
-        except Exception as e:
-            print(f"✗ Failed to connect to MongoDB: {e}")
-            raise
     
-    def _create_indexes(self):
-        """Create indexes for better query performance."""
+    def ping(self):
+        """Check that MongoDB is reachable (one round trip)."""
         try:
-            # Goals collection indexes
-            self._database.goals.create_index("user_id")
-            self._database.goals.create_index("goal_type")
-            self._database.goals.create_index([("user_id", 1), ("created_at", -1)])
-            
-            # Expenses collection indexes
-            self._database.expenses.create_index("user_id")
-            self._database.expenses.create_index("category")
-            self._database.expenses.create_index([("user_id", 1), ("date", -1)])
-            self._database.expenses.create_index([("user_id", 1), ("category", 1)])
-            
-            # Account balance indexes
-            self._database.account_balance.create_index("user_id", unique=True)
-            
-            print("✓ Database indexes created")
-            
+            self.database.command("ping")
+            print(f"✓ Connected to MongoDB: {self._database.name}")
         except Exception as e:
-            print(f"Warning: Could not create indexes: {e}")
+            print(f"✗ Failed to connect to MongoDB: {e}")
+            raise
     
     @property
     def database(self) -> Database:
@@ -80,14 +108,62 @@ class DatabaseConnection:
         """Close database connection."""
         if self._client:
             self._client.close()
+            self._client = None
+            self._database = None
             print("✓ MongoDB connection closed")
 
 
-# Global database instance
+class AsyncDatabaseConnection:
+    """Singleton class for managing the async (Motor) MongoDB connection.
+    
+    The Motor client connects lazily on its first operation, so creating
+    it never blocks the event loop.
+    """
+    
+    _instance: Optional['AsyncDatabaseConnection'] = None
+    _client: Optional[AsyncIOMotorClient] = None
+    _database: Optional[AsyncIOMotorDatabase] = None
+    
+    def __new__(cls):
+        """Ensure only one instance exists."""
+        if cls._instance is None:
+            cls._instance = super(AsyncDatabaseConnection, cls).__new__(cls)
+        return cls._instance
+    
+    def _connect(self):
+        """Create the Motor client."""
+        mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
+        database_name = os.getenv('MONGODB_DATABASE', 'finance_manager')
+        
+        self._client = AsyncIOMotorClient(mongodb_uri, **get_client_options())
+        self._database = self._client[database_name]
+    
+    @property
+    def database(self) -> AsyncIOMotorDatabase:
+        """Get async database instance."""
+        if self._database is None:
+            self._connect()
+        return self._database
+    
+    def close(self):
+        """Close async database connection."""
+        if self._client:
+            self._client.close()
+            self._client = None
+            self._database = None
+
+
+# Global database instances
 db_connection = DatabaseConnection()
+async_db_connection = AsyncDatabaseConnection()
 
 
 def get_database() -> Database:
     """Get database instance for use in tools."""
     return db_connection.database
 
+
+def get_async_database() -> AsyncIOMotorDatabase:
+    """Get async database instance for use in async tools."""
+    return async_db_connection.database
+
@@ -0,0 +1,204 @@
+"""Index registry and migration for Finance Manager Agent.
+
+INDEX_REGISTRY declares every index the tools need, together with the tool
+queries it serves. Index creation is an explicit, idempotent step instead
+of something every process does on import. Run it once per deployment (and
+after upgrades):
+
+    python -m database.indexes            # create missing indexes
+    python -m database.indexes --prune    # also drop indexes not in the registry
+
+The list indexes end in _id so keyset pagination (tools/pagination.py) can
+walk them in (date, _id) order. After upgrading from the shorter indexes,
+run with --prune to drop the old ones.
+
+benchmarks/explain_plans.py checks every tool query against this registry.
+"""
+import argparse
+from typing import Dict, Any, List
+from pymongo.database import Database
+
+INDEX_REGISTRY: List[Dict[str, Any]] = [
+    # Goals
+    {
+        "collection": "goals",
+        "keys": [("user_id", 1), ("created_at", -1)],
+        "options": {},
+        "used_by": ["get_goal (all goals)"]
+    },
+    {
+        "collection": "goals",
+        "keys": [("user_id", 1), ("goal_id", 1)],
+        "options": {"unique": True},
+        "used_by": ["get_goal (by id)", "update_goal_progress"]
+    },
+    # Expenses
+    {
+        "collection": "expenses",
+        "keys": [("user_id", 1), ("date", -1), ("_id", -1)],
+        "options": {},
+        "used_by": ["get_expenses (pages on date, _id)", "rollup rebuild/verify"]
+    },
+    {
+        "collection": "expenses",
+        "keys": [("user_id", 1), ("category", 1), ("date", -1), ("_id", -1)],
+        "options": {},
+        "used_by": ["get_expenses (by category)"]
+    },
+    {
+        "collection": "expenses",
+        "keys": [("user_id", 1), ("content_hash", 1)],
+        "options": {
+            "unique": True,
+            "partialFilterExpression": {"content_hash": {"$exists": True}}
+        },
+        "used_by": ["import_statement (dedup)"]
+    },
+    # Account balance
+    {
+        "collection": "account_balance",
+        "keys": [("user_id", 1)],
+        "options": {"unique": True},
+        "used_by": ["get_current_account_balance", "set_account_balance", "set_expense"]
+    },
+    # Monthly spend rollups
+    {
+        "collection": "monthly_spend",
+        "keys": [("user_id", 1), ("month", 1), ("category", 1)],
+        "options": {"unique": True},
+        "used_by": ["get_current_account_balance", "set_expense", "set_expenses_bulk"]
+    },
+    # Investments
+    {
+        "collection": "investments",
+        "keys": [("user_id", 1), ("purchase_date", -1), ("_id", -1)],
+        "options": {},
+        "used_by": ["get_portfolio", "get_portfolio_value", "get_investment_summary"]
+    },
+    {
+        "collection": "investments",
+        "keys": [("user_id", 1), ("investment_type", 1), ("purchase_date", -1), ("_id", -1)],
+        "options": {},
+        "used_by": ["get_portfolio (by type)"]
+    },
+    # Agent sessions (database/session_service.py); lookups by _id need no index
+    {
+        "collection": "sessions",
+        "keys": [("app_name", 1), ("user_id", 1), ("last_update_time", -1)],
+        "options": {},
+        "used_by": ["MongoSessionService.list_sessions"]
+    },
+    {
+        "collection": "sessions",
+        "keys": [("expires_at", 1)],
+        "options": {"expireAfterSeconds": 0},
+        "used_by": ["idle session expiry (TTL)"]
+    },
+]
+
+
+def index_name(keys: List[tuple]) -> str:
+    """Return MongoDB's default name for an index key specification."""
+    return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+
+class MissingIndexError(RuntimeError):
+    """A registry index that a write path relies on has not been created."""
+
+
+def require_index(db: Database, collection: str, keys: List[tuple]):
+    """
+    Check that a registry index exists before relying on it.
+
+    Importer deduplication and the rollup $merge depend on unique indexes
+    that only the explicit migration creates. Without them they would
+    silently write duplicates, so they check first.
+
+    Args:
+        db: Database instance
+        collection: Collection the index is declared on
+        keys: Index key specification, as in INDEX_REGISTRY
+
+    Raises:
+        MissingIndexError: If the index (with its unique option) is missing
+    """
+    spec = next(
+        spec for spec in INDEX_REGISTRY
+        if spec["collection"] == collection and spec["keys"] == keys
+    )
+    unique = spec["options"].get("unique", False)
+
+    for index in db[collection].index_information().values():
+        if [tuple(key) for key in index["key"]] == keys and index.get("unique", False) == unique:
+            return
+
+    raise MissingIndexError(
+        f"Index {index_name(keys)} on {collection} is missing; "
+        f"run 'python -m database.indexes' first"
+    )
+
+
+def ensure_indexes(db: Database) -> List[str]:
+    """
+    Create every index in the registry.
+
+    create_index is a no-op for indexes that already exist, so this is
+    safe to run repeatedly.
+
+    Args:
+        db: Database instance
+
+    Returns:
+        List of "collection.index_name" entries that were ensured
+    """
+    ensured = []
+    for spec in INDEX_REGISTRY:
+        name = db[spec["collection"]].create_index(spec["keys"], **spec["options"])
+        ensured.append(f"{spec['collection']}.{name}")
+    return ensured
+
+
+def prune_indexes(db: Database) -> List[str]:
+    """
+    Drop indexes on registry collections that the registry doesn't declare.
+
+    Args:
+        db: Database instance
+
+    Returns:
+        List of "collection.index_name" entries that were dropped
+    """
+    wanted: Dict[str, set] = {}
+    for spec in INDEX_REGISTRY:
+        wanted.setdefault(spec["collection"], {"_id_"}).add(index_name(spec["keys"]))
+
+    dropped = []
+    for collection, names in wanted.items():
+        for existing in db[collection].list_indexes():
+            if existing["name"] not in names:
+                db[collection].drop_index(existing["name"])
+                dropped.append(f"{collection}.{existing['name']}")
+    return dropped
+
+
+def main():
+    """Apply the index registry to the configured database."""
+    from database.connection import db_connection
+
+    parser = argparse.ArgumentParser(description="Apply the Finance Manager index registry.")
+    parser.add_argument("--prune", action="store_true", help="Drop indexes not declared in the registry")
+    args = parser.parse_args()
+
+    db = db_connection.database
+    ensured = ensure_indexes(db)
+    print(f"✓ Database indexes created on {db.name} ({len(ensured)} in registry)")
+
+    if args.prune:
+        for dropped in prune_indexes(db):
+            print(f"  dropped {dropped}")
+
+    db_connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -196,3 +196,114 @@ class Investment(BaseModel):
         if self.current_price is not None:
             return self.quantity * self.current_price
         return None
+
+
+# ---------------------------------------------------------------------------
+# Trusted read rows
+#
+# Documents read back from our own collections were validated on the way in,
+# so read tools wrap them in these __slots__ rows instead of re-running
+# Pydantic validation per document. PROJECTION fetches only the fields each
+# row exposes.
+# ---------------------------------------------------------------------------
+
+
+class ExpenseRow:
+    """Validation-free view of a stored expense."""
+    
+    __slots__ = ("expense_id", "amount", "category", "description", "date", "created_at")
+    PROJECTION = {"_id": 0, **{field: 1 for field in __slots__}}
+    
+    def __init__(self, document: dict):
+        """Wrap a stored expense document."""
+        self.expense_id = document["expense_id"]
+        self.amount = document["amount"]
+        self.category = document["category"]
+        self.description = document["description"]
+        self.date = document["date"]
+        self.created_at = document["created_at"]
+    
+    def to_dict(self) -> dict:
+        """Convert to the tool response shape."""
+        return {
+            "expense_id": self.expense_id,
+            "amount": self.amount,
+            "category": self.category,
+            "description": self.description,
+            "date": self.date.isoformat(),
+            "created_at": self.created_at.isoformat()
+        }
+
+
+class GoalRow:
+    """Validation-free view of a stored goal."""
+    
+    __slots__ = (
+        "goal_id", "name", "goal_type", "target_amount", "current_amount",
+        "deadline", "priority", "created_at", "updated_at"
+    )
+    PROJECTION = {"_id": 0, **{field: 1 for field in __slots__}}
+    
+    def __init__(self, document: dict):
+        """Wrap a stored goal document."""
+        self.goal_id = document["goal_id"]
+        self.name = document["name"]
+        self.goal_type = document["goal_type"]
+        self.target_amount = document["target_amount"]
+        self.current_amount = document.get("current_amount", 0.0)
+        self.deadline = document["deadline"]
+        self.priority = document.get("priority", Priority.MEDIUM.value)
+        self.created_at = document["created_at"]
+        self.updated_at = document.get("updated_at", self.created_at)
+    
+    def progress_percentage(self) -> float:
+        """Calculate progress percentage."""
+        if self.target_amount <= 0:
+            return 0.0
+        return min(100.0, (self.current_amount / self.target_amount) * 100)
+    
+    def to_dict(self, include_updated_at: bool = False) -> dict:
+        """Convert to the tool response shape."""
+        formatted = {
+            "goal_id": self.goal_id,
+            "name": self.name,
+            "type": self.goal_type,
+            "target_amount": self.target_amount,
+            "current_amount": self.current_amount,
+            "deadline": self.deadline.isoformat(),
+            "priority": self.priority,
+            "progress_percentage": self.progress_percentage(),
+            "created_at": self.created_at.isoformat()
+        }
+        if include_updated_at:
+            formatted["updated_at"] = self.updated_at.isoformat()
+        return formatted
+
+
+class InvestmentRow:
+    """Validation-free view of a stored investment."""
+    
+    __slots__ = (
+        "investment_id", "user_id", "symbol", "name", "quantity", "purchase_price",
+        "current_price", "investment_type", "purchase_date", "notes", "created_at", "updated_at"
+    )
+    PROJECTION = {"_id": 0, **{field: 1 for field in __slots__}}
+    
+    def __init__(self, document: dict):
+        """Wrap a stored investment document."""
+        self.investment_id = document["investment_id"]
+        self.user_id = document["user_id"]
+        self.symbol = document["symbol"]
+        self.name = document["name"]
+        self.quantity = document["quantity"]
+        self.purchase_price = document["purchase_price"]
+        self.current_price = document.get("current_price")
+        self.investment_type = document["investment_type"]
+        self.purchase_date = document["purchase_date"]
+        self.notes = document.get("notes")
+        self.created_at = document["created_at"]
+        self.updated_at = document.get("updated_at", self.created_at)
+    
+    def to_dict(self) -> dict:
+        """Convert to the same shape as Investment.to_dict()."""
+        return {field: getattr(self, field) for field in self.__slots__}
@@ -0,0 +1,252 @@
+"""Per-user monthly spend rollups.
+
+The ``monthly_spend`` collection holds one document per
+(user_id, month, category) with the running ``total`` and ``count`` of
+expenses. Every expense write path increments it atomically, so balance and
+threshold checks read a handful of indexed documents instead of scanning a
+month of expenses.
+
+Usage:
+    python -m database.rollups verify [--user-id alice]
+    python -m database.rollups rebuild [--user-id alice]
+"""
+import sys
+import argparse
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Tuple, List, Iterable
+from pymongo import UpdateOne
+from pymongo.client_session import ClientSession
+from pymongo.database import Database
+from database.indexes import require_index
+
+ROLLUP_COLLECTION = "monthly_spend"
+
+# Unique index the rebuild's $merge matches on
+ROLLUP_KEYS = [("user_id", 1), ("month", 1), ("category", 1)]
+
+MONTH_SPEND_PROJECTION = {"_id": 0, "category": 1, "total": 1, "count": 1}
+
+# (month, category) -> (amount, count)
+SpendDeltas = Dict[Tuple[str, str], Tuple[float, int]]
+
+
+def month_key(date: datetime) -> str:
+    """Return the rollup month key (YYYY-MM) for a date, in UTC like MongoDB."""
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc)
+    return date.strftime('%Y-%m')
+
+
+def add_spend_delta(deltas: SpendDeltas, date: datetime, category: str, amount: float):
+    """Accumulate one expense into a deltas mapping."""
+    key = (month_key(date), category)
+    total, count = deltas.get(key, (0.0, 0))
+    deltas[key] = (total + amount, count + 1)
+
+
+def spend_delta_operations(user_id: str, deltas: SpendDeltas) -> List[UpdateOne]:
+    """Build the upserted $inc operations that apply spend deltas."""
+    now = datetime.utcnow()
+    return [
+        UpdateOne(
+            {"user_id": user_id, "month": month, "category": category},
+            {
+                "$inc": {"total": amount, "count": count},
+                "$set": {"updated_at": now}
+            },
+            upsert=True
+        )
+        for (month, category), (amount, count) in deltas.items()
+    ]
+
+
+def apply_spend_deltas(db: Database, user_id: str, deltas: SpendDeltas, session: Optional[ClientSession] = None):
+    """
+    Atomically apply spend deltas to the rollup collection in one round trip.
+
+    Args:
+        db: Database instance
+        user_id: User identifier
+        deltas: Mapping of (month, category) to (amount, count) increments
+        session: Optional session to run the write in (e.g. a transaction)
+    """
+    if not deltas:
+        return
+
+    db[ROLLUP_COLLECTION].bulk_write(spend_delta_operations(user_id, deltas), ordered=False, session=session)
+
+
+def get_month_spend(db: Database, user_id: str, month: str) -> Dict[str, Any]:
+    """
+    Read a user's spend for one month from the rollups.
+
+    Args:
+        db: Database instance
+        user_id: User identifier
+        month: Month key (YYYY-MM)
+
+    Returns:
+        Dictionary with the month total, count and per-category totals
+    """
+    cursor = db[ROLLUP_COLLECTION].find(
+        {"user_id": user_id, "month": month},
+        MONTH_SPEND_PROJECTION
+    )
+    return summarize_month_spend(cursor)
+
+
+def summarize_month_spend(rollups: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine one month's per-category rollup documents."""
+    categories = {}
+    total = 0.0
+    count = 0
+
+    for rollup in rollups:
+        categories[rollup["category"]] = rollup["total"]
+        total += rollup["total"]
+        count += rollup["count"]
+
+    return {"total": total, "count": count, "categories": categories}
+
+
+def _rollup_pipeline(user_id: Optional[str]) -> List[Dict[str, Any]]:
+    """Aggregation that recomputes rollups from the expenses collection."""
+    pipeline = []
+    if user_id:
+        pipeline.append({"$match": {"user_id": user_id}})
+
+    pipeline.extend([
+        {"$group": {
+            "_id": {
+                "user_id": "$user_id",
+                "month": {"$dateToString": {"format": "%Y-%m", "date": "$date"}},
+                "category": "$category"
+            },
+            "total": {"$sum": "$amount"},
+            "count": {"$sum": 1}
+        }},
+        {"$project": {
+            "_id": 0,
+            "user_id": "$_id.user_id",
+            "month": "$_id.month",
+            "category": "$_id.category",
+            "total": 1,
+            "count": 1
+        }}
+    ])
+    return pipeline
+
+
+def rebuild_rollups(db: Database, user_id: Optional[str] = None) -> int:
+    """
+    Recompute rollups from scratch for one user or for everyone.
+
+    Expense writes that land while the rebuild runs may be lost from the
+    rollups, so run this during a quiet period and follow with verify.
+
+    Args:
+        db: Database instance
+        user_id: Optional user to rebuild (defaults to all users)
+
+    Returns:
+        int: Number of rollup documents written
+
+    Raises:
+        MissingIndexError: If the unique rollup index has not been created
+    """
+    require_index(db, ROLLUP_COLLECTION, ROLLUP_KEYS)
+
+    rollup_filter = {"user_id": user_id} if user_id else {}
+    db[ROLLUP_COLLECTION].delete_many(rollup_filter)
+
+    pipeline = _rollup_pipeline(user_id)
+    pipeline.append({"$set": {"updated_at": datetime.utcnow()}})
+    pipeline.append({"$merge": {
+        "into": ROLLUP_COLLECTION,
+        "on": ["user_id", "month", "category"],
+        "whenMatched": "replace",
+        "whenNotMatched": "insert"
+    }})
+    db.expenses.aggregate(pipeline)
+
+    return db[ROLLUP_COLLECTION].count_documents(rollup_filter)
+
+
+def verify_rollups(db: Database, user_id: Optional[str] = None, tolerance: float = 0.005) -> List[Dict[str, Any]]:
+    """
+    Compare stored rollups against a fresh aggregation over expenses.
+
+    Args:
+        db: Database instance
+        user_id: Optional user to verify (defaults to all users)
+        tolerance: Allowed floating-point difference in totals
+
+    Returns:
+        List of mismatches (empty when rollups are consistent)
+    """
+    def key(doc: Dict[str, Any]) -> Tuple[str, str, str]:
+        return doc["user_id"], doc["month"], doc["category"]
+
+    expected = {key(doc): doc for doc in db.expenses.aggregate(_rollup_pipeline(user_id))}
+    stored = {
+        key(doc): doc
+        for doc in db[ROLLUP_COLLECTION].find(
+            {"user_id": user_id} if user_id else {},
+            {"_id": 0, "user_id": 1, "month": 1, "category": 1, "total": 1, "count": 1}
+        )
+    }
+
+    mismatches = []
+    for rollup_key in sorted(set(expected) | set(stored)):
+        want = expected.get(rollup_key, {"total": 0.0, "count": 0})
+        have = stored.get(rollup_key, {"total": 0.0, "count": 0})
+        if want["count"] != have["count"] or abs(want["total"] - have["total"]) > tolerance:
+            mismatches.append({
+                "user_id": rollup_key[0],
+                "month": rollup_key[1],
+                "category": rollup_key[2],
+                "expected_total": round(want["total"], 2),
+                "stored_total": round(have["total"], 2),
+                "expected_count": want["count"],
+                "stored_count": have["count"]
+            })
+
+    return mismatches
+
+
+def main():
+    """Command-line entry point for rebuilding and verifying rollups."""
+    from database.connection import get_database
+
+    parser = argparse.ArgumentParser(description="Maintain monthly spend rollups.")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    parser.add_argument("--user-id", help="Limit to one user (default: all users)")
+    args = parser.parse_args()
+
+    db = get_database()
+
+    if args.command == "rebuild":
+        try:
+            written = rebuild_rollups(db, args.user_id)
+        except RuntimeError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        print(f"✓ Rebuilt {written} rollup documents")
+        return
+
+    mismatches = verify_rollups(db, args.user_id)
+    for mismatch in mismatches:
+        print(
+            f"✗ {mismatch['user_id']} {mismatch['month']} {mismatch['category']}: "
+            f"expected {mismatch['expected_total']:.2f} ({mismatch['expected_count']}), "
+            f"stored {mismatch['stored_total']:.2f} ({mismatch['stored_count']})"
+        )
+
+    if mismatches:
+        print(f"✗ {len(mismatches)} rollup mismatches, run 'rebuild' to repair")
+        sys.exit(1)
+    print("✓ Rollups are consistent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""MongoDB-backed ADK session service.
+
+Sessions live in the ``sessions`` collection, one document per session,
+so nothing is held in process memory between turns and resuming a session
+is a single read by ``_id``. Each document is bounded:
+
+* Events beyond ``max_events`` are compacted: the oldest are folded into a
+  plain-text ``summary`` and only the newest ``keep_events`` are kept. The
+  summary is replayed to the model as the first event of the session.
+* ``expires_at`` is pushed forward on every append and a TTL index removes
+  sessions that have been idle for ``ttl_seconds``.
+
+``app:`` and ``user:`` state is shared across sessions as in ADK, and is
+kept in ``session_state``. It is joined into the same read with $lookup.
+``temp:`` state is never persisted.
+"""
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+from pymongo.errors import DuplicateKeyError
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+from google.genai import types
+
+SESSIONS_COLLECTION = "sessions"
+SHARED_STATE_COLLECTION = "session_state"
+
+# Synthetic event that carries the compacted history
+SUMMARY_EVENT_ID = "session-summary"
+
+# Defaults for SESSION_MAX_EVENTS, SESSION_KEEP_EVENTS and SESSION_TTL_SECONDS
+DEFAULT_MAX_EVENTS = 200
+DEFAULT_KEEP_EVENTS = 50
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+SUMMARY_MAX_CHARS = 4000
+SUMMARY_LINE_CHARS = 200
+
+
+def _session_key(app_name: str, user_id: str, session_id: str) -> str:
+    """Document _id of a session."""
+    return f"{app_name}:{user_id}:{session_id}"
+
+
+def _shared_state_keys(app_name: str, user_id: str) -> List[str]:
+    """Document _ids of the app-wide and user-wide state for a session."""
+    return [f"app:{app_name}", f"user:{app_name}:{user_id}"]
+
+
+def _state_update(app_name: str, user_id: str, state_delta: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Split a state delta into $set documents per storage location.
+
+    Returns:
+        Mapping of "session" or a shared-state _id to its $set document
+    """
+    app_key, user_key = _shared_state_keys(app_name, user_id)
+    updates: Dict[str, Dict[str, Any]] = {}
+
+    for key, value in state_delta.items():
+        if key.startswith(State.TEMP_PREFIX):
+            continue
+        if key.startswith(State.APP_PREFIX):
+            updates.setdefault(app_key, {})[f"state.{key[len(State.APP_PREFIX):]}"] = value
+        elif key.startswith(State.USER_PREFIX):
+            updates.setdefault(user_key, {})[f"state.{key[len(State.USER_PREFIX):]}"] = value
+        else:
+            updates.setdefault("session", {})[f"state.{key}"] = value
+
+    return updates
+
+
+def _merged_state(session_doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Session state with the shared app/user state added under their prefixes."""
+    state = dict(session_doc.get("state", {}))
+    for shared in session_doc.get("shared_state", []):
+        prefix = State.APP_PREFIX if shared["_id"].startswith("app:") else State.USER_PREFIX
+        for key, value in shared.get("state", {}).items():
+            state[prefix + key] = value
+    return state
+
+
+def _summary_event(summary: str, compacted: int) -> Event:
+    """Event that replays the compacted history to the model."""
+    return Event(
+        id=SUMMARY_EVENT_ID,
+        invocation_id=SUMMARY_EVENT_ID,
+        author="user",
+        content=types.Content(
+            role="user",
+            parts=[types.Part(text=f"[Summary of {compacted} earlier conversation events]\n{summary}")]
+        ),
+        timestamp=0.0
+    )
+
+
+def summarize_parts(parts: Iterable[Tuple[str, types.Part]], previous_summary: str = "") -> str:
+    """
+    Fold message parts into a short plain-text transcript.
+
+    Text is kept per speaker and truncated; tool calls and results are
+    reduced to their names. The result is capped at SUMMARY_MAX_CHARS,
+    dropping the oldest lines first.
+
+    Args:
+        parts: (speaker, part) pairs, oldest first
+        previous_summary: Summary from earlier compactions
+
+    Returns:
+        str: The combined summary
+    """
+    lines = previous_summary.splitlines() if previous_summary else []
+
+    for speaker, part in parts:
+        if part.text:
+            text = " ".join(part.text.split())
+            lines.append(f"{speaker}: {text[:SUMMARY_LINE_CHARS]}")
+        elif part.function_call:
+            lines.append(f"{speaker} called {part.function_call.name}")
+        elif part.function_response:
+            lines.append(f"{part.function_response.name} returned")
+
+    while lines and sum(len(line) + 1 for line in lines) > SUMMARY_MAX_CHARS:
+        lines.pop(0)
+
+    return "\n".join(lines)
+
+
+def summarize_events(events: List[Event], previous_summary: str = "") -> str:
+    """
+    Fold events into a short plain-text transcript (see summarize_parts).
+
+    Args:
+        events: Events to fold, oldest first
+        previous_summary: Summary from earlier compactions
+
+    Returns:
+        str: The combined summary
+    """
+    return summarize_parts(
+        ((event.author, part) for event in events if event.content for part in event.content.parts or []),
+        previous_summary
+    )
+
+
+class MongoSessionService(BaseSessionService):
+    """ADK session service that keeps bounded sessions in MongoDB."""
+
+    def __init__(
+        self,
+        db=None,
+        max_events: Optional[int] = None,
+        keep_events: Optional[int] = None,
+        ttl_seconds: Optional[int] = None
+    ):
+        """
+        Settings left as None are read from the environment here rather
+        than at import, since this module is imported before main.py
+        loads .env.
+
+        Args:
+            db: Motor database (defaults to the shared async connection)
+            max_events: Events a session may hold before it is compacted
+            keep_events: Newest events kept verbatim by a compaction
+            ttl_seconds: Idle time after which a session expires
+        """
+        if max_events is None:
+            max_events = int(os.getenv('SESSION_MAX_EVENTS', str(DEFAULT_MAX_EVENTS)))
+        if keep_events is None:
+            keep_events = int(os.getenv('SESSION_KEEP_EVENTS', str(DEFAULT_KEEP_EVENTS)))
+        if ttl_seconds is None:
+            ttl_seconds = int(os.getenv('SESSION_TTL_SECONDS', str(DEFAULT_TTL_SECONDS)))
+
+        if keep_events >= max_events:
+            raise ValueError("keep_events must be smaller than max_events")
+
+        self._db = db
+        self.max_events = max_events
+        self.keep_events = keep_events
+        self.ttl_seconds = ttl_seconds
+
+    @property
+    def db(self):
+        if self._db is None:
+            from database.connection import get_async_database
+            self._db = get_async_database()
+        return self._db
+
+    def _expires_at(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+
+    async def _apply_shared_state(self, updates: Dict[str, Dict[str, Any]]):
+        for state_id, fields in updates.items():
+            if state_id == "session":
+                continue
+            await self.db[SHARED_STATE_COLLECTION].update_one(
+                {"_id": state_id},
+                {"$set": fields},
+                upsert=True
+            )
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None
+    ) -> Session:
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        now = time.time()
+
+        updates = _state_update(app_name, user_id, state or {})
+        session_state = {
+            field[len("state."):]: value
+            for field, value in updates.get("session", {}).items()
+        }
+
+        try:
+            await self.db[SESSIONS_COLLECTION].insert_one({
+                "_id": _session_key(app_name, user_id, session_id),
+                "app_name": app_name,
+                "user_id": user_id,
+                "session_id": session_id,
+                "state": session_state,
+                "events": [],
+                "summary": "",
+                "compacted_events": 0,
+                "last_update_time": now,
+                "expires_at": self._expires_at()
+            })
+        except DuplicateKeyError:
+            raise ValueError(f"Session '{session_id}' already exists")
+
+        await self._apply_shared_state(updates)
+
+        return await self.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None
+    ) -> Optional[Session]:
+        pipeline = [
+            {"$match": {"_id": _session_key(app_name, user_id, session_id)}},
+            {"$lookup": {
+                "from": SHARED_STATE_COLLECTION,
+                "pipeline": [{"$match": {"_id": {"$in": _shared_state_keys(app_name, user_id)}}}],
+                "as": "shared_state"
+            }}
+        ]
+        docs = await self.db[SESSIONS_COLLECTION].aggregate(pipeline).to_list(length=1)
+        if not docs:
+            return None
+
+        session_doc = docs[0]
+        events = [Event.model_validate_json(raw) for raw in session_doc["events"]]
+
+        if config and config.after_timestamp:
+            events = [event for event in events if event.timestamp >= config.after_timestamp]
+        if config and config.num_recent_events:
+            events = events[-config.num_recent_events:]
+
+        if session_doc.get("summary") and len(events) == len(session_doc["events"]):
+            events.insert(0, _summary_event(session_doc["summary"], session_doc["compacted_events"]))
+
+        return Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=_merged_state(session_doc),
+            events=events,
+            last_update_time=session_doc["last_update_time"]
+        )
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        cursor = self.db[SESSIONS_COLLECTION].find(
+            {"app_name": app_name, "user_id": user_id},
+            {"_id": 0, "session_id": 1, "state": 1, "last_update_time": 1}
+        ).sort("last_update_time", -1)
+
+        sessions = [
+            Session(
+                id=doc["session_id"],
+                app_name=app_name,
+                user_id=user_id,
+                state=doc.get("state", {}),
+                events=[],
+                last_update_time=doc["last_update_time"]
+            )
+            async for doc in cursor
+        ]
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await self.db[SESSIONS_COLLECTION].delete_one({"_id": _session_key(app_name, user_id, session_id)})
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        """
+        Append an event, compacting the session once it exceeds max_events.
+
+        Partial (streamed) events are not persisted.
+        """
+        event = await super().append_event(session, event)
+        if event.partial:
+            return event
+
+        session.last_update_time = event.timestamp
+        updates = _state_update(
+            session.app_name,
+            session.user_id,
+            event.actions.state_delta if event.actions else {}
+        )
+
+        fields = {
+            **updates.get("session", {}),
+            "last_update_time": event.timestamp,
+            "expires_at": self._expires_at()
+        }
+
+        history = [stored for stored in session.events if stored.id != SUMMARY_EVENT_ID]
+        if len(history) > self.max_events:
+            update = await self._compaction_update(session, history, fields)
+        else:
+            update = {"$set": fields, "$push": {"events": event.model_dump_json(exclude_none=True)}}
+
+        await self.db[SESSIONS_COLLECTION].update_one(
+            {"_id": _session_key(session.app_name, session.user_id, session.id)},
+            update
+        )
+        await self._apply_shared_state(updates)
+
+        return event
+
+    async def _compaction_update(self, session: Session, history: List[Event], fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Fold the oldest events into the summary and rewrite the kept tail."""
+        session_doc = await self.db[SESSIONS_COLLECTION].find_one(
+            {"_id": _session_key(session.app_name, session.user_id, session.id)},
+            {"summary": 1, "compacted_events": 1}
+        ) or {}
+
+        compacted, kept = history[:-self.keep_events], history[-self.keep_events:]
+        summary = summarize_events(compacted, session_doc.get("summary", ""))
+        compacted_count = session_doc.get("compacted_events", 0) + len(compacted)
+
+        session.events[:] = [_summary_event(summary, compacted_count), *kept]
+
+        return {"$set": {
+            **fields,
+            "events": [stored.model_dump_json(exclude_none=True) for stored in kept],
+            "summary": summary,
+            "compacted_events": compacted_count
+        }}
+
+
+def create_session_service() -> BaseSessionService:
+    """
+    Build the session service selected by SESSION_BACKEND.
+
+    "mongo" (the default) persists bounded sessions in MongoDB; "memory"
+    keeps ADK's in-process InMemorySessionService for quick experiments.
+    """
+    backend = os.getenv('SESSION_BACKEND', 'mongo').lower()
+    if backend == "memory":
+        return InMemorySessionService()
+    if backend == "mongo":
+        return MongoSessionService()
+    raise ValueError(f"Unknown SESSION_BACKEND '{backend}' (expected 'mongo' or 'memory')")
@@ -0,0 +1,419 @@
+"""Bank statement importer for Finance Manager Agent.
+
+Streams a CSV, OFX or QIF statement through a generator pipeline
+(parse -> normalize date -> map category -> batch insert), so only one
+batch of documents is held at a time; beyond that, memory grows only by a
+small occurrence counter per distinct row. Every row carries a content hash of
+(date, amount, description) backed by a unique index, which makes
+re-importing an overlapping statement idempotent.
+
+Usage:
+    python import_statement.py statement.csv
+    python import_statement.py statement.ofx --user-id alice
+    python import_statement.py export.qif --batch-size 5000
+"""
+import os
+import re
+import csv
+import sys
+import time
+import uuid
+import hashlib
+import argparse
+from datetime import datetime, date as date_type
+from itertools import islice
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple
+from dotenv import load_dotenv
+from database.connection import get_database
+from database.indexes import require_index
+from database.models import ExpenseCategory
+from database.rollups import add_spend_delta, apply_spend_deltas
+from tools.expense_tools import _apply_balance_delta, _insert_expense_chunk, _run_in_transaction
+
+# Load environment variables
+load_dotenv()
+
+# MongoDB duplicate key error code
+DUPLICATE_KEY_ERROR = 11000
+
+# Partial unique index that turns re-imported rows into duplicate key errors
+DEDUP_INDEX_KEYS = [("user_id", 1), ("content_hash", 1)]
+
+# Date formats tried (in order) when no explicit --date-format is given
+DATE_FORMATS = (
+    '%Y-%m-%d',
+    '%m/%d/%Y',
+    '%m/%d/%y',
+    '%d.%m.%Y',
+    '%Y%m%d',
+    '%d %b %Y',
+    '%b %d, %Y',
+)
+
+# Description keywords used to infer a category when the statement has none
+CATEGORY_KEYWORDS = {
+    ExpenseCategory.GROCERIES: ("grocery", "supermarket", "market", "whole foods", "safeway", "kroger", "aldi", "lidl"),
+    ExpenseCategory.DINING: ("restaurant", "cafe", "coffee", "starbucks", "pizza", "bar ", "doordash", "uber eats", "grubhub"),
+    ExpenseCategory.TRANSPORT: ("uber", "lyft", "shell", "chevron", "fuel", "gas station", "parking", "transit", "metro"),
+    ExpenseCategory.UTILITIES: ("electric", "water", "internet", "comcast", "verizon", "at&t", "utility", "phone"),
+    ExpenseCategory.ENTERTAINMENT: ("netflix", "spotify", "cinema", "theater", "steam", "hulu", "disney"),
+    ExpenseCategory.HEALTHCARE: ("pharmacy", "cvs", "walgreens", "clinic", "hospital", "dental", "doctor"),
+    ExpenseCategory.SHOPPING: ("amazon", "target", "walmart", "best buy", "ikea", "store"),
+    ExpenseCategory.EDUCATION: ("tuition", "udemy", "coursera", "bookstore", "school"),
+    ExpenseCategory.HOUSING: ("rent", "mortgage", "hoa", "landlord"),
+    ExpenseCategory.INSURANCE: ("insurance", "geico", "allstate", "progressive"),
+}
+
+CATEGORY_VALUES = {category.value for category in ExpenseCategory}
+
+OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)')
+
+
+# ---------------------------------------------------------------------------
+# Parsers: each yields raw rows of {"date": str, "amount": str, "description": str, "category": str}
+# ---------------------------------------------------------------------------
+
+def parse_csv(
+    path: str,
+    date_column: str,
+    amount_column: str,
+    description_column: str,
+    category_column: Optional[str]
+) -> Iterator[Dict[str, str]]:
+    """Stream rows from a CSV statement with a header line."""
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        for row in csv.DictReader(handle):
+            yield {
+                "date": row.get(date_column, ""),
+                "amount": row.get(amount_column, ""),
+                "description": row.get(description_column, ""),
+                "category": row.get(category_column, "") if category_column else ""
+            }
+
+
+def parse_ofx(path: str) -> Iterator[Dict[str, str]]:
+    """Stream STMTTRN transactions from an OFX (SGML or XML) statement."""
+    transaction: Optional[Dict[str, str]] = None
+
+    with open(path, encoding='utf-8', errors='replace') as handle:
+        for line in handle:
+            for closing, tag, value in OFX_TAG.findall(line):
+                tag = tag.upper()
+                if tag == "STMTTRN":
+                    if closing and transaction is not None:
+                        yield {
+                            "date": transaction.get("DTPOSTED", "")[:8],
+                            "amount": transaction.get("TRNAMT", ""),
+                            "description": transaction.get("NAME") or transaction.get("MEMO", ""),
+                            "category": ""
+                        }
+                        transaction = None
+                    elif not closing:
+                        transaction = {}
+                elif transaction is not None and not closing:
+                    transaction[tag] = value.strip()
+
+
+def parse_qif(path: str) -> Iterator[Dict[str, str]]:
+    """Stream transactions from a QIF bank export."""
+    transaction: Dict[str, str] = {}
+
+    with open(path, encoding='utf-8', errors='replace') as handle:
+        for line in handle:
+            line = line.rstrip('\r\n')
+            if not line or line.startswith('!'):
+                continue
+
+            code, value = line[0], line[1:].strip()
+            if code == '^':
+                if transaction:
+                    yield {
+                        "date": transaction.get("D", ""),
+                        "amount": transaction.get("T") or transaction.get("U", ""),
+                        "description": transaction.get("P") or transaction.get("M", ""),
+                        "category": transaction.get("L", "")
+                    }
+                transaction = {}
+            else:
+                transaction.setdefault(code, value)
+
+
+# ---------------------------------------------------------------------------
+# Pipeline stages
+# ---------------------------------------------------------------------------
+
+def parse_statement_date(value: str, date_format: Optional[str] = None) -> datetime:
+    """
+    Parse a statement date string.
+
+    Args:
+        value: Raw date string
+        date_format: Optional explicit strptime format
+
+    Returns:
+        datetime: Parsed date
+    """
+    # QIF writes years after 2000 as 1/5'24
+    value = value.strip().replace("'", "/").replace(" ", "") if "'" in value else value.strip()
+
+    if date_format:
+        return datetime.strptime(value, date_format)
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def map_category(raw_category: str, description: str) -> str:
+    """Map a statement category or description to an ExpenseCategory value."""
+    category = raw_category.strip().lower()
+    if category in CATEGORY_VALUES:
+        return category
+
+    text = f"{category} {description.lower()}"
+    for expense_category, keywords in CATEGORY_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            return expense_category.value
+
+    return ExpenseCategory.OTHER.value
+
+
+def normalize_description(description: str) -> str:
+    """Lowercase a description and collapse its whitespace for deduplication."""
+    return ' '.join(description.lower().split())
+
+
+def content_hash(date: datetime, amount: float, description: str, occurrence: int) -> str:
+    """Build the dedup hash for a statement row."""
+    key = f"{date.date().isoformat()}|{amount:.2f}|{normalize_description(description)}|{occurrence}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def normalize_rows(
+    rows: Iterable[Dict[str, str]],
+    user_id: str,
+    debits_negative: bool,
+    date_format: Optional[str],
+    stats: Dict[str, int]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Turn raw statement rows into expense documents.
+
+    Credits (deposits, refunds) and unparseable rows are skipped and
+    counted in ``stats``. Identical rows on the same day get increasing
+    occurrence numbers so genuine repeats (two identical coffees) are kept
+    while re-imports still collide. Occurrences are counted per (day, row)
+    over the whole import, so statements need not be sorted by date.
+    """
+    occurrences: Dict[Tuple[date_type, str], int] = {}
+
+    for row in rows:
+        stats["read"] += 1
+        try:
+            date = parse_statement_date(row["date"], date_format)
+            amount = float(row["amount"].replace(',', '').replace('$', '').strip())
+        except (ValueError, AttributeError):
+            stats["invalid"] += 1
+            continue
+
+        amount = round(-amount if debits_negative else amount, 2)
+        if amount <= 0:
+            stats["credits"] += 1
+            continue
+
+        description = (row["description"] or "").strip() or "Imported transaction"
+
+        # Same normalization as content_hash, so rows that hash alike count as repeats
+        base_key = (date.date(), f"{amount:.2f}|{normalize_description(description)}")
+        occurrence = occurrences.get(base_key, 0)
+        occurrences[base_key] = occurrence + 1
+
+        now = datetime.utcnow()
+        yield {
+            "expense_id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "amount": amount,
+            "category": map_category(row["category"] or "", description),
+            "description": description,
+            "date": date,
+            "created_at": now,
+            "content_hash": content_hash(date, amount, description, occurrence)
+        }
+
+
+def batched(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group an iterable into lists of at most ``size`` items."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_batch(db, user_id: str, batch: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Insert one batch and debit it in a single transaction.
+
+    The rows, the balance debit and the spend rollup commit together, so
+    a failed batch can simply be imported again. A write error aborts a
+    transaction, so rows whose content hash is already stored are skipped
+    up front rather than left to the unique index. Standalone servers have
+    no transactions and run the same writes one after another.
+
+    Args:
+        db: Database instance
+        user_id: User the expenses belong to
+        batch: Expense documents from normalize_rows
+
+    Returns:
+        Dictionary with inserted, duplicates and failed counts
+    """
+    def write_batch(session) -> Dict[str, int]:
+        counts = {"inserted": 0, "duplicates": 0, "failed": 0}
+        stored = {
+            document["content_hash"] for document in db.expenses.find(
+                {"user_id": user_id, "content_hash": {"$in": [document["content_hash"] for document in batch]}},
+                {"_id": 0, "content_hash": 1},
+                session=session
+            )
+        }
+        new = [document for document in batch if document["content_hash"] not in stored]
+        counts["duplicates"] = len(batch) - len(new)
+
+        failed = _insert_expense_chunk(db, new, session) if new else {}
+        inserted_total = 0.0
+        spend_deltas = {}
+
+        for offset, document in enumerate(new):
+            error = failed.get(offset)
+            if error is None:
+                counts["inserted"] += 1
+                inserted_total += document["amount"]
+                add_spend_delta(spend_deltas, document["date"], document["category"], document["amount"])
+            elif error.get("code") == DUPLICATE_KEY_ERROR:
+                counts["duplicates"] += 1
+            else:
+                counts["failed"] += 1
+
+        # Debit the balance and roll up spend only for rows that were actually new
+        if inserted_total:
+            _apply_balance_delta(db, user_id, -inserted_total, session)
+            apply_spend_deltas(db, user_id, spend_deltas, session)
+        return counts
+
+    return _run_in_transaction(db, write_batch)
+
+
+def import_statement(
+    path: str,
+    user_id: str,
+    file_format: str,
+    batch_size: int = 5000,
+    debits_negative: bool = True,
+    date_format: Optional[str] = None,
+    date_column: str = "date",
+    amount_column: str = "amount",
+    description_column: str = "description",
+    category_column: Optional[str] = "category"
+) -> Dict[str, int]:
+    """
+    Import a statement file into the expenses collection.
+
+    Args:
+        path: Statement file path
+        user_id: User the expenses belong to
+        file_format: One of csv, ofx, qif
+        batch_size: Documents per insert_many call
+        debits_negative: Whether debits are negative amounts in the file
+        date_format: Optional explicit strptime format for dates
+        date_column: CSV column holding the date
+        amount_column: CSV column holding the amount
+        description_column: CSV column holding the description
+        category_column: Optional CSV column holding a category
+
+    Returns:
+        Dictionary of import counters
+
+    Raises:
+        MissingIndexError: If the deduplication index has not been created
+    """
+    db = get_database()
+    require_index(db, "expenses", DEDUP_INDEX_KEYS)
+    stats = {"read": 0, "invalid": 0, "credits": 0, "inserted": 0, "duplicates": 0, "failed": 0}
+
+    if file_format == "csv":
+        rows = parse_csv(path, date_column, amount_column, description_column, category_column)
+    elif file_format == "ofx":
+        rows = parse_ofx(path)
+    elif file_format == "qif":
+        rows = parse_qif(path)
+    else:
+        raise ValueError(f"Unsupported statement format: {file_format}")
+
+    documents = normalize_rows(rows, user_id, debits_negative, date_format, stats)
+
+    for batch in batched(documents, batch_size):
+        for key, count in import_batch(db, user_id, batch).items():
+            stats[key] += count
+
+    return stats
+
+
+def detect_format(path: str) -> str:
+    """Infer the statement format from the file extension."""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ("csv", "ofx", "qfx", "qif"):
+        return "ofx" if extension == "qfx" else extension
+    raise ValueError(f"Cannot detect statement format from '{path}', pass --format")
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Import a bank statement into Finance Manager.")
+    parser.add_argument("path", help="Statement file (CSV, OFX/QFX or QIF)")
+    parser.add_argument("--format", choices=["csv", "ofx", "qif"], help="Statement format (default: from extension)")
+    parser.add_argument("--user-id", default=os.getenv('USER_ID', 'default_user'))
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--debits-positive", action="store_true", help="Debits are positive amounts in the file")
+    parser.add_argument("--date-format", help="Explicit strptime format, e.g. %%d/%%m/%%Y")
+    parser.add_argument("--date-column", default="date")
+    parser.add_argument("--amount-column", default="amount")
+    parser.add_argument("--description-column", default="description")
+    parser.add_argument("--category-column", default="category")
+    args = parser.parse_args()
+
+    try:
+        file_format = args.format or detect_format(args.path)
+        started = time.perf_counter()
+        stats = import_statement(
+            args.path,
+            user_id=args.user_id,
+            file_format=file_format,
+            batch_size=args.batch_size,
+            debits_negative=not args.debits_positive,
+            date_format=args.date_format,
+            date_column=args.date_column,
+            amount_column=args.amount_column,
+            description_column=args.description_column,
+            category_column=args.category_column or None
+        )
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        print(f"❌ Import failed: {e}")
+        sys.exit(1)
+
+    print(f"✓ Imported {stats['inserted']} expenses in {elapsed:.2f}s")
+    print(f"  Rows read:          {stats['read']}")
+    print(f"  Already imported:   {stats['duplicates']}")
+    print(f"  Credits skipped:    {stats['credits']}")
+    print(f"  Invalid rows:       {stats['invalid']}")
+    print(f"  Failed inserts:     {stats['failed']}")
+
+
+if __name__ == "__main__":
+    main()
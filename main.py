@@ -1,21 +1,35 @@
 """Main application entry point for Finance Manager Agent."""
 import os
 import sys
+import json
+import uuid
 import asyncio
+import logging
+import argparse
 from dotenv import load_dotenv
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
 from root_agent import root_agent
-from database.connection import db_connection
+from database.connection import db_connection, async_db_connection
+from database.session_service import create_session_service
+from runtime.fast_path import FAST_PATH_ENABLED, fast_path_stats
+from runtime.streaming import stream_agent_async, turn_timing
+from observability.tool_metrics import tool_metrics
+from tools.cache import TOOL_CACHE_ENABLED, tool_cache, start_change_feed
+from observability.tracing import setup_tracing, shutdown_tracing
+from observability.profiler import PROFILE_MODES, turn_profiler
 
 # Load environment variables
 load_dotenv()
 
 # Application constants
 APP_NAME = "finance_manager_app"
+
+# User for the interactive CLI session; tools take the user from each session
 USER_ID = os.getenv('USER_ID', 'default_user')
 
+# Print responses as they stream in instead of waiting for the final text
+STREAMING_ENABLED = os.getenv('STREAMING', 'on').lower() in ('1', 'true', 'on', 'yes')
+
 
 def initialize_application():
     """Initialize the application and check configuration."""
@@ -36,8 +50,7 @@ def initialize_application():
     
     # Test database connection
     try:
-        db = db_connection.database
-        print(f"✓ Connected to database: {db.name}")
+        db_connection.ping()
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         print("Please ensure MongoDB is running and connection string is correct.")
@@ -57,44 +70,57 @@ def initialize_application():
     print()
 
 
-async def call_agent_async(runner, session_id: str, query: str):
+async def call_agent_async(runner, user_id: str, session_id: str, query: str):
     """
     Sends a query to the agent and processes the response.
     
     Args:
         runner: The ADK Runner instance
+        user_id: The user the session belongs to
         session_id: The session identifier
         query: User's query text
         
     Returns:
         str: The agent's final response text
     """
-    # Prepare the user's message in ADK format
-    new_message = types.Content(
-        role='user',
-        parts=[types.Part(text=query)]
-    )
+    final_response_text = ""
+    
+    async for update in stream_agent_async(runner, user_id, session_id, query, streaming=False):
+        if update["type"] == "final":
+            final_response_text = update["text"]
+    
+    return final_response_text
+
+
+async def print_agent_stream(runner, user_id: str, session_id: str, query: str) -> str:
+    """
+    Prints the agent's response as it streams in, with tool progress.
     
+    Args:
+        runner: The ADK Runner instance
+        user_id: The user the session belongs to
+        session_id: The session identifier
+        query: User's query text
+        
+    Returns:
+        str: The agent's final response text
+    """
+    printed_text = False
     final_response_text = ""
     
-    try:
-        # Execute the agent logic and process events
-        async for event in runner.run_async(
-            user_id=USER_ID,
-            session_id=session_id,
-            new_message=new_message
-        ):
-            # Check for the final response event
-            if event.is_final_response():
-                if event.content and event.content.parts:
-                    # Extract text response from the first part
-                    final_response_text = event.content.parts[0].text
-                elif event.actions and hasattr(event.actions, 'escalate') and event.actions.escalate:
-                    # Handle escalation
-                    final_response_text = f"Agent escalated: {event.error_message if hasattr(event, 'error_message') else 'Unknown error'}"
-                break
-    except Exception as e:
-        final_response_text = f"Error processing request: {str(e)}"
+    async for update in stream_agent_async(runner, user_id, session_id, query, streaming=True):
+        if update["type"] == "text":
+            print(update["text"], end="", flush=True)
+            printed_text = True
+        elif update["type"] == "tool_call":
+            print(f"[{update['name']}…] ", end="", flush=True)
+        elif update["type"] == "final":
+            final_response_text = update["text"]
+    
+    # Errors and escalations only arrive with the final update
+    if final_response_text and not printed_text:
+        print(final_response_text, end="")
+    print()
     
     return final_response_text
 
@@ -102,19 +128,32 @@ async def call_agent_async(runner, session_id: str, query: str):
 async def main_async():
     """Main conversation loop using ADK Runner with session management."""
     initialize_application()
+    setup_tracing()
+    change_feed = await start_change_feed()
     
-    # Initialize the InMemory session service for local development
-    session_service = InMemorySessionService()
+    # Sessions persist in MongoDB (SESSION_BACKEND=memory keeps them in-process)
+    session_service = create_session_service()
     
-    # Create a session for the conversation (await since it's async)
-    session_id = f"session_{USER_ID}_001"
-    session = await session_service.create_session(
-        app_name=APP_NAME,
-        user_id=USER_ID,
-        session_id=session_id
-    )
+    # Resume SESSION_ID if it is still stored, otherwise start a new session
+    session_id = os.getenv('SESSION_ID')
+    session = None
+    if session_id:
+        session = await session_service.get_session(
+            app_name=APP_NAME,
+            user_id=USER_ID,
+            session_id=session_id
+        )
     
-    print(f"✓ Session created: {session.id}")
+    if session:
+        print(f"✓ Session resumed: {session.id}")
+    else:
+        session_id = session_id or f"session_{USER_ID}_{uuid.uuid4().hex[:8]}"
+        session = await session_service.create_session(
+            app_name=APP_NAME,
+            user_id=USER_ID,
+            session_id=session_id
+        )
+        print(f"✓ Session created: {session.id}")
     print()
     
     # Initialize the ADK Runner
@@ -146,13 +185,15 @@ async def main_async():
             # Send message and get response using the runner
             print("Finance Advisor: ", end="", flush=True)
             
-            # Call the agent asynchronously
-            response_text = await call_agent_async(runner, session_id, user_input)
-            
-            # Display response
-            if response_text:
-                print(response_text)
+            # Call the agent asynchronously, printing as the response streams in
+            if STREAMING_ENABLED:
+                response_text = await print_agent_stream(runner, USER_ID, session_id, user_input)
             else:
+                response_text = await call_agent_async(runner, USER_ID, session_id, user_input)
+                if response_text:
+                    print(response_text)
+            
+            if not response_text:
                 print("I apologize, I couldn't generate a response. Could you try rephrasing that?")
             
             print()
@@ -168,13 +209,53 @@ async def main_async():
             print("Please try again or type 'quit' to exit.")
             print()
     
+    timing = turn_timing.snapshot()
+    if timing["turns"]:
+        print(f"✓ Time to first token p50 {timing['ttft_p50_ms']:.0f}ms, "
+              f"turn p50 {timing['turn_p50_ms']:.0f}ms over {timing['turns']} turns")
+    
+    if FAST_PATH_ENABLED:
+        stats = fast_path_stats.snapshot()
+        print(f"✓ Fast path answered {stats['hits']}/{stats['turns']} turns "
+              f"({stats['hit_rate']:.0%}), ~{stats['estimated_saved_s']}s saved")
+    
+    if TOOL_CACHE_ENABLED:
+        cache = tool_cache.snapshot()
+        print(f"✓ Tool cache served {cache['hits']}/{cache['hits'] + cache['misses']} reads "
+              f"({cache['hit_rate']:.0%})")
+    
+    metrics_dump = os.getenv('TOOL_METRICS_DUMP')
+    if metrics_dump:
+        with open(metrics_dump, "w", encoding="utf-8") as output:
+            json.dump(tool_metrics.snapshot(), output, indent=2)
+        print(f"✓ Tool metrics written to {metrics_dump}")
+    
     # Clean up
+    if change_feed is not None:
+        await change_feed.stop()
+    shutdown_tracing()
+    async_db_connection.close()
     db_connection.close()
     print("✓ Application closed successfully")
 
 
 def main():
     """Entry point - runs the async main function."""
+    parser = argparse.ArgumentParser(description="Finance Manager Agent CLI")
+    parser.add_argument("--profile", type=float, nargs="?", const=1.0, default=None, metavar="RATE",
+                        help="Profile this share of turns (default 1.0 when given)")
+    parser.add_argument("--profile-mode", choices=PROFILE_MODES, help="sample (folded stacks) or cprofile")
+    parser.add_argument("--profile-dir", help="Where turn profiles are written")
+    args = parser.parse_args()
+    
+    if args.profile is not None:
+        try:
+            turn_profiler.configure(args.profile, args.profile_mode, args.profile_dir)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    # Prompt compaction and other runtime details are logged at INFO/DEBUG
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper())
     asyncio.run(main_async())
 
 
@@ -0,0 +1 @@
+"""Metrics and diagnostics for agent turns, tools and MongoDB commands."""
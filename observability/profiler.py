@@ -0,0 +1,199 @@
+"""Opt-in per-turn profiler.
+
+A configurable share of turns (``--profile RATE`` on main.py and
+server.py, or PROFILE_RATE) is profiled while it runs on the event loop
+thread. There are two modes:
+
+    sample    (default) a background thread samples the loop thread's stack
+              every PROFILE_INTERVAL_MS. It writes folded stacks (<turn>.folded)
+              for flamegraph.pl, speedscope or inferno.
+    cprofile  deterministic cProfile of the turn (<turn>.prof), for
+              snakeviz, flameprof or pstats.
+
+Files go to PROFILE_DIR. Their names include the tools the turn called,
+and one line per profiled turn is appended to PROFILE_DIR/index.jsonl. A
+line holds the file, user, session, duration and tools.
+
+Only one turn per process is profiled at a time, so a turn that starts
+while another is being profiled is skipped. The profile covers all work
+on the event loop during the turn. On a busy server it includes
+neighbouring turns, so read server profiles as "what the loop was doing".
+
+Usage:
+    python main.py --profile                 # every turn
+    python server.py --profile 0.05          # 5% of turns
+    flamegraph.pl profiles/<turn>.folded > turn.svg
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import cProfile
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, List, Iterator
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("sample", "cprofile")
+
+# Frames under the repo are shown relative to it, library frames from site-packages
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _frame_label(code) -> str:
+    """Folded-stack label for a code object: function (file:line)."""
+    path = code.co_filename
+    if path.startswith(_REPO_ROOT):
+        path = os.path.relpath(path, _REPO_ROOT)
+    elif "site-packages" in path:
+        path = path.split("site-packages" + os.sep, 1)[-1]
+    else:
+        path = os.path.basename(path)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="turn-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def folded(self) -> str:
+        """Stacks in the folded format: "frame;frame;frame count" per line."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class TurnProfile:
+    """Tools called during one turn; profiling state when it is sampled."""
+
+    def __init__(self, sampled: bool):
+        self.sampled = sampled
+        self.tools: List[str] = []
+
+    def add_tool(self, name: str):
+        self.tools.append(name)
+
+
+class TurnProfiler:
+    """Chooses which turns to profile and writes their profiles."""
+
+    def __init__(self):
+        self.rate = float(os.getenv('PROFILE_RATE', '0'))
+        self.mode = os.getenv('PROFILE_MODE', 'sample')
+        self.directory = os.getenv('PROFILE_DIR', 'profiles')
+        self.interval = float(os.getenv('PROFILE_INTERVAL_MS', '5')) / 1000
+        self._busy = threading.Lock()
+
+    def configure(self, rate: float, mode: Optional[str] = None, directory: Optional[str] = None):
+        """
+        Set the share of turns to profile (0 disables profiling).
+
+        Args:
+            rate: Fraction of turns to profile, 0.0-1.0
+            mode: "sample" or "cprofile"
+            directory: Where profiles are written
+
+        Raises:
+            ValueError: If the rate or mode is invalid
+        """
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Profile rate must be between 0 and 1, got {rate}")
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Profile mode must be one of {', '.join(PROFILE_MODES)}, got {mode!r}")
+        self.rate = rate
+        self.mode = mode or self.mode
+        self.directory = directory or self.directory
+
+    @contextmanager
+    def profile_turn(self, user_id: str, session_id: str) -> Iterator[TurnProfile]:
+        """
+        Profile the enclosed turn if it is chosen.
+
+        Args:
+            user_id: The user the session belongs to
+            session_id: The session identifier
+
+        Yields:
+            TurnProfile to tag with the tools the turn calls
+        """
+        if not self.rate or random.random() >= self.rate or not self._busy.acquire(blocking=False):
+            yield TurnProfile(sampled=False)
+            return
+
+        profile = TurnProfile(sampled=True)
+        started = time.perf_counter()
+        sampler: Optional[StackSampler] = None
+        profiler: Optional[cProfile.Profile] = None
+        try:
+            if self.mode == "cprofile":
+                profiler = cProfile.Profile()
+                profiler.enable()
+            else:
+                sampler = StackSampler(threading.get_ident(), self.interval)
+                sampler.start()
+            yield profile
+        finally:
+            try:
+                if profiler is not None:
+                    profiler.disable()
+                if sampler is not None:
+                    sampler.stop()
+                self._write(profile, user_id, session_id, time.perf_counter() - started, sampler, profiler)
+            finally:
+                self._busy.release()
+
+    def _write(self, profile: TurnProfile, user_id: str, session_id: str, seconds: float,
+               sampler: Optional[StackSampler], profiler: Optional[cProfile.Profile]):
+        """Write the turn's profile and its index line."""
+        tools = sorted(set(profile.tools))
+        tag = "+".join(tools) if tools else "no-tools"
+        name = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:6]}_{tag}"[:120]
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if profiler is not None:
+                path = os.path.join(self.directory, f"{name}.prof")
+                profiler.dump_stats(path)
+            else:
+                path = os.path.join(self.directory, f"{name}.folded")
+                with open(path, "w", encoding="utf-8") as output:
+                    output.write(sampler.folded())
+
+            with open(os.path.join(self.directory, "index.jsonl"), "a", encoding="utf-8") as index:
+                index.write(json.dumps({
+                    "file": os.path.basename(path),
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "duration_ms": round(seconds * 1000, 1),
+                    "mode": self.mode,
+                    "tools": profile.tools
+                }) + "\n")
+        except OSError as e:
+            logger.warning("Could not write turn profile to %s: %s", self.directory, e)
+
+
+turn_profiler = TurnProfiler()
@@ -0,0 +1,376 @@
+"""Per-tool latency and MongoDB round-trip metrics.
+
+Every tool in tools/ is wrapped with ``instrument_tool``. Each call
+records its latency, whether it failed and the size of its JSON result.
+``CommandMetricsListener`` is a pymongo command listener passed to both
+MongoDB clients. It charges every command to the tool running in the
+current context: count by command name, server time and documents
+returned. Motor runs commands on executor threads with a copy of the
+caller's context, so the attribution also holds for the async tools.
+Commands issued outside a tool (sessions, migrations) are counted under
+tool "none".
+
+Commands slower than SLOW_QUERY_MS are logged with the tool, collection
+and duration. ``render_prometheus`` returns the Prometheus text format
+(GET /metrics on the server). ``tool_metrics.snapshot()`` returns the same
+numbers as JSON (GET /metrics/tools). ``python -m observability.tool_metrics``
+dumps that JSON from a running server.
+
+Usage:
+    python -m observability.tool_metrics --url http://localhost:8000
+    python -m observability.tool_metrics --url http://localhost:8000 --json --out metrics.json
+
+All of it is off unless TOOL_METRICS=on.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import functools
+import threading
+import inspect
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List, Tuple, Callable
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+TOOL_METRICS_ENABLED = os.getenv('TOOL_METRICS', 'off').lower() in ('1', 'true', 'on', 'yes')
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '100'))
+
+# Histogram bucket upper bounds (Prometheus "le" values)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RESULT_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Label for DB commands issued outside any tool
+NO_TOOL = "none"
+
+# Name of the tool running in the current context
+_current_tool: ContextVar[Optional[str]] = ContextVar("current_tool", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs, ending with +Inf."""
+        running, pairs = 0, []
+        for bound, count in zip(list(self.buckets) + [float("inf")], self.counts):
+            running += count
+            pairs.append(("+Inf" if bound == float("inf") else repr(bound), running))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        running, lower = 0, 0.0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and running + count >= rank:
+                return lower + (bound - lower) * (rank - running) / count
+            running += count
+            lower = bound
+        return self.buckets[-1]
+
+
+class _ToolSeries:
+    """Everything recorded for one tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.result_bytes = Histogram(RESULT_SIZE_BUCKETS)
+        self.db_commands: Dict[str, int] = {}
+        self.db_seconds = 0.0
+        self.docs_returned = 0
+        self.slow_commands = 0
+
+
+class ToolMetrics:
+    """Thread-safe registry of per-tool metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: Dict[str, _ToolSeries] = {}
+
+    def _series(self, tool: str) -> _ToolSeries:
+        series = self._tools.get(tool)
+        if series is None:
+            series = self._tools[tool] = _ToolSeries()
+        return series
+
+    def record_call(self, tool: str, seconds: float, failed: bool, result_bytes: Optional[int]):
+        """Record one finished tool call."""
+        with self._lock:
+            series = self._series(tool)
+            series.calls += 1
+            series.errors += int(failed)
+            series.latency.observe(seconds)
+            if result_bytes is not None:
+                series.result_bytes.observe(result_bytes)
+
+    def record_command(self, tool: str, command_name: str, seconds: float, docs_returned: int, slow: bool):
+        """Record one MongoDB command issued by a tool."""
+        with self._lock:
+            series = self._series(tool)
+            series.db_commands[command_name] = series.db_commands.get(command_name, 0) + 1
+            series.db_seconds += seconds
+            series.docs_returned += docs_returned
+            series.slow_commands += int(slow)
+
+    def reset(self):
+        with self._lock:
+            self._tools.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-tool call counts, latency percentiles and DB usage, slowest p95 first."""
+        with self._lock:
+            tools = {}
+            for name, series in self._tools.items():
+                calls = max(series.calls, 1)
+                tools[name] = {
+                    "calls": series.calls,
+                    "errors": series.errors,
+                    "latency_p50_ms": round(series.latency.quantile(0.5) * 1000, 2),
+                    "latency_p95_ms": round(series.latency.quantile(0.95) * 1000, 2),
+                    "latency_mean_ms": round(series.latency.total / calls * 1000, 2),
+                    "db_commands": dict(series.db_commands),
+                    "db_commands_per_call": round(sum(series.db_commands.values()) / calls, 2),
+                    "db_ms_per_call": round(series.db_seconds / calls * 1000, 2),
+                    "docs_returned_per_call": round(series.docs_returned / calls, 1),
+                    "result_bytes_mean": round(series.result_bytes.total / max(series.result_bytes.count, 1)),
+                    "slow_commands": series.slow_commands
+                }
+        return dict(sorted(tools.items(), key=lambda item: item[1]["latency_p95_ms"], reverse=True))
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP finance_tool_calls_total Tool calls by outcome.",
+            "# TYPE finance_tool_calls_total counter",
+        ]
+        with self._lock:
+            tools = sorted(self._tools.items())
+            for name, series in tools:
+                lines.append(f'finance_tool_calls_total{{tool="{_escape(name)}",status="ok"}} {series.calls - series.errors}')
+                lines.append(f'finance_tool_calls_total{{tool="{_escape(name)}",status="error"}} {series.errors}')
+
+            _histogram_lines(lines, "finance_tool_latency_seconds", "Tool call latency.", tools, "latency")
+            _histogram_lines(lines, "finance_tool_result_bytes", "Size of tool results as JSON.", tools, "result_bytes")
+
+            lines += [
+                "# HELP finance_tool_db_commands_total MongoDB commands issued by tools.",
+                "# TYPE finance_tool_db_commands_total counter",
+            ]
+            for name, series in tools:
+                for command_name, count in sorted(series.db_commands.items()):
+                    lines.append(
+                        f'finance_tool_db_commands_total{{tool="{_escape(name)}",command="{_escape(command_name)}"}} {count}'
+                    )
+
+            for metric, help_text, attribute in (
+                ("finance_tool_db_seconds_total", "MongoDB command time by tool.", "db_seconds"),
+                ("finance_tool_db_docs_returned_total", "Documents returned to tools by MongoDB.", "docs_returned"),
+                ("finance_tool_db_slow_commands_total", "MongoDB commands slower than SLOW_QUERY_MS.", "slow_commands"),
+            ):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                for name, series in tools:
+                    lines.append(f'{metric}{{tool="{_escape(name)}"}} {getattr(series, attribute)}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(lines: List[str], metric: str, help_text: str, tools, attribute: str):
+    lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+    for name, series in tools:
+        histogram = getattr(series, attribute)
+        label = f'tool="{_escape(name)}"'
+        for le, count in histogram.cumulative():
+            lines.append(f'{metric}_bucket{{{label},le="{le}"}} {count}')
+        lines.append(f"{metric}_sum{{{label}}} {histogram.total}")
+        lines.append(f"{metric}_count{{{label}}} {histogram.count}")
+
+
+tool_metrics = ToolMetrics()
+
+
+def _result_size(result: Any) -> Optional[int]:
+    """Size of a tool result once serialized for the model."""
+    try:
+        return len(json.dumps(result, default=str))
+    except (TypeError, ValueError):
+        return None
+
+
+def _failed(result: Any) -> bool:
+    """Tools report failures as {"success": False, ...}."""
+    return isinstance(result, dict) and result.get("success") is False
+
+
+def instrument_tool(func: Callable) -> Callable:
+    """
+    Record latency, failures, result size and DB commands of a tool.
+
+    The wrapper keeps the tool's name, docstring and signature, so ADK
+    builds the same function declaration and still injects tool_context.
+
+    Args:
+        func: Sync or async tool function
+
+    Returns:
+        The wrapped tool (func itself when TOOL_METRICS is off)
+    """
+    if not TOOL_METRICS_ENABLED:
+        return func
+
+    name = func.__name__
+
+    def finish(started: float, result: Any, failed: bool):
+        tool_metrics.record_call(
+            name,
+            time.perf_counter() - started,
+            failed or _failed(result),
+            _result_size(result) if result is not None else None
+        )
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = _current_tool.set(name)
+            started = time.perf_counter()
+            result, failed = None, True
+            try:
+                result = await func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                _current_tool.reset(token)
+                finish(started, result, failed)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current_tool.set(name)
+        started = time.perf_counter()
+        result, failed = None, True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            _current_tool.reset(token)
+            finish(started, result, failed)
+    return wrapper
+
+
+def _docs_returned(command_name: str, reply: Dict[str, Any]) -> int:
+    """Number of documents a command sent back to the client."""
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    if command_name == "findAndModify":
+        return int(reply.get("value") is not None)
+    return 0
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Charges MongoDB commands to the tool that issued them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # request_id -> target collection, for slow-command logs
+        self._collections: Dict[int, str] = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if isinstance(collection, str):
+            with self._lock:
+                self._collections[event.request_id] = collection
+
+    def _finish(self, event, reply: Optional[Dict[str, Any]]):
+        with self._lock:
+            collection = self._collections.pop(event.request_id, "")
+        tool = _current_tool.get() or NO_TOOL
+        seconds = event.duration_micros / 1e6
+        slow = seconds * 1000 >= SLOW_QUERY_MS
+        if slow:
+            logger.warning(
+                "Slow MongoDB command: %s on %s.%s from tool %s took %.1fms",
+                event.command_name, event.database_name, collection, tool, seconds * 1000
+            )
+        tool_metrics.record_command(
+            tool, event.command_name, seconds, _docs_returned(event.command_name, reply or {}), slow
+        )
+
+    def succeeded(self, event):
+        self._finish(event, event.reply)
+
+    def failed(self, event):
+        self._finish(event, None)
+
+
+command_listener = CommandMetricsListener()
+
+
+def print_table(snapshot: Dict[str, Any]):
+    """Print the per-tool snapshot as a table, slowest first."""
+    print(f"{'tool':<30}{'calls':>7}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'db/call':>9}{'db ms':>8}{'docs':>8}{'bytes':>9}{'slow':>6}")
+    for name, stats in snapshot.items():
+        print(
+            f"{name:<30}{stats['calls']:>7}{stats['errors']:>5}{stats['latency_p50_ms']:>9.1f}"
+            f"{stats['latency_p95_ms']:>9.1f}{stats['db_commands_per_call']:>9.1f}{stats['db_ms_per_call']:>8.1f}"
+            f"{stats['docs_returned_per_call']:>8.1f}{stats['result_bytes_mean']:>9}{stats['slow_commands']:>6}"
+        )
+
+
+def main():
+    """Dump a running server's tool metrics."""
+    import httpx
+
+    parser = argparse.ArgumentParser(description="Dump per-tool metrics from a running server")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    parser.add_argument("--out", help="Write the JSON to this file")
+    args = parser.parse_args()
+
+    try:
+        response = httpx.get(f"{args.url.rstrip('/')}/metrics/tools", timeout=10)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"✗ Could not fetch metrics: {e}")
+        sys.exit(1)
+
+    snapshot = response.json()
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as output:
+            json.dump(snapshot, output, indent=2)
+        print(f"✓ Wrote metrics for {len(snapshot)} tools to {args.out}")
+    elif args.json:
+        print(json.dumps(snapshot, indent=2))
+    else:
+        print_table(snapshot)
+
+
+if __name__ == "__main__":
+    main()
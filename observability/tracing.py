@@ -0,0 +1,320 @@
+"""Span tracing for agent turns, delegation, tools and MongoDB commands.
+
+ADK already opens OpenTelemetry spans for each invocation, agent run
+(``agent_run [expenses_agent]``), model call (``call_llm``) and tool call
+(``execute_tool get_expenses``, including ``transfer_to_agent`` and the
+nested ``search_agent`` AgentTool). This module adds the pieces around them:
+
+- ``setup_tracing`` installs a tracer provider that exports every span.
+  TRACING selects the exporters: ``file`` writes JSON lines to TRACE_FILE,
+  ``otlp`` sends to an OTLP/HTTP collector at OTEL_EXPORTER_OTLP_ENDPOINT,
+  and ``file,otlp`` does both.
+- ``turn_span`` is the root span of one turn, opened by stream_agent_async.
+- ``TracingCommandListener`` opens a client span for each MongoDB command
+  issued inside a traced turn. It is attached to both clients by
+  database/connection.py.
+
+``python -m observability.tracing waterfall`` prints the latest turns
+from a trace file as latency waterfalls.
+
+Usage:
+    TRACING=file python main.py
+    python -m observability.tracing waterfall --file traces.jsonl --last 3
+    python -m observability.tracing waterfall --trace-id 4bf92f3577b34da6a3ce929d0e0e4736
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Iterator, Sequence
+from pymongo import monitoring
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider, ReadableSpan
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+logger = logging.getLogger(__name__)
+
+TRACING_EXPORTERS = [
+    name.strip() for name in os.getenv('TRACING', 'off').lower().split(',')
+    if name.strip() and name.strip() != 'off'
+]
+TRACING_ENABLED = bool(TRACING_EXPORTERS)
+TRACE_FILE = os.getenv('TRACE_FILE', 'traces.jsonl')
+SERVICE_NAME = os.getenv('OTEL_SERVICE_NAME', 'finance_manager_agent')
+
+TURN_SPAN = "turn"
+WATERFALL_WIDTH = 40
+
+tracer = trace.get_tracer("finance_manager_agent")
+
+_provider: Optional[TracerProvider] = None
+_setup_lock = threading.Lock()
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = []
+        for span in spans:
+            parent = span.parent
+            lines.append(json.dumps({
+                "trace_id": format(span.context.trace_id, "032x"),
+                "span_id": format(span.context.span_id, "016x"),
+                "parent_id": format(parent.span_id, "016x") if parent else None,
+                "name": span.name,
+                "start_ns": span.start_time,
+                "end_ns": span.end_time,
+                "status": span.status.status_code.name,
+                "attributes": dict(span.attributes or {})
+            }, default=str))
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as trace_file:
+                trace_file.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.warning("Could not write spans to %s: %s", self.path, e)
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def _otlp_exporter() -> Optional[SpanExporter]:
+    """OTLP/HTTP exporter, if the exporter package is installed."""
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError:
+        logger.warning("TRACING=otlp needs opentelemetry-exporter-otlp-proto-http; skipping OTLP export")
+        return None
+    return OTLPSpanExporter()
+
+
+def setup_tracing() -> bool:
+    """
+    Install the span exporters selected by TRACING (once per process).
+
+    Returns:
+        bool: True if spans are being exported
+    """
+    global _provider
+
+    if not TRACING_ENABLED:
+        return False
+
+    with _setup_lock:
+        if _provider is not None:
+            return True
+
+        current = trace.get_tracer_provider()
+        if isinstance(current, TracerProvider):
+            provider = current
+        else:
+            provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+            trace.set_tracer_provider(provider)
+
+        for name in TRACING_EXPORTERS:
+            if name == "file":
+                exporter = JsonLinesSpanExporter(TRACE_FILE)
+            elif name == "otlp":
+                exporter = _otlp_exporter()
+            else:
+                logger.warning("Unknown TRACING exporter %r (use file and/or otlp)", name)
+                exporter = None
+            if exporter is not None:
+                provider.add_span_processor(BatchSpanProcessor(exporter))
+
+        _provider = provider
+    return True
+
+
+def shutdown_tracing():
+    """Flush pending spans and stop the exporters."""
+    global _provider
+
+    with _setup_lock:
+        if _provider is not None:
+            _provider.shutdown()
+            _provider = None
+
+
+@contextmanager
+def turn_span(user_id: str, session_id: str, streaming: bool) -> Iterator[trace.Span]:
+    """
+    Root span of one turn; agent, model, tool and DB spans nest under it.
+
+    The message text is not recorded.
+
+    Args:
+        user_id: The user the session belongs to
+        session_id: The session identifier
+        streaming: Whether model text is streamed
+
+    Yields:
+        The span (non-recording when tracing is off)
+    """
+    attributes = {"enduser.id": user_id, "session.id": session_id, "turn.streaming": streaming}
+    with tracer.start_as_current_span(TURN_SPAN, attributes=attributes) as span:
+        yield span
+
+
+class TracingCommandListener(monitoring.CommandListener):
+    """Opens a client span for each MongoDB command issued inside a trace.
+
+    Commands run with a copy of the caller's context (Motor included), so
+    the current span is the tool or turn that issued the command.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[int, trace.Span] = {}
+
+    def started(self, event):
+        if not trace.get_current_span().is_recording():
+            return
+        collection = event.command.get(event.command_name)
+        span = tracer.start_span(
+            f"mongodb.{event.command_name}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "mongodb",
+                "db.name": event.database_name,
+                "db.operation": event.command_name,
+                "db.mongodb.collection": collection if isinstance(collection, str) else ""
+            }
+        )
+        with self._lock:
+            self._spans[event.request_id] = span
+
+    def _end(self, event) -> Optional[trace.Span]:
+        with self._lock:
+            return self._spans.pop(event.request_id, None)
+
+    def succeeded(self, event):
+        span = self._end(event)
+        if span is not None:
+            span.end()
+
+    def failed(self, event):
+        span = self._end(event)
+        if span is not None:
+            span.set_status(Status(StatusCode.ERROR, str(event.failure)))
+            span.end()
+
+
+command_listener = TracingCommandListener()
+
+
+def load_spans(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Read a trace file and group its spans by trace ID."""
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    with open(path, encoding="utf-8") as trace_file:
+        for line in trace_file:
+            if line.strip():
+                span = json.loads(line)
+                traces.setdefault(span["trace_id"], []).append(span)
+    return traces
+
+
+def _category(name: str) -> str:
+    """Bucket a span name into model, tool, db or agent time."""
+    if name == "call_llm":
+        return "model"
+    if name.startswith("execute_tool"):
+        return "tool"
+    if name.startswith("mongodb."):
+        return "db"
+    return "agent"
+
+
+def render_waterfall(spans: List[Dict[str, Any]]) -> List[str]:
+    """
+    Lay out one trace as an indented waterfall.
+
+    Args:
+        spans: Every span of one trace
+
+    Returns:
+        Lines of text: offset and duration in ms, a bar and the span name
+    """
+    spans = sorted(spans, key=lambda span: span["start_ns"])
+    span_ids = {span["span_id"] for span in spans}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for span in spans:
+        parent = span["parent_id"] if span["parent_id"] in span_ids else None
+        children.setdefault(parent, []).append(span)
+
+    trace_start = spans[0]["start_ns"]
+    trace_ns = max(max(span["end_ns"] for span in spans) - trace_start, 1)
+    lines = [f"{'offset ms':>10}{'dur ms':>10}  {'':<{WATERFALL_WIDTH}}  span"]
+
+    def walk(span: Dict[str, Any], depth: int):
+        offset = span["start_ns"] - trace_start
+        duration = span["end_ns"] - span["start_ns"]
+        lead = int(offset / trace_ns * WATERFALL_WIDTH)
+        width = max(1, round(duration / trace_ns * WATERFALL_WIDTH))
+        bar = (" " * lead + "█" * width)[:WATERFALL_WIDTH]
+        marker = " ✗" if span["status"] == "ERROR" else ""
+        lines.append(f"{offset / 1e6:>10.1f}{duration / 1e6:>10.1f}  {bar:<{WATERFALL_WIDTH}}  {'  ' * depth}{span['name']}{marker}")
+        for child in children.get(span["span_id"], []):
+            walk(child, depth + 1)
+
+    for root in children.get(None, []):
+        walk(root, 0)
+
+    totals: Dict[str, float] = {}
+    for span in spans:
+        category = _category(span["name"])
+        if category != "agent":
+            totals[category] = totals.get(category, 0.0) + (span["end_ns"] - span["start_ns"]) / 1e6
+    lines.append(
+        f"total {trace_ns / 1e6:.1f}ms  " + "  ".join(f"{name} {ms:.1f}ms" for name, ms in sorted(totals.items()))
+    )
+    return lines
+
+
+def main():
+    """Print per-turn latency waterfalls from a trace file."""
+    parser = argparse.ArgumentParser(description="Per-turn latency waterfalls from a trace file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    waterfall = commands.add_parser("waterfall", help="Print turn waterfalls")
+    waterfall.add_argument("--file", default=TRACE_FILE)
+    waterfall.add_argument("--trace-id", help="Show this trace only")
+    waterfall.add_argument("--last", type=int, default=1, help="Show the latest N turns")
+    args = parser.parse_args()
+
+    try:
+        traces = load_spans(args.file)
+    except OSError as e:
+        print(f"✗ Could not read {args.file}: {e}")
+        sys.exit(1)
+
+    if args.trace_id:
+        selected = [traces[args.trace_id]] if args.trace_id in traces else []
+    else:
+        turns = [spans for spans in traces.values() if any(span["name"] == TURN_SPAN for span in spans)]
+        turns.sort(key=lambda spans: min(span["start_ns"] for span in spans))
+        selected = turns[-args.last:]
+
+    if not selected:
+        print("✗ No matching turns in the trace file")
+        sys.exit(1)
+
+    for spans in selected:
+        print(f"Trace {spans[0]['trace_id']}")
+        for line in render_waterfall(spans):
+            print(line)
+        print()
+
+
+if __name__ == "__main__":
+    main()
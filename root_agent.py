@@ -1,25 +1,53 @@
+import os
 from const import MODEL_GEMINI_2_5_PRO
 from google.adk.agents import Agent
 from google.adk.tools import agent_tool
-from instructions.root_agent_instructions import ROOT_AGENT_INSTRUCTIONS
-from tools.goal_tools import set_goal, get_goal
+from instructions.root_agent_instructions import ROOT_AGENT_INSTRUCTIONS, ROOT_AGENT_DIRECT_READ_INSTRUCTIONS
+from runtime.history import compact_history
+from tools.async_goal_tools import set_goal, get_goal
+from tools.async_expense_tools import get_expenses, get_current_account_balance
+from tools.async_investment_tools import get_portfolio, get_portfolio_value, get_investment_summary
+from tools.snapshot_tools import get_financial_snapshot
 from subagents.expenses_agent import expenses_agent
 from subagents.investment_agent import investment_agent
 
 
 AGENT_MODEL = MODEL_GEMINI_2_5_PRO
 
+# "delegate": expense and investment reads go through the sub-agents.
+# "direct": read-only tools are also attached here, saving the transfer
+# hop (a full model call) on read turns; sub-agents keep the writes.
+DELEGATION_MODES = ("delegate", "direct")
+DELEGATION_MODE = os.getenv('DELEGATION_MODE', 'delegate').lower()
+if DELEGATION_MODE not in DELEGATION_MODES:
+    raise ValueError(f"Unknown DELEGATION_MODE '{DELEGATION_MODE}' (expected 'delegate' or 'direct')")
+
+DIRECT_READ_TOOLS = [
+    get_expenses,
+    get_current_account_balance,
+    get_portfolio,
+    get_portfolio_value,
+    get_investment_summary
+]
+
 # Define tools for the root agent
 root_agent_tools = [
     set_goal,
-    get_goal
+    get_goal,
+    get_financial_snapshot
 ]
 
+root_agent_instruction = ROOT_AGENT_INSTRUCTIONS
+if DELEGATION_MODE == "direct":
+    root_agent_tools += DIRECT_READ_TOOLS
+    root_agent_instruction += ROOT_AGENT_DIRECT_READ_INSTRUCTIONS
+
 root_agent = Agent(
     name="finance_advisor_agent",
     model=AGENT_MODEL,
     description="Provides financial advice and investment recommendations based on the user's financial goals and risk tolerance.",
-    instruction=ROOT_AGENT_INSTRUCTIONS,
+    instruction=root_agent_instruction,
     tools=root_agent_tools,
+    before_model_callback=compact_history,
     sub_agents=[expenses_agent, investment_agent]
-)
\ No newline at end of file
+)
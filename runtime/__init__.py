@@ -0,0 +1 @@
+"""Conversation runtime helpers that sit between the runner and the model."""
@@ -0,0 +1,295 @@
+"""Deterministic fast path for common read-only questions.
+
+"What's my balance", "how much did I spend on dining this month" and
+"show my goals" otherwise cost at least two model calls (the root agent
+delegates, then the sub-agent calls the tool). When FAST_PATH is on,
+``try_fast_path`` runs in front of the agent and answers these directly
+from get_current_account_balance, get_expenses and get_goal with
+templated replies.
+
+Matching is deliberately strict: the whole message has to match one of
+the patterns below and any category has to be a known one, otherwise the
+turn goes to the agent unchanged. Answered turns are still appended to
+the session so the agent sees them in later turns.
+"""
+import os
+import re
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, NamedTuple
+from google.adk.events import Event
+from google.genai import types
+from database.models import ExpenseCategory
+from tools.context import user_context
+from tools.async_expense_tools import get_current_account_balance, get_expenses
+from tools.async_goal_tools import get_goal
+
+logger = logging.getLogger(__name__)
+
+FAST_PATH_ENABLED = os.getenv('FAST_PATH', 'off').lower() in ('1', 'true', 'on', 'yes')
+
+CATEGORY_ALIASES = {
+    **{category.value: category.value for category in ExpenseCategory},
+    "food": "groceries",
+    "restaurants": "dining",
+    "eating out": "dining",
+    "transportation": "transport",
+    "rent": "housing",
+    "bills": "utilities",
+    "health": "healthcare",
+    "medical": "healthcare",
+}
+
+_BALANCE_PATTERNS = [
+    r"(what is|show|show me|tell me|check) my (current |account )?balance( now| today)?",
+    r"how much (money )?do i have( left)?",
+    r"(my )?(current |account )?balance",
+]
+_SPEND_PATTERNS = [
+    r"how much (did i|have i) (spend|spent)( on (?P<category>[a-z ]+?))? (?P<period>this month|last month)",
+    r"what did i spend( on (?P<category>[a-z ]+?))? (?P<period>this month|last month)",
+    r"(show |show me )?my (?P<category>[a-z ]+? )?spending (?P<period>this month|last month)",
+]
+_GOALS_PATTERNS = [
+    r"(show|show me|list|what are|display) (all )?my (financial )?goals",
+    r"(my )?goals",
+]
+
+
+class Intent(NamedTuple):
+    """A matched read-only intent."""
+    name: str
+    category: Optional[str] = None
+    period: str = "this month"
+
+
+class FastPathStats:
+    """Hit rate of the fast path and the latency it saves."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.fast_seconds = 0.0
+            self.agent_turns = 0
+            self.agent_seconds = 0.0
+
+    def record_hit(self, seconds: float):
+        """Record a turn answered by the fast path."""
+        with self._lock:
+            self.hits += 1
+            self.fast_seconds += seconds
+
+    def record_miss(self):
+        """Record a turn the fast path handed to the agent."""
+        with self._lock:
+            self.misses += 1
+
+    def record_agent_turn(self, seconds: float):
+        """Record the latency of a turn answered by the agent."""
+        with self._lock:
+            self.agent_turns += 1
+            self.agent_seconds += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the hit rate and estimated latency saved.
+
+        Saved latency assumes each hit would otherwise have taken the
+        average agent turn.
+        """
+        with self._lock:
+            turns = self.hits + self.misses
+            avg_fast = self.fast_seconds / self.hits if self.hits else 0.0
+            avg_agent = self.agent_seconds / self.agent_turns if self.agent_turns else 0.0
+            return {
+                "enabled": FAST_PATH_ENABLED,
+                "turns": turns,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / turns, 3) if turns else 0.0,
+                "avg_fast_path_ms": round(avg_fast * 1000, 1),
+                "avg_agent_turn_ms": round(avg_agent * 1000, 1),
+                "estimated_saved_s": round(self.hits * max(avg_agent - avg_fast, 0.0), 1)
+            }
+
+
+fast_path_stats = FastPathStats()
+
+
+def _normalize(text: str) -> str:
+    """Lowercase, expand "what's" and drop punctuation."""
+    text = text.lower().replace("what's", "what is").replace("whats", "what is")
+    text = re.sub(r"[^a-z0-9 ]+", " ", text)
+    return " ".join(text.split())
+
+
+def match_intent(text: str) -> Optional[Intent]:
+    """
+    Match a message against the read-only intents.
+
+    Args:
+        text: The user's message
+
+    Returns:
+        The matched Intent, or None when the message isn't an exact match
+    """
+    normalized = _normalize(text)
+
+    for pattern in _BALANCE_PATTERNS:
+        if re.fullmatch(pattern, normalized):
+            return Intent("balance")
+
+    for pattern in _GOALS_PATTERNS:
+        if re.fullmatch(pattern, normalized):
+            return Intent("goals")
+
+    for pattern in _SPEND_PATTERNS:
+        match = re.fullmatch(pattern, normalized)
+        if not match:
+            continue
+        category = (match.group("category") or "").strip()
+        if category and category not in CATEGORY_ALIASES:
+            return None
+        return Intent("spend", CATEGORY_ALIASES.get(category), match.group("period"))
+
+    return None
+
+
+def _period_range(period: str, now: datetime) -> tuple:
+    """Start and end (ISO strings) of this or last calendar month."""
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if period == "last month":
+        last_month_start = (month_start - timedelta(days=1)).replace(day=1)
+        return last_month_start.isoformat(), (month_start - timedelta(microseconds=1)).isoformat()
+    return month_start.isoformat(), now.isoformat()
+
+
+async def _answer_balance(intent: Intent) -> Optional[str]:
+    result = await get_current_account_balance()
+    if not result["success"]:
+        return None
+    if result.get("message"):
+        return result["message"]
+
+    reply = f"Your current balance is ${result['current_balance']:,.2f}. "
+    reply += f"You've spent ${result['current_month_spent']:,.2f} this month"
+    if result["monthly_expense_threshold"] > 0:
+        reply += (
+            f", {result['threshold_usage_percentage']:.0f}% of your "
+            f"${result['monthly_expense_threshold']:,.2f} monthly limit"
+        )
+    return reply + "."
+
+
+async def _answer_spend(intent: Intent) -> Optional[str]:
+    start_date, end_date = _period_range(intent.period, datetime.utcnow())
+    result = await get_expenses(start_date, end_date, intent.category, 1)
+    if not result["success"]:
+        return None
+
+    count = result["total_count"]
+    noun = "expense" if count == 1 else "expenses"
+    if intent.category:
+        return f"You spent ${result['total_amount']:,.2f} on {intent.category} {intent.period} ({count} {noun})."
+
+    reply = f"You spent ${result['total_amount']:,.2f} {intent.period} ({count} {noun})."
+    top = sorted(result["category_breakdown"].items(), key=lambda item: item[1], reverse=True)[:3]
+    if top:
+        reply += " Top categories: " + ", ".join(f"{category} ${amount:,.2f}" for category, amount in top) + "."
+    return reply
+
+
+async def _answer_goals(intent: Intent) -> Optional[str]:
+    result = await get_goal(None)
+    if not result["success"]:
+        return None
+    if not result["goals"]:
+        return "You don't have any financial goals yet. Would you like to set one?"
+
+    lines = [f"You have {result['count']} goal{'s' if result['count'] != 1 else ''}:"]
+    for goal in result["goals"]:
+        lines.append(
+            f"• {goal['name']}: ${goal['current_amount']:,.2f} of ${goal['target_amount']:,.2f} "
+            f"({goal['progress_percentage']:.0f}%), due {goal['deadline'][:10]}"
+        )
+    return "\n".join(lines)
+
+
+_ANSWERS = {
+    "balance": _answer_balance,
+    "spend": _answer_spend,
+    "goals": _answer_goals,
+}
+
+
+async def _record_exchange(runner, user_id: str, session_id: str, query: str, reply: str):
+    """Append the question and templated reply to the session."""
+    session_service = runner.session_service
+    session = await session_service.get_session(app_name=runner.app_name, user_id=user_id, session_id=session_id)
+    if session is None:
+        return
+
+    invocation_id = f"fastpath-{uuid.uuid4().hex}"
+    await session_service.append_event(session, Event(
+        invocation_id=invocation_id,
+        author="user",
+        content=types.Content(role="user", parts=[types.Part(text=query)])
+    ))
+    await session_service.append_event(session, Event(
+        invocation_id=invocation_id,
+        author=runner.agent.name,
+        content=types.Content(role="model", parts=[types.Part(text=reply)])
+    ))
+
+
+async def try_fast_path(runner, user_id: str, session_id: str, query: str) -> Optional[str]:
+    """
+    Answer a turn without the model when it is a known read-only question.
+
+    Args:
+        runner: The ADK Runner (for its session service)
+        user_id: The user the session belongs to
+        session_id: The session identifier
+        query: User's query text
+
+    Returns:
+        The templated reply, or None to fall back to the agent
+    """
+    if not FAST_PATH_ENABLED:
+        return None
+
+    intent = match_intent(query)
+    if intent is None:
+        fast_path_stats.record_miss()
+        return None
+
+    started = time.perf_counter()
+    try:
+        with user_context(user_id):
+            reply = await _ANSWERS[intent.name](intent)
+    except Exception:
+        reply = None
+
+    if reply is None:
+        fast_path_stats.record_miss()
+        return None
+
+    try:
+        await _record_exchange(runner, user_id, session_id, query, reply)
+    except Exception:
+        # Without the exchange in the session the agent would lose this turn;
+        # let the agent answer (and record) it instead
+        logger.exception("Could not record fast path reply for session %s", session_id)
+        fast_path_stats.record_miss()
+        return None
+
+    fast_path_stats.record_hit(time.perf_counter() - started)
+    return reply
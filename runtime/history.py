@@ -0,0 +1,215 @@
+"""Token-budgeted history compaction before model calls.
+
+Every model call resends the session history. ``compact_history`` is
+installed as a ``before_model_callback`` on each agent. When a request's
+estimated size exceeds HISTORY_TOKEN_BUDGET it shrinks the request in two
+steps and keeps the newest HISTORY_KEEP_TURNS turns verbatim:
+
+1. Bulky tool results in older turns (expense lists, portfolio dumps) are
+   reduced to their scalar fields, with long lists replaced by a count.
+2. If that isn't enough, older turns are collapsed into a short text
+   summary prepended to the first kept turn.
+
+Only the outgoing request changes; the stored session is untouched.
+Prompt size before and after is recorded in ``prompt_stats``.
+"""
+import os
+import json
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from database.session_service import summarize_parts
+
+logger = logging.getLogger(__name__)
+
+# Defaults for HISTORY_TOKEN_BUDGET (0 disables compaction) and HISTORY_KEEP_TURNS
+DEFAULT_TOKEN_BUDGET = 8000
+DEFAULT_KEEP_TURNS = 3
+
+# Rough characters-per-token ratio for Gemini on English text and JSON
+CHARS_PER_TOKEN = 4
+
+# Lists in older tool results longer than this are replaced by a count
+MAX_LIST_ITEMS = 3
+
+
+class PromptSizeStats:
+    """Running totals of estimated prompt size before and after compaction."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters."""
+        with self._lock:
+            self.calls = 0
+            self.compacted_calls = 0
+            self.tokens_before = 0
+            self.tokens_after = 0
+            self.max_tokens_before = 0
+            self.last: Dict[str, Any] = {}
+
+    def record(self, agent_name: str, before: int, after: int):
+        """Record one model call's estimated prompt size."""
+        with self._lock:
+            self.calls += 1
+            self.compacted_calls += after < before
+            self.tokens_before += before
+            self.tokens_after += after
+            self.max_tokens_before = max(self.max_tokens_before, before)
+            self.last = {"agent": agent_name, "tokens_before": before, "tokens_after": after}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters with per-call averages."""
+        with self._lock:
+            calls = self.calls or 1
+            return {
+                "model_calls": self.calls,
+                "compacted_calls": self.compacted_calls,
+                "avg_prompt_tokens_before": round(self.tokens_before / calls),
+                "avg_prompt_tokens_after": round(self.tokens_after / calls),
+                "max_prompt_tokens_before": self.max_tokens_before,
+                "last_call": dict(self.last)
+            }
+
+
+prompt_stats = PromptSizeStats()
+
+
+def estimate_tokens(contents: List[types.Content]) -> int:
+    """Estimate the token count of request contents from their character length."""
+    chars = 0
+    for content in contents:
+        for part in content.parts or []:
+            if part.text:
+                chars += len(part.text)
+            elif part.function_call:
+                chars += len(part.function_call.name or "")
+                chars += len(json.dumps(part.function_call.args or {}, default=str))
+            elif part.function_response:
+                chars += len(part.function_response.name or "")
+                chars += len(json.dumps(part.function_response.response or {}, default=str))
+    return chars // CHARS_PER_TOKEN
+
+
+def history_settings() -> Tuple[int, int]:
+    """
+    Read the token budget and kept turns from the environment.
+
+    Read per call rather than at import: agents (and so this module) are
+    imported before main.py loads .env.
+
+    Returns:
+        Tuple of (token budget, turns kept verbatim)
+    """
+    budget = int(os.getenv('HISTORY_TOKEN_BUDGET', str(DEFAULT_TOKEN_BUDGET)))
+    keep_turns = int(os.getenv('HISTORY_KEEP_TURNS', str(DEFAULT_KEEP_TURNS)))
+    return budget, keep_turns
+
+
+def _is_turn_start(content: types.Content) -> bool:
+    """A turn starts with a user message that isn't a tool result."""
+    return content.role == "user" and any(part.text for part in content.parts or [])
+
+
+def _turn_starts(contents: List[types.Content]) -> List[int]:
+    return [index for index, content in enumerate(contents) if _is_turn_start(content)]
+
+
+def shrink_value(value: Any) -> Any:
+    """Keep the scalar shape of a tool result and replace long lists by a count."""
+    if isinstance(value, dict):
+        return {key: shrink_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if len(value) > MAX_LIST_ITEMS:
+            return f"[{len(value)} items omitted]"
+        return [shrink_value(item) for item in value]
+    return value
+
+
+def _shrink_tool_results(contents: List[types.Content]) -> List[types.Content]:
+    """Copy contents with every tool result shrunk."""
+    shrunk = []
+    for content in contents:
+        parts = []
+        for part in content.parts or []:
+            if part.function_response:
+                part = types.Part(function_response=types.FunctionResponse(
+                    id=part.function_response.id,
+                    name=part.function_response.name,
+                    response=shrink_value(part.function_response.response or {})
+                ))
+            parts.append(part)
+        shrunk.append(types.Content(role=content.role, parts=parts))
+    return shrunk
+
+
+def summarize_contents(contents: List[types.Content]) -> str:
+    """Fold request contents into a capped transcript, as sessions are compacted."""
+    return summarize_parts((content.role, part) for content in contents for part in content.parts or [])
+
+
+def compact_contents(contents: List[types.Content], budget: int, keep_turns: int) -> List[types.Content]:
+    """
+    Shrink request contents to fit a token budget.
+
+    Args:
+        contents: Request contents, oldest first
+        budget: Estimated token budget
+        keep_turns: Newest turns kept verbatim (at least the current one)
+
+    Returns:
+        The compacted contents (the input list when it already fits or
+        there are no older turns to compact)
+    """
+    if estimate_tokens(contents) <= budget:
+        return contents
+
+    keep_turns = max(keep_turns, 1)
+    starts = _turn_starts(contents)
+    if len(starts) <= keep_turns:
+        return contents
+
+    split = starts[-keep_turns]
+    older, recent = contents[:split], contents[split:]
+
+    older = _shrink_tool_results(older)
+    if estimate_tokens(older + recent) <= budget:
+        return older + recent
+
+    summary = types.Part(text=f"[Summary of earlier conversation]\n{summarize_contents(older)}")
+    if recent and _is_turn_start(recent[0]):
+        first = types.Content(role="user", parts=[summary, *recent[0].parts])
+        return [first, *recent[1:]]
+    return [types.Content(role="user", parts=[summary]), *recent]
+
+
+def compact_history(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """
+    before_model_callback that compacts the request history to the budget.
+
+    Args:
+        callback_context: ADK callback context
+        llm_request: Outgoing model request (modified in place)
+
+    Returns:
+        None, so the model call always proceeds
+    """
+    budget, keep_turns = history_settings()
+    before = estimate_tokens(llm_request.contents)
+    if budget > 0:
+        llm_request.contents = compact_contents(llm_request.contents, budget, keep_turns)
+    after = estimate_tokens(llm_request.contents) if budget > 0 else before
+
+    prompt_stats.record(callback_context.agent_name, before, after)
+    if after < before:
+        logger.info("%s prompt compacted: ~%d -> ~%d tokens", callback_context.agent_name, before, after)
+    else:
+        logger.debug("%s prompt: ~%d tokens", callback_context.agent_name, before)
+
+    return None
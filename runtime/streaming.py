@@ -0,0 +1,172 @@
+"""Turn execution as a stream of updates.
+
+``stream_agent_async`` runs one turn and yields updates as they arrive
+instead of only the final text:
+
+    {"type": "text", "agent": ..., "text": ...}         partial model text
+    {"type": "tool_call", "agent": ..., "name": ...}     a tool is being called
+    {"type": "tool_result", "agent": ..., "name": ...}   a tool returned
+    {"type": "transfer", "agent": ..., "to": ...}        delegation to a sub-agent
+    {"type": "final", "text": ...}                       the turn's final response
+
+With ``streaming=True`` the runner uses server-sent-event streaming, so
+model text arrives in chunks. Time to first token (the first text update)
+and total turn time are recorded in ``turn_timing``. Each turn runs in a
+``turn`` span (see observability/tracing.py) and may be profiled (see
+observability/profiler.py).
+"""
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, AsyncIterator, Optional
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.genai import types
+from tools.context import user_context
+from runtime.fast_path import try_fast_path, fast_path_stats
+from observability.tracing import turn_span
+from observability.profiler import turn_profiler
+
+# Recent turns kept for the latency percentiles
+TIMING_WINDOW = 1000
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class TurnTimingStats:
+    """Time to first token and total turn time over recent turns."""
+
+    def __init__(self, window: int = TIMING_WINDOW):
+        self._lock = threading.Lock()
+        self._first_token = deque(maxlen=window)
+        self._total = deque(maxlen=window)
+
+    def record(self, first_token: Optional[float], total: float):
+        """Record one turn (first_token is None if no text was produced)."""
+        with self._lock:
+            if first_token is not None:
+                self._first_token.append(first_token)
+            self._total.append(total)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return p50/p95 time to first token and turn time in milliseconds."""
+        with self._lock:
+            first_token = sorted(self._first_token)
+            total = sorted(self._total)
+
+        return {
+            "turns": len(total),
+            "ttft_p50_ms": round(_percentile(first_token, 50) * 1000, 1),
+            "ttft_p95_ms": round(_percentile(first_token, 95) * 1000, 1),
+            "turn_p50_ms": round(_percentile(total, 50) * 1000, 1),
+            "turn_p95_ms": round(_percentile(total, 95) * 1000, 1)
+        }
+
+
+turn_timing = TurnTimingStats()
+
+
+def _event_text(event) -> str:
+    """Visible text of an event, without thought parts."""
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text for part in event.content.parts if part.text and not part.thought)
+
+
+async def stream_agent_async(
+    runner,
+    user_id: str,
+    session_id: str,
+    query: str,
+    streaming: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run one turn and yield progress updates as they arrive.
+
+    Args:
+        runner: The ADK Runner instance
+        user_id: The user the session belongs to
+        session_id: The session identifier
+        query: User's query text
+        streaming: Stream model text in chunks (SSE) instead of whole responses
+
+    Yields:
+        Update dictionaries, ending with exactly one "final" update
+    """
+    with (
+        turn_span(user_id, session_id, streaming) as span,
+        turn_profiler.profile_turn(user_id, session_id) as profile
+    ):
+        started = time.perf_counter()
+        first_token: Optional[float] = None
+
+        # Common read-only questions are answered without the model when enabled
+        fast_reply = await try_fast_path(runner, user_id, session_id, query)
+        span.set_attribute("turn.fast_path", fast_reply is not None)
+        if fast_reply is not None:
+            elapsed = time.perf_counter() - started
+            turn_timing.record(elapsed, elapsed)
+            yield {"type": "text", "agent": runner.agent.name, "text": fast_reply}
+            yield {"type": "final", "text": fast_reply}
+            return
+
+        # Prepare the user's message in ADK format
+        new_message = types.Content(
+            role='user',
+            parts=[types.Part(text=query)]
+        )
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE if streaming else StreamingMode.NONE)
+
+        final_response_text = ""
+        # Whether the current response's text already went out as partial chunks
+        streamed_response = False
+
+        try:
+            # Execute the agent logic and process events; tools resolve the user
+            # from the session, and the binding covers any direct tool calls
+            with user_context(user_id):
+                async for event in runner.run_async(
+                    user_id=user_id,
+                    session_id=session_id,
+                    new_message=new_message,
+                    run_config=run_config
+                ):
+                    for call in event.get_function_calls():
+                        profile.add_tool(call.name)
+                        yield {"type": "tool_call", "agent": event.author, "name": call.name}
+                    for response in event.get_function_responses():
+                        yield {"type": "tool_result", "agent": event.author, "name": response.name}
+                    if event.actions and event.actions.transfer_to_agent:
+                        yield {"type": "transfer", "agent": event.author, "to": event.actions.transfer_to_agent}
+
+                    text = _event_text(event)
+                    if text and (event.partial or not streamed_response):
+                        if first_token is None:
+                            first_token = time.perf_counter() - started
+                        yield {"type": "text", "agent": event.author, "text": text}
+                    streamed_response = bool(event.partial)
+
+                    # Check for the final response event
+                    if event.is_final_response() and not event.partial:
+                        if text:
+                            final_response_text = text
+                        elif event.actions and event.actions.escalate:
+                            # Handle escalation
+                            final_response_text = f"Agent escalated: {event.error_message or 'Unknown error'}"
+                        break
+        except Exception as e:
+            span.record_exception(e)
+            final_response_text = f"Error processing request: {str(e)}"
+
+        elapsed = time.perf_counter() - started
+        fast_path_stats.record_agent_turn(elapsed)
+        turn_timing.record(first_token, elapsed)
+        if first_token is not None:
+            span.set_attribute("turn.ttft_ms", round(first_token * 1000, 1))
+
+        yield {"type": "final", "text": final_response_text}
@@ -0,0 +1,391 @@
+"""HTTP/WebSocket server for Finance Manager Agent.
+
+Serves root_agent to many users from one event loop. Each worker keeps
+one Runner and one session service (MongoDB-backed by default); sessions
+belong to the user in the URL, and the tools act for that user through
+the ADK session. Turns are admitted through a per-worker in-flight limit,
+and turns within one session run one at a time.
+
+Endpoints:
+    GET  /health
+    GET  /stats                                              prompt size, fast-path and cache hit rates
+    GET  /metrics                                            per-tool latency and DB metrics (Prometheus)
+    GET  /metrics/tools                                      the same per tool as JSON
+    POST /users/{user_id}/sessions
+    POST /users/{user_id}/sessions/{session_id}/messages   {"message": "..."}
+    POST /users/{user_id}/sessions/{session_id}/messages/stream   same body, server-sent events
+    WS   /users/{user_id}/sessions/{session_id}/ws          {"message": "...", "stream": true} per turn
+
+Streaming endpoints send text, tool_call, tool_result and transfer
+updates as they happen (see runtime/streaming.py). An SSE stream ends
+with a "final" event. A WebSocket turn always ends with a "response"
+frame.
+
+Usage:
+    python server.py --port 8000 --max-in-flight 64
+    python server.py --profile 0.05 --profile-mode sample
+    uvicorn server:create_app --factory --workers 4
+
+Authentication is not handled here; put the server behind a gateway that
+maps callers to user IDs.
+"""
+import os
+import json
+import uuid
+import time
+import asyncio
+import logging
+import weakref
+import argparse
+from contextlib import asynccontextmanager, aclosing
+from typing import Optional, Dict, Any, AsyncIterator
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from pydantic import BaseModel
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService
+from database.connection import db_connection, async_db_connection
+from database.session_service import create_session_service
+from main import APP_NAME, call_agent_async
+from runtime.history import prompt_stats
+from runtime.fast_path import fast_path_stats
+from runtime.streaming import stream_agent_async, turn_timing
+from observability.tool_metrics import tool_metrics
+from tools.cache import tool_cache, start_change_feed
+from observability.tracing import setup_tracing, shutdown_tracing
+from observability.profiler import PROFILE_MODES, turn_profiler
+
+# Load environment variables
+load_dotenv()
+
+# Turns running at once per worker, and how long a turn may wait for a slot
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv('SERVER_MAX_IN_FLIGHT', '32'))
+DEFAULT_QUEUE_TIMEOUT_S = float(os.getenv('SERVER_QUEUE_TIMEOUT_S', '30'))
+
+
+class ServerBusy(Exception):
+    """Raised when a turn can't get an in-flight slot before the queue timeout."""
+
+
+class MessageRequest(BaseModel):
+    """Body of a message turn."""
+    message: str
+
+
+class AgentServer:
+    """One worker's Runner, session service and admission control."""
+
+    def __init__(
+        self,
+        agent,
+        session_service: Optional[BaseSessionService] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT_S
+    ):
+        self.session_service = session_service or create_session_service()
+        self.runner = Runner(
+            agent=agent,
+            app_name=APP_NAME,
+            session_service=self.session_service
+        )
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._slots = asyncio.Semaphore(max_in_flight)
+        # Locks live only while some turn holds or awaits them
+        self._session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    async def create_session(self, user_id: str, session_id: Optional[str] = None) -> str:
+        """
+        Create a session for a user.
+
+        Args:
+            user_id: User the session belongs to
+            session_id: Optional session ID (generated when omitted)
+
+        Returns:
+            str: The session ID
+        """
+        session = await self.session_service.create_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id or f"session_{user_id}_{uuid.uuid4().hex[:8]}"
+        )
+        return session.id
+
+    async def has_session(self, user_id: str, session_id: str) -> bool:
+        """Check that a session exists and belongs to the user."""
+        session = await self.session_service.get_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id
+        )
+        return session is not None
+
+    async def _admit(self, user_id: str, session_id: str) -> asyncio.Lock:
+        """
+        Wait for the session's turn lock and an in-flight slot.
+
+        Returns:
+            asyncio.Lock: The held session lock, to pass to _release
+
+        Raises:
+            ServerBusy: If no in-flight slot frees up within the queue timeout
+        """
+        lock_key = f"{user_id}/{session_id}"
+        session_lock = self._session_locks.get(lock_key)
+        if session_lock is None:
+            session_lock = asyncio.Lock()
+            self._session_locks[lock_key] = session_lock
+
+        await session_lock.acquire()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            session_lock.release()
+            raise ServerBusy(f"{self.max_in_flight} turns already in flight")
+
+        self.in_flight += 1
+        return session_lock
+
+    def _release(self, session_lock: asyncio.Lock):
+        """Give back the in-flight slot and session lock taken by _admit."""
+        self.in_flight -= 1
+        self._slots.release()
+        session_lock.release()
+
+    async def run_turn(self, user_id: str, session_id: str, message: str) -> str:
+        """
+        Run one conversation turn under the in-flight limit.
+
+        Args:
+            user_id: User the session belongs to
+            session_id: Session identifier
+            message: User's message text
+
+        Returns:
+            str: The agent's final response text
+
+        Raises:
+            ServerBusy: If no in-flight slot frees up within the queue timeout
+        """
+        session_lock = await self._admit(user_id, session_id)
+        try:
+            return await call_agent_async(self.runner, user_id, session_id, message)
+        finally:
+            self._release(session_lock)
+
+    async def stream_turn(self, user_id: str, session_id: str, message: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Admit a turn, then return its stream of updates.
+
+        Admission happens before the first update, so ServerBusy can still
+        become an HTTP 503. The slot is held until the stream is exhausted
+        or closed.
+
+        Raises:
+            ServerBusy: If no in-flight slot frees up within the queue timeout
+        """
+        session_lock = await self._admit(user_id, session_id)
+
+        async def updates():
+            try:
+                async for update in stream_agent_async(self.runner, user_id, session_id, message):
+                    yield update
+            finally:
+                self._release(session_lock)
+
+        return updates()
+
+
+def create_app(
+    agent=None,
+    session_service: Optional[BaseSessionService] = None,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    queue_timeout: float = DEFAULT_QUEUE_TIMEOUT_S
+) -> FastAPI:
+    """
+    Build the FastAPI application around an agent.
+
+    Args:
+        agent: Agent to serve (defaults to root_agent)
+        session_service: Session service (defaults to SESSION_BACKEND)
+        max_in_flight: Turns allowed to run at once in this worker
+        queue_timeout: Seconds a turn may wait for a slot before a 503
+
+    Returns:
+        FastAPI: The application
+    """
+    if agent is None:
+        from root_agent import root_agent
+        agent = root_agent
+
+    server = AgentServer(agent, session_service, max_in_flight, queue_timeout)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        setup_tracing()
+        change_feed = await start_change_feed()
+        yield
+        if change_feed is not None:
+            await change_feed.stop()
+        shutdown_tracing()
+        async_db_connection.close()
+        db_connection.close()
+
+    app = FastAPI(title="Finance Manager Agent", lifespan=lifespan)
+    app.state.agent_server = server
+
+    @app.get("/health")
+    async def health() -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "in_flight": server.in_flight,
+            "max_in_flight": server.max_in_flight
+        }
+
+    @app.get("/stats")
+    async def stats() -> Dict[str, Any]:
+        return {
+            "prompt": prompt_stats.snapshot(),
+            "fast_path": fast_path_stats.snapshot(),
+            "turns": turn_timing.snapshot(),
+            "tool_cache": tool_cache.snapshot()
+        }
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> PlainTextResponse:
+        body = tool_metrics.render_prometheus() + tool_cache.render_prometheus()
+        return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+    @app.get("/metrics/tools")
+    async def tool_metrics_json() -> Dict[str, Any]:
+        return tool_metrics.snapshot()
+
+    @app.post("/users/{user_id}/sessions")
+    async def create_session(user_id: str) -> Dict[str, Any]:
+        session_id = await server.create_session(user_id)
+        return {"success": True, "session_id": session_id}
+
+    @app.post("/users/{user_id}/sessions/{session_id}/messages")
+    async def send_message(user_id: str, session_id: str, request: MessageRequest) -> Dict[str, Any]:
+        if not await server.has_session(user_id, session_id):
+            raise HTTPException(status_code=404, detail=f"Session '{session_id}' not found")
+
+        started = time.perf_counter()
+        try:
+            response_text = await server.run_turn(user_id, session_id, request.message)
+        except ServerBusy as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+        return {
+            "success": True,
+            "session_id": session_id,
+            "response": response_text,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    @app.post("/users/{user_id}/sessions/{session_id}/messages/stream")
+    async def stream_message(user_id: str, session_id: str, request: MessageRequest) -> StreamingResponse:
+        if not await server.has_session(user_id, session_id):
+            raise HTTPException(status_code=404, detail=f"Session '{session_id}' not found")
+
+        try:
+            updates = await server.stream_turn(user_id, session_id, request.message)
+        except ServerBusy as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+        async def events():
+            try:
+                async for update in updates:
+                    yield f"event: {update['type']}\ndata: {json.dumps(update)}\n\n"
+            finally:
+                # Frees the in-flight slot even if the client disconnects early
+                await updates.aclose()
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.websocket("/users/{user_id}/sessions/{session_id}/ws")
+    async def session_socket(websocket: WebSocket, user_id: str, session_id: str):
+        await websocket.accept()
+
+        # Sockets open their own session when it doesn't exist yet
+        if not await server.has_session(user_id, session_id):
+            await server.create_session(user_id, session_id)
+
+        async def send(data: Dict[str, Any]):
+            # A client that went away fails the send rather than the next receive
+            try:
+                await websocket.send_json(data)
+            except (RuntimeError, OSError) as e:
+                raise WebSocketDisconnect() from e
+
+        try:
+            while True:
+                payload = await websocket.receive_json()
+                message = payload.get("message") if isinstance(payload, dict) else None
+                if not message:
+                    await send({"type": "error", "error": "Expected {\"message\": \"...\"}"})
+                    continue
+
+                started = time.perf_counter()
+                try:
+                    if payload.get("stream"):
+                        response_text = ""
+                        # Closed in this task even if a send fails, so the in-flight
+                        # slot and session lock are released right away
+                        async with aclosing(await server.stream_turn(user_id, session_id, message)) as updates:
+                            async for update in updates:
+                                if update["type"] == "final":
+                                    response_text = update["text"]
+                                else:
+                                    await send(update)
+                    else:
+                        response_text = await server.run_turn(user_id, session_id, message)
+                except ServerBusy as e:
+                    await send({"type": "error", "error": str(e)})
+                    continue
+
+                await send({
+                    "type": "response",
+                    "text": response_text,
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 1)
+                })
+        except WebSocketDisconnect:
+            pass
+
+    return app
+
+
+def main():
+    """Run the server with uvicorn."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve Finance Manager Agent over HTTP and WebSocket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT)
+    parser.add_argument("--queue-timeout", type=float, default=DEFAULT_QUEUE_TIMEOUT_S)
+    parser.add_argument("--profile", type=float, nargs="?", const=1.0, default=None, metavar="RATE",
+                        help="Profile this share of turns (default 1.0 when given)")
+    parser.add_argument("--profile-mode", choices=PROFILE_MODES, help="sample (folded stacks) or cprofile")
+    parser.add_argument("--profile-dir", help="Where turn profiles are written")
+    args = parser.parse_args()
+
+    if args.profile is not None:
+        try:
+            turn_profiler.configure(args.profile, args.profile_mode, args.profile_dir)
+        except ValueError as e:
+            parser.error(str(e))
+
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper())
+    uvicorn.run(
+        create_app(max_in_flight=args.max_in_flight, queue_timeout=args.queue_timeout),
+        host=args.host,
+        port=args.port
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,10 @@
 from const import MODEL_GEMINI_2_5_PRO
 from google.adk.agents import Agent
 from instructions.expenses_agent_instructions import EXPENSES_AGENT_INSTRUCTIONS
-from tools.expense_tools import (
+from runtime.history import compact_history
+from tools.async_expense_tools import (
     set_expense,
+    set_expenses_bulk,
     get_expenses,
     get_current_account_balance,
     set_account_balance
@@ -14,6 +16,7 @@ AGENT_MODEL = MODEL_GEMINI_2_5_PRO
 # Define tools for the expenses agent
 expenses_agent_tools = [
     set_expense,
+    set_expenses_bulk,
     get_expenses,
     get_current_account_balance,
     set_account_balance
@@ -24,6 +27,7 @@ expenses_agent = Agent(
     model=AGENT_MODEL,
     description="Manages expense tracking, account balance monitoring, and spending analysis.",
     instruction=EXPENSES_AGENT_INSTRUCTIONS,
-    tools=expenses_agent_tools
+    tools=expenses_agent_tools,
+    before_model_callback=compact_history
 )
 
@@ -3,8 +3,9 @@ from const import MODEL_GEMINI_2_5_PRO
 from google.adk.agents import Agent
 from google.adk.tools import agent_tool
 from instructions.investment_agent_instructions import INVESTMENT_AGENT_INSTRUCTIONS
+from runtime.history import compact_history
 from subagents.search_agent import search_agent
-from tools.investment_tools import (
+from tools.async_investment_tools import (
     add_investment,
     get_portfolio,
     get_portfolio_value,
@@ -27,5 +28,6 @@ investment_agent = Agent(
     model=AGENT_MODEL,
     description="Manages investment portfolio, tracks assets, and provides investment research and advice.",
     instruction=INVESTMENT_AGENT_INSTRUCTIONS,
-    tools=investment_agent_tools
+    tools=investment_agent_tools,
+    before_model_callback=compact_history
 )
@@ -0,0 +1,364 @@
+"""Async expense management tools for Expenses Agent.
+
+Mirrors tools/expense_tools.py on the Motor driver so database latency
+never blocks the ADK event loop. Query building and response formatting
+are shared with the sync tools.
+"""
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Callable, Awaitable
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+from google.adk.tools import ToolContext
+from database.connection import get_async_database
+from database.rollups import (
+    ROLLUP_COLLECTION,
+    MONTH_SPEND_PROJECTION,
+    add_spend_delta,
+    spend_delta_operations,
+    summarize_month_spend,
+    month_key
+)
+from tools.context import get_user_id
+from tools.cache import cached_read, invalidates
+from observability.tool_metrics import instrument_tool
+from tools.expense_tools import (
+    BULK_INSERT_CHUNK_SIZE,
+    _balance_delta_update,
+    _new_expense,
+    _validate_expense_rows,
+    _tally_expense_chunk,
+    _bulk_result,
+    _bulk_error,
+    _expenses_query,
+    _expenses_pipeline,
+    _format_expenses,
+    _format_account_balance,
+    _account_balance_update,
+    _expense_added,
+    _expense_read_tags,
+    _expense_write_tags,
+    _bulk_write_tags,
+    _balance_tags,
+    _transaction_support,
+    _hello_supports_transactions
+)
+
+
+async def _apply_balance_delta(db, user_id: str, delta: float, session=None) -> float:
+    """Atomically adjust a user's account balance in one round trip."""
+    balance_data = await db.account_balance.find_one_and_update(
+        {"user_id": user_id},
+        _balance_delta_update(delta),
+        projection={"_id": 0, "current_balance": 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+        session=session
+    )
+    return balance_data["current_balance"]
+
+
+async def _apply_spend_deltas(db, user_id: str, deltas: Dict, session=None):
+    """Atomically apply spend deltas to the rollup collection in one round trip."""
+    if deltas:
+        await db[ROLLUP_COLLECTION].bulk_write(
+            spend_delta_operations(user_id, deltas), ordered=False, session=session
+        )
+
+
+async def _supports_transactions(db) -> bool:
+    """Whether the deployment supports transactions (checked once per client)."""
+    client = db.client
+    if id(client) not in _transaction_support:
+        _transaction_support[id(client)] = _hello_supports_transactions(await client.admin.command("hello"))
+    return _transaction_support[id(client)]
+
+
+async def _run_in_transaction(db, writes: Callable[..., Awaitable[Any]]) -> Any:
+    """Run writes in one transaction, or directly on a standalone server."""
+    if not await _supports_transactions(db):
+        return await writes(None)
+
+    async with await db.client.start_session() as session:
+        return await session.with_transaction(writes)
+
+
+async def _read_month_spend(db, user_id: str, month: str) -> Dict[str, Any]:
+    """Read one month's per-category spend from the rollups (one indexed read)."""
+    rollups = await db[ROLLUP_COLLECTION].find(
+        {"user_id": user_id, "month": month},
+        MONTH_SPEND_PROJECTION
+    ).to_list(length=None)
+    return summarize_month_spend(rollups)
+
+
+async def _insert_expense_chunk(db, chunk: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """Insert a chunk of expense documents with one unordered insert_many."""
+    try:
+        await db.expenses.insert_many(chunk, ordered=False)
+    except BulkWriteError as e:
+        return {error["index"]: error for error in e.details.get("writeErrors", [])}
+    return {}
+
+
+@instrument_tool
+@invalidates(_expense_write_tags)
+async def set_expense(
+    amount: float,
+    category: str,
+    description: str,
+    date: Optional[str],
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Add a new expense and update account balance.
+    
+    Args:
+        amount: Expense amount (must be positive)
+        category: Expense category (groceries, dining, transport, etc.)
+        description: Description of the expense
+        date: Optional date in ISO format (defaults to now)
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with expense information and updated balance
+    """
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        # Create expense object
+        expense = _new_expense(user_id, amount, category, description, date, datetime.utcnow())
+        spend_deltas = {}
+        add_spend_delta(spend_deltas, expense.date, expense.category, amount)
+        
+        async def record_expense(session) -> Optional[float]:
+            # The expense, the balance and the monthly spend rollup commit together
+            result = await db.expenses.insert_one(expense.to_dict(), session=session)
+            if not result.inserted_id:
+                return None
+            new_balance = await _apply_balance_delta(db, user_id, -amount, session)
+            await _apply_spend_deltas(db, user_id, spend_deltas, session)
+            return new_balance
+        
+        new_balance = await _run_in_transaction(db, record_expense)
+        
+        if new_balance is None:
+            return {
+                "success": False,
+                "message": "Failed to add expense",
+                "error": "Database insertion failed"
+            }
+        
+        return _expense_added(expense, category, new_balance)
+            
+    except ValueError as e:
+        return {
+            "success": False,
+            "message": "Invalid input parameters",
+            "error": str(e)
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error adding expense",
+            "error": str(e)
+        }
+
+
+@instrument_tool
+@invalidates(_bulk_write_tags)
+async def set_expenses_bulk(
+    expenses: List[Dict[str, Any]],
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Add many expenses at once and update the account balance a single time.
+    
+    Args:
+        expenses: List of expenses, each with amount, category, description
+            and an optional date in ISO format (defaults to now)
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with insert counts, per-row failures and updated balance
+    """
+    # Rows already committed when an error stops the batch
+    inserted_count = 0
+    inserted_total = 0.0
+    new_balance = None
+    
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        # Validate every row up front; invalid rows are reported, not fatal
+        documents, row_indexes, failed_rows = _validate_expense_rows(user_id, expenses)
+        
+        # Insert in unordered chunks so one bad document doesn't stop the rest
+        spend_deltas = {}
+        chunk_error = None
+        
+        for start in range(0, len(documents), BULK_INSERT_CHUNK_SIZE):
+            chunk = documents[start:start + BULK_INSERT_CHUNK_SIZE]
+            try:
+                failed_in_chunk = await _insert_expense_chunk(db, chunk)
+            except Exception as e:
+                # Earlier chunks are committed: stop, but still debit them below
+                chunk_error = e
+                break
+            count, total = _tally_expense_chunk(
+                chunk,
+                failed_in_chunk,
+                row_indexes[start:start + BULK_INSERT_CHUNK_SIZE],
+                failed_rows,
+                spend_deltas
+            )
+            inserted_count += count
+            inserted_total += total
+        
+        # One aggregated balance and rollup adjustment for the whole batch
+        if inserted_count:
+            new_balance = await _apply_balance_delta(db, user_id, -inserted_total)
+            await _apply_spend_deltas(db, user_id, spend_deltas)
+        
+        if chunk_error is not None:
+            return _bulk_error(expenses, inserted_count, inserted_total, new_balance, chunk_error)
+        return _bulk_result(expenses, inserted_count, inserted_total, failed_rows, new_balance)
+            
+    except Exception as e:
+        return _bulk_error(expenses, inserted_count, inserted_total, new_balance, e)
+
+
+@instrument_tool
+@cached_read(_expense_read_tags)
+async def get_expenses(
+    start_date: Optional[str],
+    end_date: Optional[str],
+    category: Optional[str],
+    limit: int,
+    cursor: Optional[str] = None,
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Retrieve expenses with optional filters, one page at a time.
+    
+    Args:
+        start_date: Start date for filtering (ISO format)
+        end_date: End date for filtering (ISO format)
+        category: Filter by specific category
+        limit: Maximum number of expenses per page (default: 50, at most
+            MAX_EXPENSES_PAGE; 0 means the maximum)
+        cursor: next_cursor from the previous page, with the same filters
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with the most recent expenses (up to limit) and
+        next_cursor (None on the last page). The first page also has summary
+        statistics covering every expense that matches the filters
+    """
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        query = _expenses_query(user_id, start_date, end_date, category)
+        results = await db.expenses.aggregate(_expenses_pipeline(query, limit, cursor)).to_list(length=1)
+        
+        return _format_expenses(results[0] if results else {}, limit, cursor)
+            
+    except ValueError as e:
+        return {
+            "success": False,
+            "message": "Invalid input parameters",
+            "error": str(e)
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error retrieving expenses",
+            "error": str(e)
+        }
+
+
+@instrument_tool
+@cached_read(_balance_tags)
+async def get_current_account_balance(tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Get current account balance and related information.
+    
+    Args:
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with balance information
+    """
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        # Get balance
+        balance_data = await db.account_balance.find_one({"user_id": user_id})
+        
+        # Current month spend comes from the rollups (one indexed read)
+        monthly_spent = 0.0
+        if balance_data:
+            monthly_spent = (await _read_month_spend(db, user_id, month_key(datetime.utcnow())))["total"]
+        
+        return _format_account_balance(balance_data, monthly_spent)
+            
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error retrieving account balance",
+            "error": str(e)
+        }
+
+
+@instrument_tool
+@invalidates(_balance_tags)
+async def set_account_balance(
+    balance: float,
+    monthly_income: Optional[float],
+    monthly_expense_threshold: Optional[float],
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Set or update account balance and monthly parameters.
+    
+    Args:
+        balance: Current account balance
+        monthly_income: Optional monthly income
+        monthly_expense_threshold: Optional monthly expense limit
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with confirmation
+    """
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        update_data, update = _account_balance_update(balance, monthly_income, monthly_expense_threshold)
+        
+        result = await db.account_balance.update_one(
+            {"user_id": user_id},
+            update,
+            upsert=True
+        )
+        
+        if result.upserted_id is not None:
+            message = "Account balance set successfully"
+        else:
+            message = "Account balance updated successfully"
+        
+        return {
+            "success": True,
+            "message": message,
+            "balance": update_data
+        }
+            
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error setting account balance",
+            "error": str(e)
+        }
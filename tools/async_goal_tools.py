@@ -0,0 +1,196 @@
+"""Async goal management tools for Root Agent.
+
+Mirrors tools/goal_tools.py on the Motor driver so database latency never
+blocks the ADK event loop.
+"""
+from datetime import datetime
+from typing import Optional, Dict, Any
+from google.adk.tools import ToolContext
+from database.connection import get_async_database
+from database.models import GoalRow
+from tools.context import get_user_id
+from tools.cache import cached_read, invalidates
+from observability.tool_metrics import instrument_tool
+from tools.goal_tools import (
+    _new_goal,
+    _goal_created,
+    _format_goal,
+    _goal_not_found,
+    _goal_progress_updated,
+    _goal_read_tags,
+    _goal_write_tags
+)
+
+
+@instrument_tool
+@invalidates(_goal_write_tags)
+async def set_goal(
+    goal_type: str,
+    name: str,
+    target_amount: float,
+    deadline: str,
+    priority: Optional[str],
+    current_amount: float,
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Create or update a financial goal.
+    
+    Args:
+        goal_type: Type of goal (savings, investment, debt_reduction, emergency_fund)
+        name: Goal name or description
+        target_amount: Target amount to achieve
+        deadline: Deadline in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)
+        priority: Goal priority (high, medium, low)
+        current_amount: Current progress
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with goal information and confirmation
+    """
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        # Create goal object
+        goal = _new_goal(user_id, goal_type, name, target_amount, deadline, priority, current_amount)
+        
+        # Insert into database
+        result = await db.goals.insert_one(goal.to_dict())
+        
+        if result.inserted_id:
+            return _goal_created(goal, goal_type, deadline, priority)
+        else:
+            return {
+                "success": False,
+                "message": "Failed to create goal",
+                "error": "Database insertion failed"
+            }
+            
+    except ValueError as e:
+        return {
+            "success": False,
+            "message": "Invalid input parameters",
+            "error": str(e)
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error creating goal",
+            "error": str(e)
+        }
+
+
+@instrument_tool
+@cached_read(_goal_read_tags)
+async def get_goal(
+    goal_id: Optional[str],
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Retrieve financial goal(s).
+    
+    Args:
+        goal_id: Optional specific goal ID. If None, returns all goals.
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with goal information or list of goals
+    """
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        if goal_id:
+            # Get specific goal
+            goal_data = await db.goals.find_one({
+                "user_id": user_id,
+                "goal_id": goal_id
+            }, GoalRow.PROJECTION)
+            
+            if goal_data:
+                return {
+                    "success": True,
+                    "goal": _format_goal(goal_data, include_updated_at=True)
+                }
+            else:
+                return _goal_not_found(goal_id)
+        else:
+            # Get all goals
+            goals = await db.goals.find(
+                {"user_id": user_id}, GoalRow.PROJECTION
+            ).sort("created_at", -1).to_list(length=None)
+            goals_list = [_format_goal(goal_data, include_updated_at=False) for goal_data in goals]
+            
+            return {
+                "success": True,
+                "count": len(goals_list),
+                "goals": goals_list
+            }
+            
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error retrieving goals",
+            "error": str(e)
+        }
+
+
+@instrument_tool
+@invalidates(_goal_write_tags)
+async def update_goal_progress(
+    goal_id: str,
+    amount_to_add: float,
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Update progress on a financial goal.
+    
+    Args:
+        goal_id: Goal identifier
+        amount_to_add: Amount to add to current progress
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with updated goal information
+    """
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        # Get current goal
+        goal_data = await db.goals.find_one({
+            "user_id": user_id,
+            "goal_id": goal_id
+        }, GoalRow.PROJECTION)
+        
+        if not goal_data:
+            return _goal_not_found(goal_id)
+        
+        new_amount = goal_data["current_amount"] + amount_to_add
+        
+        # Update goal
+        result = await db.goals.update_one(
+            {"user_id": user_id, "goal_id": goal_id},
+            {
+                "$set": {
+                    "current_amount": new_amount,
+                    "updated_at": datetime.utcnow()
+                }
+            }
+        )
+        
+        if result.modified_count > 0:
+            return _goal_progress_updated(goal_data, amount_to_add)
+        else:
+            return {
+                "success": False,
+                "message": "Failed to update goal progress"
+            }
+            
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error updating goal progress",
+            "error": str(e)
+        }
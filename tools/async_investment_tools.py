@@ -0,0 +1,195 @@
+"""Async investment management tools for Investment Agent.
+
+Mirrors tools/investment_tools.py on the Motor driver so database latency
+never blocks the ADK event loop.
+"""
+from typing import Optional, Dict, Any
+from google.adk.tools import ToolContext
+from database.connection import get_async_database
+from tools.context import get_user_id
+from tools.cache import cached_read, invalidates
+from observability.tool_metrics import instrument_tool
+from tools.investment_tools import (
+    _new_investment,
+    _portfolio_find,
+    _format_portfolio,
+    _portfolio_value_pipeline,
+    _format_portfolio_value,
+    _investment_summary_pipeline,
+    _format_investment_summary,
+    _portfolio_read_tags,
+    _investment_write_tags,
+    TOP_HOLDINGS_COUNT,
+    PORTFOLIO_PAGE_SIZE
+)
+
+
+@instrument_tool
+@invalidates(_investment_write_tags)
+async def add_investment(
+    symbol: str,
+    quantity: float,
+    purchase_price: float,
+    investment_type: str,
+    name: str,
+    date: Optional[str],
+    notes: Optional[str],
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Record a new investment.
+    
+    Args:
+        symbol: Ticker symbol (e.g., AAPL, BTC)
+        quantity: Quantity purchased
+        purchase_price: Price per unit at purchase
+        investment_type: Type of investment (stock, crypto, etf, etc.)
+        name: Name of the investment
+        date: Optional purchase date in ISO format (defaults to now)
+        notes: Optional notes
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with investment details
+    """
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        # Create investment object
+        investment = _new_investment(
+            user_id, symbol, quantity, purchase_price, investment_type, name, date, notes
+        )
+        
+        # Insert into database
+        result = await db.investments.insert_one(investment.to_dict())
+        
+        if not result.inserted_id:
+            return {
+                "success": False,
+                "message": "Failed to add investment",
+                "error": "Database insertion failed"
+            }
+            
+        return {
+            "success": True,
+            "message": f"Investment in {symbol} added successfully",
+            "investment": investment.to_dict()
+        }
+        
+    except ValueError as e:
+        return {
+            "success": False,
+            "message": "Invalid input parameters",
+            "error": str(e)
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error adding investment",
+            "error": str(e)
+        }
+
+
+@instrument_tool
+@cached_read(_portfolio_read_tags)
+async def get_portfolio(
+    investment_type: Optional[str],
+    limit: int = PORTFOLIO_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Retrieve current investments, newest first, one page at a time.
+    
+    Args:
+        investment_type: Optional filter by investment type
+        limit: Maximum number of investments per page (0 returns all)
+        cursor: next_cursor from the previous page, with the same filter
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+        
+    Returns:
+        Dictionary with list of investments and next_cursor (None on the last page)
+    """
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        page = _portfolio_find(user_id, investment_type, limit, cursor)
+        investments = await db.investments.find(
+            page["filter"], page["projection"]
+        ).sort(page["sort"]).limit(page["limit"]).to_list(length=None)
+        
+        return _format_portfolio(investments, limit)
+        
+    except ValueError as e:
+        return {
+            "success": False,
+            "message": "Invalid input parameters",
+            "error": str(e)
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error retrieving portfolio",
+            "error": str(e)
+        }
+
+
+@instrument_tool
+@cached_read(_portfolio_read_tags)
+async def get_portfolio_value(tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Calculate total value of all investments based on purchase price (cost basis).
+    Note: Real-time price updates would require an external API.
+    
+    Args:
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with total value breakdown
+    """
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        type_totals = await db.investments.aggregate(_portfolio_value_pipeline(user_id)).to_list(length=None)
+        
+        return _format_portfolio_value(type_totals)
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error calculating portfolio value",
+            "error": str(e)
+        }
+
+
+@instrument_tool
+@cached_read(_portfolio_read_tags)
+async def get_investment_summary(tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Get a summary of the investment portfolio for the agent.
+    
+    Args:
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with summary statistics (cost basis, allocation by type,
+        position count and top holdings)
+    """
+    try:
+        db = get_async_database()
+        user_id = get_user_id(tool_context)
+        
+        pipeline = _investment_summary_pipeline(user_id, TOP_HOLDINGS_COUNT)
+        results = await db.investments.aggregate(pipeline).to_list(length=1)
+        
+        return _format_investment_summary(results[0] if results else {})
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error summarizing portfolio",
+            "error": str(e)
+        }
@@ -0,0 +1,431 @@
+"""Read-through cache for the read tools, invalidated by the write tools.
+
+Entries are keyed by user, tool and arguments. Each entry carries tags
+naming the data it was built from:
+
+    balance                get_current_account_balance
+    expenses:YYYY-MM       get_expenses over a date range (one tag per month)
+    expenses               get_expenses without a bounded range
+    goals / goal:<id>      get_goal(None) / get_goal(<id>)
+    investments            get_portfolio(None), get_portfolio_value, get_investment_summary
+    investments:<type>     get_portfolio(<type>)
+
+A write tool evicts exactly the tags it touched. For example,
+set_expense dated 2024-12-14 evicts the balance, the unbounded expense
+lists and the lists covering 2024-12, and nothing else. A write that
+finishes while a read of the same user is in flight also stops that
+read from being cached, so a stale result is never stored.
+
+Entries expire after TOOL_CACHE_TTL_S. The cache holds at most
+TOOL_CACHE_MAX_ENTRIES entries and TOOL_CACHE_MAX_BYTES of serialized
+results, and evicts the least recently used entry first. Results are
+stored as JSON and decoded on every hit, so callers can't mutate the
+cached copy. Only successful results are cached.
+
+Writes made outside the tools (imports, other processes) are only seen
+after the TTL, unless CHANGE_STREAMS=on. Then ``start_change_feed``
+subscribes ``invalidate_for_change`` to a MongoDB change stream (see
+database/change_streams.py), and those writes evict entries as they
+happen. The cache is off unless TOOL_CACHE=on.
+"""
+import os
+import json
+import time
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterable, Callable, Set, Tuple
+from database.rollups import ROLLUP_COLLECTION, month_key
+from database.change_streams import CHANGE_STREAMS_ENABLED, ChangeFeed
+from tools.context import get_user_id
+
+TOOL_CACHE_ENABLED = os.getenv('TOOL_CACHE', 'off').lower() in ('1', 'true', 'on', 'yes')
+TOOL_CACHE_TTL_S = float(os.getenv('TOOL_CACHE_TTL_S', '60'))
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv('TOOL_CACHE_MAX_ENTRIES', '5000'))
+TOOL_CACHE_MAX_BYTES = int(os.getenv('TOOL_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+
+# Longest date range tagged month by month; longer ranges use the "expenses" tag
+MAX_TAGGED_MONTHS = 36
+
+BALANCE = "balance"
+EXPENSES = "expenses"
+GOALS = "goals"
+INVESTMENTS = "investments"
+
+
+def goal_tag(goal_id: str) -> str:
+    return f"{GOALS}:{goal_id}"
+
+
+def investment_type_tag(investment_type: str) -> str:
+    return f"{INVESTMENTS}:{str(investment_type).lower()}"
+
+
+def expense_month_tag(date: datetime) -> str:
+    return f"{EXPENSES}:{month_key(date)}"
+
+
+def expense_range_tags(start: Optional[datetime], end: Optional[datetime]) -> Set[str]:
+    """Tags of a get_expenses read covering start..end (either may be open)."""
+    if start is None or end is None:
+        return {EXPENSES}
+
+    first, last = month_key(start), month_key(end)
+    year, month = int(first[:4]), int(first[5:7])
+    tags = set()
+    while f"{year:04d}-{month:02d}" <= last:
+        tags.add(f"{EXPENSES}:{year:04d}-{month:02d}")
+        if len(tags) > MAX_TAGGED_MONTHS:
+            return {EXPENSES}
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return tags
+
+
+def expense_write_tags(dates: Iterable[datetime]) -> Set[str]:
+    """Tags a write of expenses on these dates invalidates (balance included)."""
+    return {BALANCE, EXPENSES} | {expense_month_tag(date) for date in dates}
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires_at", "tags")
+
+    def __init__(self, value: str, size: int, expires_at: float, tags: Set[str]):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.tags = tags
+
+
+class ToolCache:
+    """Thread-safe LRU/TTL cache of tool results with tag invalidation."""
+
+    def __init__(
+        self,
+        max_entries: int = TOOL_CACHE_MAX_ENTRIES,
+        max_bytes: int = TOOL_CACHE_MAX_BYTES,
+        ttl_seconds: float = TOOL_CACHE_TTL_S
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # (user_id, key) -> entry, least recently used first
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        # (user_id, tag) -> keys of entries carrying the tag
+        self._by_tag: Dict[Tuple[str, str], Set[Tuple[str, str]]] = {}
+        # Bumped on every invalidation (the epoch on clear), so in-flight
+        # reads don't store stale results
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._bytes = 0
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._evictions = {"lru": 0, "ttl": 0, "invalidated": 0}
+        self._stale_puts = 0
+
+    def generation(self, user_id: str) -> Tuple[int, int]:
+        """Current invalidation generation of a user; pass it to put()."""
+        with self._lock:
+            return self._epoch, self._generations.get(user_id, 0)
+
+    def get(self, user_id: str, tool: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._drop((user_id, key), "ttl")
+                entry = None
+            if entry is None:
+                self._misses[tool] = self._misses.get(tool, 0) + 1
+                return None
+            self._entries.move_to_end((user_id, key))
+            self._hits[tool] = self._hits.get(tool, 0) + 1
+            value = entry.value
+        return json.loads(value)
+
+    def put(self, user_id: str, key: str, result: Dict[str, Any], tags: Set[str], generation: Tuple[int, int]):
+        """Store a result unless the user's data changed since generation was read."""
+        value = json.dumps(result, default=str)
+        size = len(value) + len(key)
+        if size > self.max_bytes // 16:
+            return
+
+        with self._lock:
+            if (self._epoch, self._generations.get(user_id, 0)) != generation:
+                self._stale_puts += 1
+                return
+            cache_key = (user_id, key)
+            if cache_key in self._entries:
+                self._drop(cache_key, None)
+            self._entries[cache_key] = _Entry(value, size, time.monotonic() + self.ttl_seconds, tags)
+            self._bytes += size
+            for tag in tags:
+                self._by_tag.setdefault((user_id, tag), set()).add(cache_key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)), "lru")
+
+    def invalidate(self, user_id: str, tags: Iterable[str]) -> int:
+        """
+        Evict a user's entries carrying any of the tags.
+
+        Args:
+            user_id: User whose data changed
+            tags: Tags of the changed data
+
+        Returns:
+            int: Number of entries evicted
+        """
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            keys = set()
+            for tag in tags:
+                keys |= self._by_tag.get((user_id, tag), set())
+            for cache_key in keys:
+                self._drop(cache_key, "invalidated")
+            return len(keys)
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Evict every entry of a user."""
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            keys = [cache_key for cache_key in self._entries if cache_key[0] == user_id]
+            for cache_key in keys:
+                self._drop(cache_key, "invalidated")
+            return len(keys)
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+
+    def _drop(self, cache_key: Tuple[str, str], reason: Optional[str]):
+        """Remove one entry and its tag index (lock held)."""
+        entry = self._entries.pop(cache_key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._by_tag.get((cache_key[0], tag))
+            if keys is not None:
+                keys.discard(cache_key)
+                if not keys:
+                    del self._by_tag[(cache_key[0], tag)]
+        if reason:
+            self._evictions[reason] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Hit/miss counts per tool, size and evictions."""
+        with self._lock:
+            hits = sum(self._hits.values())
+            lookups = hits + sum(self._misses.values())
+            return {
+                "enabled": TOOL_CACHE_ENABLED,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": hits,
+                "misses": lookups - hits,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "by_tool": {
+                    tool: {"hits": self._hits.get(tool, 0), "misses": self._misses.get(tool, 0)}
+                    for tool in sorted(set(self._hits) | set(self._misses))
+                },
+                "evictions": dict(self._evictions),
+                "stale_puts_skipped": self._stale_puts
+            }
+
+    def render_prometheus(self) -> str:
+        """Cache counters in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP finance_tool_cache_requests_total Tool cache lookups by result.",
+            "# TYPE finance_tool_cache_requests_total counter",
+        ]
+        for tool, counts in snapshot["by_tool"].items():
+            lines.append(f'finance_tool_cache_requests_total{{tool="{tool}",result="hit"}} {counts["hits"]}')
+            lines.append(f'finance_tool_cache_requests_total{{tool="{tool}",result="miss"}} {counts["misses"]}')
+        lines += [
+            "# HELP finance_tool_cache_evictions_total Tool cache evictions by reason.",
+            "# TYPE finance_tool_cache_evictions_total counter",
+        ]
+        for reason, count in snapshot["evictions"].items():
+            lines.append(f'finance_tool_cache_evictions_total{{reason="{reason}"}} {count}')
+        lines += [
+            "# HELP finance_tool_cache_entries Entries in the tool cache.",
+            "# TYPE finance_tool_cache_entries gauge",
+            f"finance_tool_cache_entries {snapshot['entries']}",
+            "# HELP finance_tool_cache_bytes Serialized size of the tool cache.",
+            "# TYPE finance_tool_cache_bytes gauge",
+            f"finance_tool_cache_bytes {snapshot['bytes']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+tool_cache = ToolCache()
+
+
+def _call_arguments(signature: inspect.Signature, args, kwargs) -> Tuple[str, Dict[str, Any]]:
+    """User and arguments (without tool_context) of a tool call."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    return get_user_id(arguments.pop("tool_context", None)), arguments
+
+
+def cached_read(tags: Callable[..., Set[str]]) -> Callable[[Callable], Callable]:
+    """
+    Serve a read tool from the cache, keyed by user and arguments.
+
+    Args:
+        tags: Called with the tool's arguments; returns the tags of the data read
+
+    Returns:
+        Decorator for a sync or async read tool
+    """
+    def decorate(func: Callable) -> Callable:
+        if not TOOL_CACHE_ENABLED:
+            return func
+
+        signature = inspect.signature(func)
+        name = func.__name__
+
+        def lookup(args, kwargs):
+            user_id, arguments = _call_arguments(signature, args, kwargs)
+            key = json.dumps([name, arguments], sort_keys=True, default=str)
+            return user_id, key, arguments
+
+        def store(user_id: str, key: str, arguments: Dict[str, Any], result: Any, generation: Tuple[int, int]):
+            if not isinstance(result, dict) or result.get("success") is not True:
+                return
+            try:
+                entry_tags = set(tags(**arguments))
+            except (TypeError, ValueError):
+                return
+            tool_cache.put(user_id, key, result, entry_tags, generation)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                user_id, key, arguments = lookup(args, kwargs)
+                cached = tool_cache.get(user_id, name, key)
+                if cached is not None:
+                    return cached
+                generation = tool_cache.generation(user_id)
+                result = await func(*args, **kwargs)
+                store(user_id, key, arguments, result, generation)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            user_id, key, arguments = lookup(args, kwargs)
+            cached = tool_cache.get(user_id, name, key)
+            if cached is not None:
+                return cached
+            generation = tool_cache.generation(user_id)
+            result = func(*args, **kwargs)
+            store(user_id, key, arguments, result, generation)
+            return result
+        return wrapper
+
+    return decorate
+
+
+def invalidates(tags: Callable[..., Set[str]]) -> Callable[[Callable], Callable]:
+    """
+    Evict the cache entries a write tool affects once it returns.
+
+    Eviction also happens when the write fails, since a failed write may
+    still have changed something. If the tags can't be worked out from the
+    arguments, all of the user's entries are evicted.
+
+    Args:
+        tags: Called with the tool's arguments; returns the tags of the data written
+
+    Returns:
+        Decorator for a sync or async write tool
+    """
+    def decorate(func: Callable) -> Callable:
+        if not TOOL_CACHE_ENABLED:
+            return func
+
+        signature = inspect.signature(func)
+
+        def evict(args, kwargs):
+            user_id, arguments = _call_arguments(signature, args, kwargs)
+            try:
+                tool_cache.invalidate(user_id, tags(**arguments))
+            except (TypeError, ValueError, KeyError, AttributeError):
+                tool_cache.invalidate_user(user_id)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    evict(args, kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                evict(args, kwargs)
+        return wrapper
+
+    return decorate
+
+
+def invalidate_for_change(collection: str, operation: str, fields: Optional[Dict[str, Any]]):
+    """
+    Evict the entries a database change affects (a ChangeFeed subscriber).
+
+    Inserts are tagged like the tool writes. Updates can move a document
+    between tags (an expense's date, an investment's type) and the old
+    values aren't in the event, so they evict all of the user's entries.
+    Deletes don't carry the document, so they clear the whole cache.
+
+    Args:
+        collection: Collection that changed
+        operation: insert, update, replace or delete
+        fields: user_id, date, goal_id, investment_type of the changed document
+    """
+    user_id = (fields or {}).get("user_id")
+    if not user_id:
+        tool_cache.clear()
+        return
+
+    if collection in ("account_balance", ROLLUP_COLLECTION):
+        tool_cache.invalidate(user_id, {BALANCE})
+    elif collection == "goals":
+        goal_id = fields.get("goal_id")
+        tool_cache.invalidate(user_id, {GOALS, goal_tag(goal_id)} if goal_id else {GOALS})
+    elif operation != "insert":
+        tool_cache.invalidate_user(user_id)
+    elif collection == "expenses" and isinstance(fields.get("date"), datetime):
+        tool_cache.invalidate(user_id, expense_write_tags([fields["date"]]))
+    elif collection == "investments" and fields.get("investment_type"):
+        tool_cache.invalidate(user_id, {INVESTMENTS, investment_type_tag(fields["investment_type"])})
+    else:
+        tool_cache.invalidate_user(user_id)
+
+
+async def start_change_feed() -> Optional[ChangeFeed]:
+    """
+    Start cross-process invalidation if TOOL_CACHE and CHANGE_STREAMS are on.
+
+    Returns:
+        The running feed (stop it on shutdown), or None
+    """
+    if not (TOOL_CACHE_ENABLED and CHANGE_STREAMS_ENABLED):
+        return None
+    feed = ChangeFeed()
+    feed.subscribe(invalidate_for_change, on_reset=tool_cache.clear)
+    await feed.start()
+    return feed
@@ -0,0 +1,59 @@
+"""Per-session user identity for tools.
+
+Tools act for the user of the ADK session that invoked them, taken from
+the injected ``tool_context``, so one process can serve many users at once.
+Code that calls tools directly (scripts, fast paths) can bind a user with
+``user_context``; the USER_ID environment variable is the last fallback
+for single-user CLI use.
+"""
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Iterator
+from google.adk.tools import ToolContext
+
+_current_user_id: ContextVar[Optional[str]] = ContextVar("current_user_id", default=None)
+
+
+def get_user_id(tool_context: Optional[ToolContext] = None) -> str:
+    """
+    Resolve the user a tool call acts for.
+    
+    Args:
+        tool_context: ADK tool context injected into the tool, if any
+    
+    Returns:
+        str: The session's user ID, the bound user, or USER_ID from the
+        environment (in that order)
+    """
+    if tool_context is not None:
+        user_id = getattr(tool_context, "user_id", None)
+        if user_id is None:
+            invocation_context = getattr(tool_context, "_invocation_context", None)
+            user_id = getattr(invocation_context, "user_id", None)
+        if user_id:
+            return user_id
+    
+    user_id = _current_user_id.get()
+    if user_id:
+        return user_id
+    
+    return os.getenv('USER_ID', 'default_user')
+
+
+@contextmanager
+def user_context(user_id: str) -> Iterator[None]:
+    """
+    Bind a user for tool calls made without an ADK tool context.
+    
+    The binding is a context variable, so concurrent tasks each see their
+    own user.
+    
+    Args:
+        user_id: User identifier
+    """
+    token = _current_user_id.set(user_id)
+    try:
+        yield
+    finally:
+        _current_user_id.reset(token)
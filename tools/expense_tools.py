@@ -1,17 +1,500 @@
 """Expense management tools for Expenses Agent."""
-import os
 import uuid
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Set, Callable
+from pymongo import ReturnDocument
+from pymongo.client_session import ClientSession
+from pymongo.errors import BulkWriteError
+from google.adk.tools import ToolContext
 from database.connection import get_database
-from database.models import Expense, AccountBalance, ExpenseCategory, ExpenseFilter
+from database.rollups import add_spend_delta, apply_spend_deltas, get_month_spend, month_key
+from database.models import Expense, ExpenseRow, AccountBalance, ExpenseCategory, ExpenseFilter
+from tools.context import get_user_id
+from tools.cache import BALANCE, cached_read, invalidates, expense_range_tags, expense_write_tags
+from tools.pagination import keyset_query, page_sort, split_page
+from observability.tool_metrics import instrument_tool
 
+# Whether each client's deployment supports transactions, by id(client),
+# so the hello command runs once per client rather than on every write
+_transaction_support: Dict[int, bool] = {}
 
+# Number of documents sent per insert_many call in bulk ingestion
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# Largest get_expenses page; the page is built inside $facet, whose output
+# must fit in one 16MB document, so bigger listings are read with cursors
+MAX_EXPENSES_PAGE = 200
+
+# Page rows keep _id for the next page's cursor
+_EXPENSE_PAGE_PROJECTION = {**ExpenseRow.PROJECTION, "_id": 1}
+
+
+def _parse_date(value: str) -> datetime:
+    """Parse an ISO date/datetime string (YYYY-MM-DD or full ISO format)."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return datetime.strptime(value, '%Y-%m-%d')
+
+
+def _expense_read_tags(start_date: Optional[str], end_date: Optional[str], **_) -> Set[str]:
+    """Cache tags of a get_expenses call (the months its date range covers)."""
+    return expense_range_tags(
+        _parse_date(start_date) if start_date else None,
+        _parse_date(end_date) if end_date else None
+    )
+
+
+def _expense_write_tags(date: Optional[str], **_) -> Set[str]:
+    """Cache tags a set_expense call invalidates."""
+    return expense_write_tags([_parse_date(date) if date else datetime.utcnow()])
+
+
+def _bulk_write_tags(expenses: List[Dict[str, Any]], **_) -> Set[str]:
+    """Cache tags a set_expenses_bulk call invalidates."""
+    dates = []
+    for row in expenses:
+        try:
+            dates.append(_parse_date(row["date"]) if row.get("date") else datetime.utcnow())
+        except (KeyError, TypeError, ValueError, AttributeError):
+            # Rows that fail validation are not inserted
+            continue
+    return expense_write_tags(dates)
+
+
+def _balance_tags(**_) -> Set[str]:
+    """Cache tags of the account balance."""
+    return {BALANCE}
+
+
+def _balance_delta_update(delta: float) -> Dict[str, Any]:
+    """Build the upsert update that atomically adjusts a balance by delta."""
+    return {
+        "$inc": {"current_balance": delta},
+        "$set": {"last_updated": datetime.utcnow()},
+        "$setOnInsert": {
+            "monthly_income": 0.0,
+            "monthly_expense_threshold": 0.0
+        }
+    }
+
+
+def _apply_balance_delta(db, user_id: str, delta: float, session: Optional[ClientSession] = None) -> float:
+    """
+    Atomically adjust a user's account balance in one round trip.
+    
+    The upsert creates the balance record (overdraft scenario) if none
+    exists yet.
+    
+    Args:
+        db: Database instance
+        user_id: User identifier
+        delta: Amount to add to the balance (negative for expenses)
+        session: Optional session to run the write in (e.g. a transaction)
+    
+    Returns:
+        float: The balance after the adjustment
+    """
+    balance_data = db.account_balance.find_one_and_update(
+        {"user_id": user_id},
+        _balance_delta_update(delta),
+        projection={"_id": 0, "current_balance": 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+        session=session
+    )
+    return balance_data["current_balance"]
+
+
+def _hello_supports_transactions(hello: Dict[str, Any]) -> bool:
+    """Whether a hello reply comes from a replica set member or mongos."""
+    return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+
+def _supports_transactions(db) -> bool:
+    """Whether the deployment supports transactions (checked once per client)."""
+    client = db.client
+    if id(client) not in _transaction_support:
+        _transaction_support[id(client)] = _hello_supports_transactions(client.admin.command("hello"))
+    return _transaction_support[id(client)]
+
+
+def _run_in_transaction(db, writes: Callable[[Optional[ClientSession]], Any]) -> Any:
+    """
+    Run writes in one transaction so they are applied together or not at all.
+    
+    Transactions need a replica set or sharded cluster. On a standalone
+    server (local development) the writes run directly without a session.
+    
+    Args:
+        db: Database instance
+        writes: Callable taking the session (or None) and doing the writes
+    
+    Returns:
+        Whatever writes returns
+    """
+    if not _supports_transactions(db):
+        return writes(None)
+    
+    with db.client.start_session() as session:
+        return session.with_transaction(writes)
+
+
+def _insert_expense_chunk(
+    db,
+    chunk: List[Dict[str, Any]],
+    session: Optional[ClientSession] = None
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Insert a chunk of expense documents with one unordered insert_many.
+    
+    Args:
+        db: Database instance
+        chunk: Expense documents to insert
+        session: Optional session to run the write in (e.g. a transaction)
+    
+    Returns:
+        Mapping of chunk offset to write error for documents not inserted
+    """
+    try:
+        db.expenses.insert_many(chunk, ordered=False, session=session)
+    except BulkWriteError as e:
+        return {error["index"]: error for error in e.details.get("writeErrors", [])}
+    return {}
+
+
+def _new_expense(
+    user_id: str,
+    amount: float,
+    category: str,
+    description: str,
+    date: Optional[str],
+    now: datetime
+) -> Expense:
+    """Validate expense input into an Expense model."""
+    return Expense(
+        expense_id=str(uuid.uuid4()),
+        user_id=user_id,
+        amount=amount,
+        category=ExpenseCategory(str(category).lower()),
+        description=description,
+        date=_parse_date(date) if date else now,
+        created_at=now
+    )
+
+
+def _validate_expense_rows(
+    user_id: str,
+    expenses: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[int], List[Dict[str, Any]]]:
+    """
+    Validate bulk expense rows into documents.
+    
+    Returns:
+        Tuple of (documents, source row index per document, failed rows)
+    """
+    now = datetime.utcnow()
+    documents = []
+    row_indexes = []
+    failed_rows = []
+    
+    for index, row in enumerate(expenses):
+        try:
+            expense = _new_expense(
+                user_id,
+                row["amount"],
+                row["category"],
+                row["description"],
+                row.get("date"),
+                now
+            )
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            failed_rows.append({"index": index, "error": str(e)})
+            continue
+        
+        documents.append(expense.to_dict())
+        row_indexes.append(index)
+    
+    return documents, row_indexes, failed_rows
+
+
+def _tally_expense_chunk(
+    chunk: List[Dict[str, Any]],
+    failed_in_chunk: Dict[int, Dict[str, Any]],
+    row_indexes: List[int],
+    failed_rows: List[Dict[str, Any]],
+    spend_deltas: Dict
+) -> Tuple[int, float]:
+    """
+    Record the outcome of one inserted chunk.
+    
+    Failed documents are appended to failed_rows and inserted ones are
+    accumulated into spend_deltas.
+    
+    Returns:
+        Tuple of (documents inserted, amount inserted)
+    """
+    inserted_count = 0
+    inserted_total = 0.0
+    
+    for offset, (document, row_index) in enumerate(zip(chunk, row_indexes)):
+        if offset in failed_in_chunk:
+            failed_rows.append({
+                "index": row_index,
+                "error": failed_in_chunk[offset].get("errmsg", "Write failed")
+            })
+        else:
+            inserted_count += 1
+            inserted_total += document["amount"]
+            add_spend_delta(spend_deltas, document["date"], document["category"], document["amount"])
+    
+    return inserted_count, inserted_total
+
+
+def _bulk_result(
+    expenses: List[Dict[str, Any]],
+    inserted_count: int,
+    inserted_total: float,
+    failed_rows: List[Dict[str, Any]],
+    new_balance: Optional[float]
+) -> Dict[str, Any]:
+    """Build the set_expenses_bulk response."""
+    failed_rows.sort(key=lambda failure: failure["index"])
+    
+    return {
+        "success": inserted_count > 0 or not expenses,
+        "message": f"{inserted_count} of {len(expenses)} expenses added (${inserted_total:.2f} total)",
+        "inserted_count": inserted_count,
+        "failed_count": len(failed_rows),
+        "total_amount": round(inserted_total, 2),
+        "failed_rows": failed_rows,
+        "new_balance": new_balance
+    }
+
+
+def _bulk_error(
+    expenses: List[Dict[str, Any]],
+    inserted_count: int,
+    inserted_total: float,
+    new_balance: Optional[float],
+    error: Exception
+) -> Dict[str, Any]:
+    """Build the set_expenses_bulk response when the batch stopped part-way."""
+    message = "Error adding expenses"
+    if inserted_count:
+        message += (
+            f" after {inserted_count} of {len(expenses)} were added (${inserted_total:.2f} total);"
+            f" retry only the expenses that were not added"
+        )
+        if new_balance is None:
+            message += ". The balance has not been debited for the added expenses"
+    return {
+        "success": False,
+        "message": message,
+        "error": str(error),
+        "inserted_count": inserted_count,
+        "total_amount": round(inserted_total, 2),
+        "new_balance": new_balance
+    }
+
+
+def _expenses_query(
+    user_id: str,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    category: Optional[str]
+) -> Dict[str, Any]:
+    """Build the expenses filter for get_expenses."""
+    query = {"user_id": user_id}
+    
+    # Date filters
+    date_filter = {}
+    if start_date:
+        date_filter["$gte"] = _parse_date(start_date)
+    
+    if end_date:
+        date_filter["$lte"] = _parse_date(end_date)
+    
+    if date_filter:
+        query["date"] = date_filter
+    
+    # Category filter
+    if category:
+        query["category"] = category.lower()
+    
+    return query
+
+
+def _page_limit(limit: int) -> int:
+    """Clamp a get_expenses page size to 1..MAX_EXPENSES_PAGE (0 or less means the maximum)."""
+    if limit <= 0:
+        return MAX_EXPENSES_PAGE
+    return min(limit, MAX_EXPENSES_PAGE)
+
+
+def _expenses_pipeline(query: Dict[str, Any], limit: int, cursor: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Summarize the full filter window server-side and fetch only one page.
+    
+    The first page also carries the summary facets. Later pages (with a
+    cursor) skip them and read just limit + 1 rows from the cursor onwards,
+    and the extra row tells split_page whether another page follows.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    # Sorting before $facet lets the (user_id, date, _id) index provide the
+    # order instead of an in-memory sort inside the facet
+    page_stages = [{"$limit": _page_limit(limit) + 1}, {"$project": _EXPENSE_PAGE_PROJECTION}]
+    sort_stage = {"$sort": dict(page_sort("date"))}
+    
+    if cursor:
+        return [
+            {"$match": keyset_query(query, "date", cursor)},
+            sort_stage,
+            *page_stages,
+            {"$group": {"_id": None, "page": {"$push": "$$ROOT"}}}
+        ]
+    
+    return [
+        {"$match": query},
+        sort_stage,
+        {"$facet": {
+            "summary": [
+                {"$group": {"_id": None, "count": {"$sum": 1}, "total": {"$sum": "$amount"}}}
+            ],
+            "by_category": [
+                {"$group": {"_id": "$category", "total": {"$sum": "$amount"}}}
+            ],
+            "page": page_stages
+        }}
+    ]
+
+
+def _format_expenses(facets: Dict[str, Any], limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Build the get_expenses response from the $facet output."""
+    rows, next_cursor = split_page(facets.get("page", []), _page_limit(limit), "date")
+    
+    # Rows come from our own collection, so skip per-row validation
+    expenses_list = [ExpenseRow(expense_data).to_dict() for expense_data in rows]
+    
+    if cursor:
+        # Continuation pages don't repeat the first page's summary
+        return {
+            "success": True,
+            "count": len(expenses_list),
+            "expenses": expenses_list,
+            "next_cursor": next_cursor
+        }
+    
+    summary = facets.get("summary") or [{"count": 0, "total": 0.0}]
+    
+    return {
+        "success": True,
+        "count": len(expenses_list),
+        "total_count": summary[0]["count"],
+        "total_amount": round(summary[0]["total"], 2),
+        "category_breakdown": {
+            group["_id"]: round(group["total"], 2)
+            for group in facets.get("by_category", [])
+        },
+        "expenses": expenses_list,
+        "next_cursor": next_cursor
+    }
+
+
+def _format_account_balance(
+    balance_data: Optional[Dict[str, Any]],
+    monthly_spent: float
+) -> Dict[str, Any]:
+    """Build the get_current_account_balance response."""
+    if not balance_data:
+        return {
+            "success": True,
+            "message": "No account balance found. Please set initial balance.",
+            "current_balance": 0.0,
+            "monthly_income": 0.0,
+            "monthly_expense_threshold": 0.0
+        }
+    
+    balance = AccountBalance(**balance_data)
+    
+    # Calculate threshold usage
+    threshold_percentage = 0.0
+    if balance.monthly_expense_threshold > 0:
+        threshold_percentage = (monthly_spent / balance.monthly_expense_threshold) * 100
+    
+    return {
+        "success": True,
+        "current_balance": round(balance.current_balance, 2),
+        "monthly_income": round(balance.monthly_income, 2),
+        "monthly_expense_threshold": round(balance.monthly_expense_threshold, 2),
+        "current_month_spent": round(monthly_spent, 2),
+        "threshold_usage_percentage": round(threshold_percentage, 2),
+        "last_updated": balance.last_updated.isoformat()
+    }
+
+
+def _account_balance_update(
+    balance: float,
+    monthly_income: Optional[float],
+    monthly_expense_threshold: Optional[float]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Build the set_account_balance upsert.
+    
+    Returns:
+        Tuple of (fields being set, update document)
+    """
+    update_data = {
+        "current_balance": balance,
+        "last_updated": datetime.utcnow()
+    }
+    
+    if monthly_income is not None:
+        update_data["monthly_income"] = monthly_income
+    
+    if monthly_expense_threshold is not None:
+        update_data["monthly_expense_threshold"] = monthly_expense_threshold
+    
+    # Defaults only apply when the record is created by this upsert
+    insert_defaults = {
+        field: 0.0
+        for field in ("monthly_income", "monthly_expense_threshold")
+        if field not in update_data
+    }
+    
+    update = {"$set": update_data}
+    if insert_defaults:
+        update["$setOnInsert"] = insert_defaults
+    
+    return update_data, update
+
+
+def _expense_added(expense: Expense, category: str, new_balance: float) -> Dict[str, Any]:
+    """Build the set_expense success response."""
+    return {
+        "success": True,
+        "message": f"Expense of ${expense.amount:.2f} added successfully",
+        "expense": {
+            "expense_id": expense.expense_id,
+            "amount": expense.amount,
+            "category": category,
+            "description": expense.description,
+            "date": expense.date.isoformat()
+        },
+        "new_balance": new_balance
+    }
+
+
+@instrument_tool
+@invalidates(_expense_write_tags)
 def set_expense(
     amount: float,
     category: str,
     description: str,
-    date: Optional[str]
+    date: Optional[str],
+    tool_context: Optional[ToolContext] = None
 ) -> Dict[str, Any]:
     """
     Add a new expense and update account balance.
@@ -21,80 +504,39 @@ def set_expense(
         category: Expense category (groceries, dining, transport, etc.)
         description: Description of the expense
         date: Optional date in ISO format (defaults to now)
+        tool_context: ADK tool context (injected by the runner; identifies the user)
     
     Returns:
         Dictionary with expense information and updated balance
     """
     try:
         db = get_database()
-        user_id = os.getenv('USER_ID', 'default_user')
-        
-        # Parse date
-        if date:
-            try:
-                expense_date = datetime.fromisoformat(date.replace('Z', '+00:00'))
-            except ValueError:
-                expense_date = datetime.strptime(date, '%Y-%m-%d')
-        else:
-            expense_date = datetime.utcnow()
+        user_id = get_user_id(tool_context)
         
         # Create expense object
-        expense = Expense(
-            expense_id=str(uuid.uuid4()),
-            user_id=user_id,
-            amount=amount,
-            category=ExpenseCategory(category.lower()),
-            description=description,
-            date=expense_date,
-            created_at=datetime.utcnow()
-        )
+        expense = _new_expense(user_id, amount, category, description, date, datetime.utcnow())
+        spend_deltas = {}
+        add_spend_delta(spend_deltas, expense.date, expense.category, amount)
+        
+        def record_expense(session: Optional[ClientSession]) -> Optional[float]:
+            # The expense, the balance and the monthly spend rollup commit together
+            result = db.expenses.insert_one(expense.to_dict(), session=session)
+            if not result.inserted_id:
+                return None
+            new_balance = _apply_balance_delta(db, user_id, -amount, session)
+            apply_spend_deltas(db, user_id, spend_deltas, session)
+            return new_balance
         
-        # Insert expense into database
-        result = db.expenses.insert_one(expense.to_dict())
+        new_balance = _run_in_transaction(db, record_expense)
         
-        if not result.inserted_id:
+        if new_balance is None:
             return {
                 "success": False,
                 "message": "Failed to add expense",
                 "error": "Database insertion failed"
             }
         
-        # Update account balance
-        balance_data = db.account_balance.find_one({"user_id": user_id})
-        
-        if balance_data:
-            new_balance = balance_data['current_balance'] - amount
-            db.account_balance.update_one(
-                {"user_id": user_id},
-                {
-                    "$set": {
-                        "current_balance": new_balance,
-                        "last_updated": datetime.utcnow()
-                    }
-                }
-            )
-        else:
-            # Create new balance record with negative balance (overdraft scenario)
-            new_balance = -amount
-            balance = AccountBalance(
-                user_id=user_id,
-                current_balance=new_balance,
-                last_updated=datetime.utcnow()
-            )
-            db.account_balance.insert_one(balance.to_dict())
-        
-        return {
-            "success": True,
-            "message": f"Expense of ${amount:.2f} added successfully",
-            "expense": {
-                "expense_id": expense.expense_id,
-                "amount": amount,
-                "category": category,
-                "description": description,
-                "date": expense_date.isoformat()
-            },
-            "new_balance": new_balance
-        }
+        return _expense_added(expense, category, new_balance)
             
     except ValueError as e:
         return {
@@ -110,84 +552,112 @@ def set_expense(
         }
 
 
+@instrument_tool
+@invalidates(_bulk_write_tags)
+def set_expenses_bulk(
+    expenses: List[Dict[str, Any]],
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Add many expenses at once and update the account balance a single time.
+    
+    Args:
+        expenses: List of expenses, each with amount, category, description
+            and an optional date in ISO format (defaults to now)
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
+    Returns:
+        Dictionary with insert counts, per-row failures and updated balance
+    """
+    # Rows already committed when an error stops the batch
+    inserted_count = 0
+    inserted_total = 0.0
+    new_balance = None
+    
+    try:
+        db = get_database()
+        user_id = get_user_id(tool_context)
+        
+        # Validate every row up front; invalid rows are reported, not fatal
+        documents, row_indexes, failed_rows = _validate_expense_rows(user_id, expenses)
+        
+        # Insert in unordered chunks so one bad document doesn't stop the rest
+        spend_deltas = {}
+        chunk_error = None
+        
+        for start in range(0, len(documents), BULK_INSERT_CHUNK_SIZE):
+            chunk = documents[start:start + BULK_INSERT_CHUNK_SIZE]
+            try:
+                failed_in_chunk = _insert_expense_chunk(db, chunk)
+            except Exception as e:
+                # Earlier chunks are committed: stop, but still debit them below
+                chunk_error = e
+                break
+            count, total = _tally_expense_chunk(
+                chunk,
+                failed_in_chunk,
+                row_indexes[start:start + BULK_INSERT_CHUNK_SIZE],
+                failed_rows,
+                spend_deltas
+            )
+            inserted_count += count
+            inserted_total += total
+        
+        # One aggregated balance and rollup adjustment for the whole batch
+        if inserted_count:
+            new_balance = _apply_balance_delta(db, user_id, -inserted_total)
+            apply_spend_deltas(db, user_id, spend_deltas)
+        
+        if chunk_error is not None:
+            return _bulk_error(expenses, inserted_count, inserted_total, new_balance, chunk_error)
+        return _bulk_result(expenses, inserted_count, inserted_total, failed_rows, new_balance)
+            
+    except Exception as e:
+        return _bulk_error(expenses, inserted_count, inserted_total, new_balance, e)
+
+
+@instrument_tool
+@cached_read(_expense_read_tags)
 def get_expenses(
     start_date: Optional[str],
     end_date: Optional[str],
     category: Optional[str],
-    limit: int
+    limit: int,
+    cursor: Optional[str] = None,
+    tool_context: Optional[ToolContext] = None
 ) -> Dict[str, Any]:
     """
-    Retrieve expenses with optional filters.
+    Retrieve expenses with optional filters, one page at a time.
     
     Args:
         start_date: Start date for filtering (ISO format)
         end_date: End date for filtering (ISO format)
         category: Filter by specific category
-        limit: Maximum number of expenses to return (default: 50)
+        limit: Maximum number of expenses per page (default: 50, at most
+            MAX_EXPENSES_PAGE; 0 means the maximum)
+        cursor: next_cursor from the previous page, with the same filters
+        tool_context: ADK tool context (injected by the runner; identifies the user)
     
     Returns:
-        Dictionary with list of expenses and summary statistics
+        Dictionary with the most recent expenses (up to limit) and
+        next_cursor (None on the last page). The first page also has summary
+        statistics covering every expense that matches the filters
     """
     try:
         db = get_database()
-        user_id = os.getenv('USER_ID', 'default_user')
+        user_id = get_user_id(tool_context)
         
-        # Build query
-        query = {"user_id": user_id}
+        query = _expenses_query(user_id, start_date, end_date, category)
+        facets = next(db.expenses.aggregate(_expenses_pipeline(query, limit, cursor)), {})
         
-        # Date filters
-        date_filter = {}
-        if start_date:
-            try:
-                start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                date_filter["$gte"] = start_dt
-            except ValueError:
-                start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-                date_filter["$gte"] = start_dt
-        
-        if end_date:
-            try:
-                end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                date_filter["$lte"] = end_dt
-            except ValueError:
-                end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-                date_filter["$lte"] = end_dt
-        
-        if date_filter:
-            query["date"] = date_filter
-        
-        # Category filter
-        if category:
-            query["category"] = category.lower()
-        
-        # Fetch expenses
-        expenses_cursor = db.expenses.find(query).sort("date", -1).limit(limit)
-        expenses_list = []
-        total_amount = 0.0
-        category_totals: Dict[str, float] = {}
-        
-        for expense_data in expenses_cursor:
-            expense = Expense(**expense_data)
-            expenses_list.append({
-                "expense_id": expense.expense_id,
-                "amount": expense.amount,
-                "category": expense.category,
-                "description": expense.description,
-                "date": expense.date.isoformat(),
-                "created_at": expense.created_at.isoformat()
-            })
+        return _format_expenses(facets, limit, cursor)
             
-            total_amount += expense.amount
-            category_totals[expense.category] = category_totals.get(expense.category, 0.0) + expense.amount
-        
+    except ValueError as e:
         return {
-            "success": True,
-            "count": len(expenses_list),
-            "total_amount": round(total_amount, 2),
-            "category_breakdown": {k: round(v, 2) for k, v in category_totals.items()},
-            "expenses": expenses_list
+            "success": False,
+            "message": "Invalid input parameters",
+            "error": str(e)
         }
-            
     except Exception as e:
         return {
             "success": False,
@@ -196,56 +666,31 @@ def get_expenses(
         }
 
 
-def get_current_account_balance() -> Dict[str, Any]:
+@instrument_tool
+@cached_read(_balance_tags)
+def get_current_account_balance(tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
     Get current account balance and related information.
     
+    Args:
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
     Returns:
         Dictionary with balance information
     """
     try:
         db = get_database()
-        user_id = os.getenv('USER_ID', 'default_user')
+        user_id = get_user_id(tool_context)
         
         # Get balance
         balance_data = db.account_balance.find_one({"user_id": user_id})
         
-        if not balance_data:
-            return {
-                "success": True,
-                "message": "No account balance found. Please set initial balance.",
-                "current_balance": 0.0,
-                "monthly_income": 0.0,
-                "monthly_expense_threshold": 0.0
-            }
-        
-        balance = AccountBalance(**balance_data)
-        
-        # Calculate current month expenses
-        now = datetime.utcnow()
-        start_of_month = datetime(now.year, now.month, 1)
-        
-        month_expenses = list(db.expenses.find({
-            "user_id": user_id,
-            "date": {"$gte": start_of_month}
-        }))
-        
-        monthly_spent = sum(exp['amount'] for exp in month_expenses)
-        
-        # Calculate threshold usage
-        threshold_percentage = 0.0
-        if balance.monthly_expense_threshold > 0:
-            threshold_percentage = (monthly_spent / balance.monthly_expense_threshold) * 100
+        # Current month spend comes from the rollups (one indexed read)
+        monthly_spent = 0.0
+        if balance_data:
+            monthly_spent = get_month_spend(db, user_id, month_key(datetime.utcnow()))["total"]
         
-        return {
-            "success": True,
-            "current_balance": round(balance.current_balance, 2),
-            "monthly_income": round(balance.monthly_income, 2),
-            "monthly_expense_threshold": round(balance.monthly_expense_threshold, 2),
-            "current_month_spent": round(monthly_spent, 2),
-            "threshold_usage_percentage": round(threshold_percentage, 2),
-            "last_updated": balance.last_updated.isoformat()
-        }
+        return _format_account_balance(balance_data, monthly_spent)
             
     except Exception as e:
         return {
@@ -255,10 +700,13 @@ def get_current_account_balance() -> Dict[str, Any]:
         }
 
 
+@instrument_tool
+@invalidates(_balance_tags)
 def set_account_balance(
     balance: float,
     monthly_income: Optional[float],
-    monthly_expense_threshold: Optional[float]
+    monthly_expense_threshold: Optional[float],
+    tool_context: Optional[ToolContext] = None
 ) -> Dict[str, Any]:
     """
     Set or update account balance and monthly parameters.
@@ -267,45 +715,27 @@ def set_account_balance(
         balance: Current account balance
         monthly_income: Optional monthly income
         monthly_expense_threshold: Optional monthly expense limit
+        tool_context: ADK tool context (injected by the runner; identifies the user)
     
     Returns:
         Dictionary with confirmation
     """
     try:
         db = get_database()
-        user_id = os.getenv('USER_ID', 'default_user')
+        user_id = get_user_id(tool_context)
         
-        # Check if balance exists
-        existing_balance = db.account_balance.find_one({"user_id": user_id})
-        
-        update_data = {
-            "current_balance": balance,
-            "last_updated": datetime.utcnow()
-        }
+        update_data, update = _account_balance_update(balance, monthly_income, monthly_expense_threshold)
         
-        if monthly_income is not None:
-            update_data["monthly_income"] = monthly_income
-        
-        if monthly_expense_threshold is not None:
-            update_data["monthly_expense_threshold"] = monthly_expense_threshold
+        result = db.account_balance.update_one(
+            {"user_id": user_id},
+            update,
+            upsert=True
+        )
         
-        if existing_balance:
-            # Update existing
-            result = db.account_balance.update_one(
-                {"user_id": user_id},
-                {"$set": update_data}
-            )
-            message = "Account balance updated successfully"
-        else:
-            # Create new
-            balance_obj = AccountBalance(
-                user_id=user_id,
-                current_balance=balance,
-                monthly_income=monthly_income or 0.0,
-                monthly_expense_threshold=monthly_expense_threshold or 0.0
-            )
-            result = db.account_balance.insert_one(balance_obj.to_dict())
+        if result.upserted_id is not None:
             message = "Account balance set successfully"
+        else:
+            message = "Account balance updated successfully"
         
         return {
             "success": True,
@@ -319,4 +749,3 @@ def set_account_balance(
             "message": "Error setting account balance",
             "error": str(e)
         }
-
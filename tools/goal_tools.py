@@ -1,19 +1,122 @@
 """Goal management tools for Root Agent."""
-import os
 import uuid
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
+from google.adk.tools import ToolContext
 from database.connection import get_database
-from database.models import Goal, GoalType, Priority
+from database.models import Goal, GoalRow, GoalType, Priority
+from tools.context import get_user_id
+from tools.cache import GOALS, goal_tag, cached_read, invalidates
+from observability.tool_metrics import instrument_tool
 
 
-def set_goal(
+def _goal_read_tags(goal_id: Optional[str]) -> Set[str]:
+    """Cache tags of a get_goal call."""
+    return {goal_tag(goal_id)} if goal_id else {GOALS}
+
+
+def _goal_write_tags(goal_id: Optional[str] = None, **_) -> Set[str]:
+    """Cache tags a goal write invalidates (the goal list, and the goal if known)."""
+    return {GOALS, goal_tag(goal_id)} if goal_id else {GOALS}
+
+
+def _parse_deadline(deadline: str) -> datetime:
+    """Parse a deadline in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)."""
+    try:
+        return datetime.fromisoformat(deadline.replace('Z', '+00:00'))
+    except ValueError:
+        return datetime.strptime(deadline, '%Y-%m-%d')
+
+
+def _new_goal(
+    user_id: str,
     goal_type: str,
     name: str,
     target_amount: float,
     deadline: str,
     priority: Optional[str],
     current_amount: float
+) -> Goal:
+    """Validate goal input into a Goal model."""
+    now = datetime.utcnow()
+    return Goal(
+        goal_id=str(uuid.uuid4()),
+        user_id=user_id,
+        goal_type=GoalType(goal_type.lower()),
+        name=name,
+        target_amount=target_amount,
+        current_amount=current_amount,
+        deadline=_parse_deadline(deadline),
+        priority=Priority((priority or "medium").lower()),
+        created_at=now,
+        updated_at=now
+    )
+
+
+def _goal_created(
+    goal: Goal,
+    goal_type: str,
+    deadline: str,
+    priority: Optional[str]
+) -> Dict[str, Any]:
+    """Build the set_goal success response."""
+    return {
+        "success": True,
+        "message": f"Goal '{goal.name}' created successfully!",
+        "goal_id": goal.goal_id,
+        "goal": {
+            "name": goal.name,
+            "type": goal_type,
+            "target_amount": goal.target_amount,
+            "current_amount": goal.current_amount,
+            "deadline": deadline,
+            "priority": priority if priority else "medium",
+            "progress_percentage": goal.progress_percentage()
+        }
+    }
+
+
+def _format_goal(goal_data: Dict[str, Any], include_updated_at: bool) -> Dict[str, Any]:
+    """Convert a stored goal document into the tool response shape."""
+    # Goals come from our own collection, so skip per-row validation
+    return GoalRow(goal_data).to_dict(include_updated_at)
+
+
+def _goal_not_found(goal_id: str) -> Dict[str, Any]:
+    """Build the response for an unknown goal ID."""
+    return {
+        "success": False,
+        "message": f"Goal with ID '{goal_id}' not found"
+    }
+
+
+def _goal_progress_updated(goal_data: Dict[str, Any], amount_to_add: float) -> Dict[str, Any]:
+    """Build the update_goal_progress success response."""
+    goal = GoalRow(goal_data)
+    goal.current_amount += amount_to_add
+    return {
+        "success": True,
+        "message": f"Goal progress updated! Added ${amount_to_add:.2f}",
+        "goal": {
+            "goal_id": goal.goal_id,
+            "name": goal.name,
+            "current_amount": goal.current_amount,
+            "target_amount": goal.target_amount,
+            "progress_percentage": goal.progress_percentage()
+        }
+    }
+
+
+@instrument_tool
+@invalidates(_goal_write_tags)
+def set_goal(
+    goal_type: str,
+    name: str,
+    target_amount: float,
+    deadline: str,
+    priority: Optional[str],
+    current_amount: float,
+    tool_context: Optional[ToolContext] = None
 ) -> Dict[str, Any]:
     """
     Create or update a financial goal.
@@ -25,55 +128,23 @@ def set_goal(
         deadline: Deadline in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)
         priority: Goal priority (high, medium, low)
         current_amount: Current progress
+        tool_context: ADK tool context (injected by the runner; identifies the user)
     
     Returns:
         Dictionary with goal information and confirmation
     """
     try:
         db = get_database()
-        user_id = os.getenv('USER_ID', 'default_user')
-        
-        # Parse deadline
-        try:
-            deadline_dt = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
-        except ValueError:
-            deadline_dt = datetime.strptime(deadline, '%Y-%m-%d')
-        
-        # Handle optional parameters
-        priority_val = priority if priority else "medium"
+        user_id = get_user_id(tool_context)
         
         # Create goal object
-        goal = Goal(
-            goal_id=str(uuid.uuid4()),
-            user_id=user_id,
-            goal_type=GoalType(goal_type.lower()),
-            name=name,
-            target_amount=target_amount,
-            current_amount=current_amount,
-            deadline=deadline_dt,
-            priority=Priority(priority_val.lower()),
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
-        )
+        goal = _new_goal(user_id, goal_type, name, target_amount, deadline, priority, current_amount)
         
         # Insert into database
         result = db.goals.insert_one(goal.to_dict())
         
         if result.inserted_id:
-            return {
-                "success": True,
-                "message": f"Goal '{name}' created successfully!",
-                "goal_id": goal.goal_id,
-                "goal": {
-                    "name": name,
-                    "type": goal_type,
-                    "target_amount": target_amount,
-                    "current_amount": current_amount,
-                    "deadline": deadline,
-                    "priority": priority_val,
-                    "progress_percentage": goal.progress_percentage()
-                }
-            }
+            return _goal_created(goal, goal_type, deadline, priority)
         else:
             return {
                 "success": False,
@@ -95,67 +166,41 @@ def set_goal(
         }
 
 
-def get_goal(goal_id: Optional[str]) -> Dict[str, Any]:
+@instrument_tool
+@cached_read(_goal_read_tags)
+def get_goal(goal_id: Optional[str], tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
     Retrieve financial goal(s).
     
     Args:
         goal_id: Optional specific goal ID. If None, returns all goals.
+        tool_context: ADK tool context (injected by the runner; identifies the user)
     
     Returns:
         Dictionary with goal information or list of goals
     """
     try:
         db = get_database()
-        user_id = os.getenv('USER_ID', 'default_user')
+        user_id = get_user_id(tool_context)
         
         if goal_id:
             # Get specific goal
             goal_data = db.goals.find_one({
                 "user_id": user_id,
                 "goal_id": goal_id
-            })
+            }, GoalRow.PROJECTION)
             
             if goal_data:
-                goal = Goal(**goal_data)
                 return {
                     "success": True,
-                    "goal": {
-                        "goal_id": goal.goal_id,
-                        "name": goal.name,
-                        "type": goal.goal_type,
-                        "target_amount": goal.target_amount,
-                        "current_amount": goal.current_amount,
-                        "deadline": goal.deadline.isoformat(),
-                        "priority": goal.priority,
-                        "progress_percentage": goal.progress_percentage(),
-                        "created_at": goal.created_at.isoformat(),
-                        "updated_at": goal.updated_at.isoformat()
-                    }
+                    "goal": _format_goal(goal_data, include_updated_at=True)
                 }
             else:
-                return {
-                    "success": False,
-                    "message": f"Goal with ID '{goal_id}' not found"
-                }
+                return _goal_not_found(goal_id)
         else:
             # Get all goals
-            goals_cursor = db.goals.find({"user_id": user_id}).sort("created_at", -1)
-            goals_list = []
-            
-            for goal_data in goals_cursor:
-                goal = Goal(**goal_data)
-                goals_list.append({
-                    "goal_id": goal.goal_id,
-                    "name": goal.name,
-                    "type": goal.goal_type,
-                    "target_amount": goal.target_amount,
-                    "current_amount": goal.current_amount,
-                    "deadline": goal.deadline.isoformat(),
-                    "priority": goal.priority,
-                    "progress_percentage": goal.progress_percentage(),
-                    "created_at": goal.created_at.isoformat()
-                })
+            goals_cursor = db.goals.find({"user_id": user_id}, GoalRow.PROJECTION).sort("created_at", -1)
+            goals_list = [_format_goal(goal_data, include_updated_at=False) for goal_data in goals_cursor]
             
             return {
                 "success": True,
@@ -171,35 +216,38 @@ def get_goal(goal_id: Optional[str]) -> Dict[str, Any]:
         }
 
 
-def update_goal_progress(goal_id: str, amount_to_add: float) -> Dict[str, Any]:
+@instrument_tool
+@invalidates(_goal_write_tags)
+def update_goal_progress(
+    goal_id: str,
+    amount_to_add: float,
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
     """
     Update progress on a financial goal.
     
     Args:
         goal_id: Goal identifier
         amount_to_add: Amount to add to current progress
+        tool_context: ADK tool context (injected by the runner; identifies the user)
     
     Returns:
         Dictionary with updated goal information
     """
     try:
         db = get_database()
-        user_id = os.getenv('USER_ID', 'default_user')
+        user_id = get_user_id(tool_context)
         
         # Get current goal
         goal_data = db.goals.find_one({
             "user_id": user_id,
             "goal_id": goal_id
-        })
+        }, GoalRow.PROJECTION)
         
         if not goal_data:
-            return {
-                "success": False,
-                "message": f"Goal with ID '{goal_id}' not found"
-            }
+            return _goal_not_found(goal_id)
         
-        goal = Goal(**goal_data)
-        new_amount = goal.current_amount + amount_to_add
+        new_amount = goal_data["current_amount"] + amount_to_add
         
         # Update goal
         result = db.goals.update_one(
@@ -213,18 +261,7 @@ def update_goal_progress(goal_id: str, amount_to_add: float) -> Dict[str, Any]:
         )
         
         if result.modified_count > 0:
-            goal.current_amount = new_amount
-            return {
-                "success": True,
-                "message": f"Goal progress updated! Added ${amount_to_add:.2f}",
-                "goal": {
-                    "goal_id": goal.goal_id,
-                    "name": goal.name,
-                    "current_amount": new_amount,
-                    "target_amount": goal.target_amount,
-                    "progress_percentage": goal.progress_percentage()
-                }
-            }
+            return _goal_progress_updated(goal_data, amount_to_add)
         else:
             return {
                 "success": False,
@@ -1,13 +1,37 @@
 """Investment management tools for Investment Agent."""
-import os
 import uuid
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Set
+from google.adk.tools import ToolContext
 from database.connection import get_database
-from database.models import Investment, InvestmentType
+from database.models import Investment, InvestmentRow, InvestmentType
 from google.genai import types
+from tools.context import get_user_id
+from tools.cache import INVESTMENTS, investment_type_tag, cached_read, invalidates
+from tools.pagination import keyset_query, page_sort, split_page
+from observability.tool_metrics import instrument_tool
 
-def add_investment(
+# Number of largest holdings reported by get_investment_summary
+TOP_HOLDINGS_COUNT = 5
+
+# Default get_portfolio page size
+PORTFOLIO_PAGE_SIZE = 50
+
+# Page rows keep _id for the next page's cursor
+_PORTFOLIO_PAGE_PROJECTION = {**InvestmentRow.PROJECTION, "_id": 1}
+
+def _portfolio_read_tags(investment_type: Optional[str] = None, **_) -> Set[str]:
+    """Cache tags of a portfolio read (one type, or the whole portfolio)."""
+    return {investment_type_tag(investment_type)} if investment_type else {INVESTMENTS}
+
+
+def _investment_write_tags(investment_type: str, **_) -> Set[str]:
+    """Cache tags an add_investment call invalidates."""
+    return {INVESTMENTS, investment_type_tag(investment_type)}
+
+
+def _new_investment(
+    user_id: str,
     symbol: str,
     quantity: float,
     purchase_price: float,
@@ -15,6 +39,164 @@ def add_investment(
     name: str,
     date: Optional[str],
     notes: Optional[str]
+) -> Investment:
+    """Validate investment input into an Investment model."""
+    # Parse date
+    if date:
+        try:
+            purchase_date = datetime.fromisoformat(date.replace('Z', '+00:00'))
+        except ValueError:
+            purchase_date = datetime.strptime(date, '%Y-%m-%d')
+    else:
+        purchase_date = datetime.utcnow()
+    
+    return Investment(
+        investment_id=str(uuid.uuid4()),
+        user_id=user_id,
+        symbol=symbol.upper(),
+        name=name,
+        quantity=quantity,
+        purchase_price=purchase_price,
+        investment_type=InvestmentType(investment_type.lower()),
+        purchase_date=purchase_date,
+        notes=notes,
+        created_at=datetime.utcnow()
+    )
+
+
+def _portfolio_query(user_id: str, investment_type: Optional[str]) -> Dict[str, Any]:
+    """Build the investments filter for get_portfolio."""
+    query = {"user_id": user_id}
+    if investment_type:
+        query["investment_type"] = investment_type.lower()
+    return query
+
+
+def _portfolio_find(
+    user_id: str,
+    investment_type: Optional[str],
+    limit: int,
+    cursor: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Build the get_portfolio page query (limit + 1 rows tell whether more follow).
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    return {
+        "filter": keyset_query(_portfolio_query(user_id, investment_type), "purchase_date", cursor),
+        "projection": _PORTFOLIO_PAGE_PROJECTION,
+        "sort": page_sort("purchase_date"),
+        "limit": limit + 1 if limit > 0 else 0
+    }
+
+
+def _format_portfolio(investment_docs: Iterable[Dict[str, Any]], limit: int) -> Dict[str, Any]:
+    """Build the get_portfolio response from stored investments."""
+    rows, next_cursor = split_page(list(investment_docs), limit, "purchase_date")
+    
+    # Investments come from our own collection, so skip per-row validation
+    investments_list = [InvestmentRow(inv_data).to_dict() for inv_data in rows]
+    
+    return {
+        "success": True,
+        "count": len(investments_list),
+        "investments": investments_list,
+        "next_cursor": next_cursor
+    }
+
+
+def _portfolio_value_pipeline(user_id: str) -> List[Dict[str, Any]]:
+    """Cost basis per investment type, summed server-side."""
+    return [
+        {"$match": {"user_id": user_id}},
+        {"$group": {
+            "_id": "$investment_type",
+            "total": {"$sum": {"$multiply": ["$quantity", "$purchase_price"]}}
+        }}
+    ]
+
+
+def _format_portfolio_value(type_totals: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the get_portfolio_value response from per-type cost totals."""
+    type_breakdown = {group["_id"]: group["total"] for group in type_totals}
+    
+    return {
+        "success": True,
+        "total_cost_basis": round(sum(type_breakdown.values()), 2),
+        "breakdown_by_type": {k: round(v, 2) for k, v in type_breakdown.items()}
+    }
+
+
+def _investment_summary_pipeline(user_id: str, top_holdings: int) -> List[Dict[str, Any]]:
+    """
+    Single-pass aggregation for get_investment_summary.
+    
+    Cost basis is computed per position server-side, then one $facet
+    produces the totals, the allocation by type and the largest holdings.
+    """
+    return [
+        {"$match": {"user_id": user_id}},
+        {"$project": {
+            "_id": 0,
+            "symbol": 1,
+            "name": 1,
+            "investment_type": 1,
+            "cost": {"$multiply": ["$quantity", "$purchase_price"]}
+        }},
+        {"$facet": {
+            "totals": [
+                {"$group": {"_id": None, "total": {"$sum": "$cost"}, "count": {"$sum": 1}}}
+            ],
+            "by_type": [
+                {"$group": {"_id": "$investment_type", "total": {"$sum": "$cost"}}}
+            ],
+            "top_holdings": [
+                {"$group": {"_id": "$symbol", "name": {"$first": "$name"}, "cost": {"$sum": "$cost"}}},
+                {"$sort": {"cost": -1}},
+                {"$limit": top_holdings}
+            ]
+        }}
+    ]
+
+
+def _format_investment_summary(facets: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the get_investment_summary response from the $facet output."""
+    totals = facets.get("totals") or [{"total": 0.0, "count": 0}]
+    total_invested = totals[0]["total"]
+    
+    return {
+        "success": True,
+        "total_invested": round(total_invested, 2),
+        "asset_allocation": {
+            group["_id"]: round(group["total"], 2)
+            for group in facets.get("by_type", [])
+        },
+        "total_positions": totals[0]["count"],
+        "top_holdings": [
+            {
+                "symbol": holding["_id"],
+                "name": holding["name"],
+                "cost_basis": round(holding["cost"], 2),
+                "allocation_percentage": round(holding["cost"] / total_invested * 100, 2) if total_invested else 0.0
+            }
+            for holding in facets.get("top_holdings", [])
+        ]
+    }
+
+
+@instrument_tool
+@invalidates(_investment_write_tags)
+def add_investment(
+    symbol: str,
+    quantity: float,
+    purchase_price: float,
+    investment_type: str,
+    name: str,
+    date: Optional[str],
+    notes: Optional[str],
+    tool_context: Optional[ToolContext] = None
 ) -> Dict[str, Any]:
     """
     Record a new investment.
@@ -27,35 +209,18 @@ def add_investment(
         name: Name of the investment
         date: Optional purchase date in ISO format (defaults to now)
         notes: Optional notes
+        tool_context: ADK tool context (injected by the runner; identifies the user)
     
     Returns:
         Dictionary with investment details
     """
     try:
         db = get_database()
-        user_id = os.getenv('USER_ID', 'default_user')
+        user_id = get_user_id(tool_context)
         
-        # Parse date
-        if date:
-            try:
-                purchase_date = datetime.fromisoformat(date.replace('Z', '+00:00'))
-            except ValueError:
-                purchase_date = datetime.strptime(date, '%Y-%m-%d')
-        else:
-            purchase_date = datetime.utcnow()
-            
         # Create investment object
-        investment = Investment(
-            investment_id=str(uuid.uuid4()),
-            user_id=user_id,
-            symbol=symbol.upper(),
-            name=name,
-            quantity=quantity,
-            purchase_price=purchase_price,
-            investment_type=InvestmentType(investment_type.lower()),
-            purchase_date=purchase_date,
-            notes=notes,
-            created_at=datetime.utcnow()
+        investment = _new_investment(
+            user_id, symbol, quantity, purchase_price, investment_type, name, date, notes
         )
         
         # Insert into database
@@ -87,40 +252,43 @@ def add_investment(
             "error": str(e)
         }
 
+@instrument_tool
+@cached_read(_portfolio_read_tags)
 def get_portfolio(
-    investment_type: Optional[str]
+    investment_type: Optional[str],
+    limit: int = PORTFOLIO_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    tool_context: Optional[ToolContext] = None
 ) -> Dict[str, Any]:
     """
-    Retrieve current investments.
+    Retrieve current investments, newest first, one page at a time.
     
     Args:
         investment_type: Optional filter by investment type
+        limit: Maximum number of investments per page (0 returns all)
+        cursor: next_cursor from the previous page, with the same filter
+        tool_context: ADK tool context (injected by the runner; identifies the user)
         
     Returns:
-        Dictionary with list of investments
+        Dictionary with list of investments and next_cursor (None on the last page)
     """
     try:
         db = get_database()
-        user_id = os.getenv('USER_ID', 'default_user')
+        user_id = get_user_id(tool_context)
         
-        query = {"user_id": user_id}
-        if investment_type:
-            query["investment_type"] = investment_type.lower()
-            
-        investments_cursor = db.investments.find(query).sort("purchase_date", -1)
+        page = _portfolio_find(user_id, investment_type, limit, cursor)
+        investments_cursor = db.investments.find(
+            page["filter"], page["projection"]
+        ).sort(page["sort"]).limit(page["limit"])
         
-        investments_list = []
-        for inv_data in investments_cursor:
-            # Convert to model and back to dict to ensure consistency
-            inv = Investment(**inv_data)
-            investments_list.append(inv.to_dict())
-            
+        return _format_portfolio(investments_cursor, limit)
+        
+    except ValueError as e:
         return {
-            "success": True,
-            "count": len(investments_list),
-            "investments": investments_list
+            "success": False,
+            "message": "Invalid input parameters",
+            "error": str(e)
         }
-        
     except Exception as e:
         return {
             "success": False,
@@ -128,36 +296,26 @@ def get_portfolio(
             "error": str(e)
         }
 
-def get_portfolio_value() -> Dict[str, Any]:
+@instrument_tool
+@cached_read(_portfolio_read_tags)
+def get_portfolio_value(tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
     Calculate total value of all investments based on purchase price (cost basis).
     Note: Real-time price updates would require an external API.
     
+    Args:
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
     Returns:
         Dictionary with total value breakdown
     """
     try:
         db = get_database()
-        user_id = os.getenv('USER_ID', 'default_user')
+        user_id = get_user_id(tool_context)
         
-        investments_cursor = db.investments.find({"user_id": user_id})
+        type_totals = db.investments.aggregate(_portfolio_value_pipeline(user_id))
         
-        total_cost_basis = 0.0
-        type_breakdown = {}
-        
-        for inv_data in investments_cursor:
-            inv = Investment(**inv_data)
-            cost = inv.total_cost
-            total_cost_basis += cost
-            
-            inv_type = inv.investment_type
-            type_breakdown[inv_type] = type_breakdown.get(inv_type, 0.0) + cost
-            
-        return {
-            "success": True,
-            "total_cost_basis": round(total_cost_basis, 2),
-            "breakdown_by_type": {k: round(v, 2) for k, v in type_breakdown.items()}
-        }
+        return _format_portfolio_value(type_totals)
         
     except Exception as e:
         return {
@@ -166,24 +324,31 @@ def get_portfolio_value() -> Dict[str, Any]:
             "error": str(e)
         }
 
-def get_investment_summary() -> Dict[str, Any]:
+@instrument_tool
+@cached_read(_portfolio_read_tags)
+def get_investment_summary(tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
     Get a summary of the investment portfolio for the agent.
     
+    Args:
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+    
     Returns:
-        Dictionary with summary statistics
+        Dictionary with summary statistics (cost basis, allocation by type,
+        position count and top holdings)
     """
-    portfolio_value = get_portfolio_value()
-    if not portfolio_value.get("success"):
-        return portfolio_value
+    try:
+        db = get_database()
+        user_id = get_user_id(tool_context)
         
-    portfolio = get_portfolio()
-    
-    return {
-        "success": True,
-        "total_invested": portfolio_value.get("total_cost_basis", 0.0),
-        "asset_allocation": portfolio_value.get("breakdown_by_type", {}),
-        "total_positions": portfolio.get("count", 0)
-    }
-
-
+        pipeline = _investment_summary_pipeline(user_id, TOP_HOLDINGS_COUNT)
+        facets = next(db.investments.aggregate(pipeline), {})
+        
+        return _format_investment_summary(facets)
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error summarizing portfolio",
+            "error": str(e)
+        }
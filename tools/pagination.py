@@ -0,0 +1,79 @@
+"""Keyset (cursor) pagination for list tools.
+
+Pages are ordered newest first on (field, _id), where _id breaks ties
+between rows with the same date. A cursor is the opaque, URL-safe encoding
+of the last row's (field, _id). The next page's query starts the index
+scan at that position, so a deep page costs the same as the first one (no
+skip).
+"""
+import base64
+import binascii
+from typing import Dict, Any, List, Optional, Tuple
+from bson import json_util
+from bson.errors import BSONError
+
+
+def encode_cursor(value: Any, row_id: Any) -> str:
+    """Encode the sort value and _id of the last row on a page."""
+    payload = json_util.dumps([value, row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    """
+    Decode a cursor from encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return value, row_id
+    except (binascii.Error, UnicodeDecodeError, BSONError, TypeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def keyset_query(query: Dict[str, Any], field: str, cursor: Optional[str]) -> Dict[str, Any]:
+    """
+    Restrict a query to the rows after the cursor in (field, _id) descending order.
+
+    The separate ``field <= value`` bound keeps the index scan starting at
+    the cursor whichever plan wins; the ``$or`` skips rows already returned
+    that share its value.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return query
+
+    value, row_id = decode_cursor(cursor)
+    return {
+        **query,
+        "$and": [
+            {field: {"$lte": value}},
+            {"$or": [
+                {field: {"$lt": value}},
+                {field: value, "_id": {"$lt": row_id}}
+            ]}
+        ]
+    }
+
+
+def page_sort(field: str) -> List[Tuple[str, int]]:
+    """Sort order matching keyset_query: newest first, _id as the tie-breaker."""
+    return [(field, -1), ("_id", -1)]
+
+
+def split_page(rows: List[Dict[str, Any]], limit: int, field: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Trim rows fetched with limit + 1 to one page and build the next cursor.
+
+    Returns:
+        Tuple of (page rows, cursor of the next page or None on the last page)
+    """
+    if limit <= 0 or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1][field], rows[-1]["_id"])
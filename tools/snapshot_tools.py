@@ -0,0 +1,133 @@
+"""Composite financial snapshot tool for Root Agent.
+
+Advice turns need the balance, this month's spending, the goals and the
+portfolio. Gathering them through the sub-agents costs a model round trip
+per delegation. ``get_financial_snapshot`` reads all four concurrently on
+the Motor driver and returns one compact document instead. The balance
+section and the month's spend breakdown share one rollup read.
+"""
+import asyncio
+from datetime import datetime
+from typing import Optional, Dict, Any, Set, Tuple
+from google.adk.tools import ToolContext
+from database.connection import get_async_database
+from database.rollups import month_key
+from tools.context import get_user_id
+from tools.cache import BALANCE, GOALS, INVESTMENTS, cached_read
+from observability.tool_metrics import instrument_tool
+from tools.expense_tools import _format_account_balance
+from tools.async_expense_tools import _read_month_spend
+from tools.async_goal_tools import get_goal
+from tools.async_investment_tools import get_investment_summary
+
+# Goal fields kept in the snapshot (created_at and type are left out)
+SNAPSHOT_GOAL_FIELDS = (
+    "goal_id", "name", "target_amount", "current_amount", "deadline", "priority", "progress_percentage"
+)
+
+
+def _snapshot_tags(**_) -> Set[str]:
+    """Cache tags of a snapshot (every expense write also invalidates BALANCE)."""
+    return {BALANCE, GOALS, INVESTMENTS}
+
+
+async def _balance_and_month_spend(user_id: str, month: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Read the account balance and one month's spend by category.
+
+    The balance's current_month_spent and the category breakdown come from
+    the same rollup read, which runs alongside the balance read.
+
+    Returns:
+        Tuple of (get_current_account_balance result, month spend result)
+    """
+    try:
+        db = get_async_database()
+        balance_data, spend = await asyncio.gather(
+            db.account_balance.find_one({"user_id": user_id}),
+            _read_month_spend(db, user_id, month)
+        )
+        balance = _format_account_balance(balance_data, spend["total"] if balance_data else 0.0)
+        month_spend = {
+            "success": True,
+            "total": round(spend["total"], 2),
+            "count": spend["count"],
+            "categories": {
+                category: round(total, 2)
+                for category, total in sorted(spend["categories"].items(), key=lambda item: item[1], reverse=True)
+            }
+        }
+        return balance, month_spend
+    except Exception as e:
+        return (
+            {"success": False, "message": "Error retrieving account balance", "error": str(e)},
+            {"success": False, "message": "Error retrieving monthly spend", "error": str(e)}
+        )
+
+
+def _section(result: Dict[str, Any], errors: Dict[str, str], name: str) -> Optional[Dict[str, Any]]:
+    """Strip the success flag from a part of the snapshot, recording failures."""
+    if not result.get("success"):
+        errors[name] = result.get("error") or result.get("message", "Unknown error")
+        return None
+    return {key: value for key, value in result.items() if key != "success"}
+
+
+@instrument_tool
+@cached_read(_snapshot_tags)
+async def get_financial_snapshot(tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Get the user's whole financial picture in one call.
+
+    Reads the account balance, this month's spending by category, all
+    goals and the portfolio summary concurrently. Use it before giving
+    financial advice instead of asking each sub-agent in turn.
+
+    Args:
+        tool_context: ADK tool context (injected by the runner; identifies the user)
+
+    Returns:
+        Dictionary with balance, month_spend, goals and portfolio sections.
+        A section that could not be read is null, success is False and the
+        error is listed under errors.
+    """
+    try:
+        user_id = get_user_id(tool_context)
+        month = month_key(datetime.utcnow())
+
+        (balance, month_spend), goals, portfolio = await asyncio.gather(
+            _balance_and_month_spend(user_id, month),
+            get_goal(None, tool_context=tool_context),
+            get_investment_summary(tool_context=tool_context)
+        )
+
+        errors: Dict[str, str] = {}
+        balance_section = _section(balance, errors, "balance")
+        month_section = _section(month_spend, errors, "month_spend")
+        goals_section = _section(goals, errors, "goals")
+        portfolio_section = _section(portfolio, errors, "portfolio")
+        if month_section is not None:
+            month_section["month"] = month
+
+        snapshot = {
+            # Partial snapshots are returned but not cached
+            "success": not errors,
+            "balance": balance_section,
+            "month_spend": month_section,
+            "goals": [
+                {field: goal[field] for field in SNAPSHOT_GOAL_FIELDS}
+                for goal in goals_section["goals"]
+            ] if goals_section is not None else None,
+            "portfolio": portfolio_section
+        }
+        if errors:
+            snapshot["message"] = "Some parts of the snapshot could not be read"
+            snapshot["errors"] = errors
+        return snapshot
+
+    except Exception as e:
+        return {
+            "success": False,
+            "message": "Error building financial snapshot",
+            "error": str(e)
+        }